@@ -7,7 +7,7 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
-from datetime import time
+from datetime import date, datetime, time
 
 
 class IConfigManager(ABC):
@@ -47,6 +47,15 @@ class UserConfig:
     strategy_flag: Optional[str] = None
     strategy_params: Optional[Dict[str, Any]] = None
     request_interval: float = 0.02  # 请求间隔，默认20ms
+    success_patterns: Optional[List[str]] = None  # 额外的成功响应关键字
+    retry_patterns: Optional[List[str]] = None  # 可重试响应关键字，None使用默认值
+    terminal_patterns: Optional[List[str]] = None  # 终止响应关键字
+    default_terminal_patterns: bool = False  # 是否同时使用内置的终止响应关键字
+    request_timeout: float = 1.0  # 默认请求超时，收到真实请求的响应后按TTFB分布自适应
+    hedge_requests: bool = False  # 超过p50未响应时在另一条连接上发出对冲请求
+    warmup_probes: int = 3  # 每条连接的预热探测次数
+    warmup_url: str = ""  # 预热探测地址，默认为basurl
+    max_in_flight: int = 32  # 同时未完成的请求数上限，0表示不限制
 
 
 @dataclass
@@ -58,6 +67,9 @@ class SeckillConfig:
     users: List[UserConfig]
     mixues: List[Dict[str, str]] = None
     bw_keywords: str = ""
+    bw_encrypt_url: str = ""  # BW加密服务地址，为空时使用默认地址
+    bw_encrypt_batch: bool = False  # 是否使用批量接口在开始前预取加密参数
+    bw_encrypt_timeout: float = 2.0  # 访问BW加密服务的超时（秒）
 
     @classmethod
     def from_dict(cls, config_dict: Dict[str, Any]) -> "SeckillConfig":
@@ -76,6 +88,9 @@ class SeckillConfig:
             users=users,
             mixues=config_dict.get("mixues", []),
             bw_keywords=config_dict.get("bw_keywords", ""),
+            bw_encrypt_url=config_dict.get("bw_encrypt_url", ""),
+            bw_encrypt_batch=config_dict.get("bw_encrypt_batch", False),
+            bw_encrypt_timeout=config_dict.get("bw_encrypt_timeout", 2.0),
         )
 
 
@@ -83,10 +98,68 @@ class SeckillConfig:
 class TaskSchedule:
     """任务调度配置"""
 
-    start_time: time
+    # 每天的开始时间；设置了 cron 时可以为 None
+    start_time: Optional[time]
     config_file: str
     enabled: bool = True
     description: str = ""
+    # 预热提前量（秒）：调度器在开始时间之前这么久启动任务，加载配置、同步时间、
+    # 启动工作进程并建立连接；为 None 时使用调度器的默认值（60秒）
+    lead_time: Optional[float] = None
+    # cron 规则（分 时 日 月 周）：设置后按规则触发，开始时间为规则命中的整分钟加 offset 秒，
+    # 并覆盖秒杀配置中的 start_time
+    cron: Optional[str] = None
+    offset: float = 0.0
+    # 生效日期范围（含首尾），None 表示不限
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    # 运行窗口（秒）：开始时间之后超过这么久仍未结束的任务会连同子进程一起被结束；
+    # 为 None 时使用调度器的默认值（300秒）
+    timeout: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, task: Dict[str, Any]) -> "TaskSchedule":
+        """从调度配置中的任务条目创建"""
+        start_time = task.get("start_time")
+        start_date = task.get("start_date")
+        end_date = task.get("end_date")
+        return cls(
+            start_time=(
+                datetime.strptime(start_time, "%H:%M:%S.%f").time()
+                if start_time
+                else None
+            ),
+            config_file=task["config_file"],
+            enabled=task.get("enabled", True),
+            description=task.get("description", ""),
+            lead_time=task.get("lead_time"),
+            cron=task.get("cron"),
+            offset=task.get("offset", 0.0),
+            start_date=date.fromisoformat(start_date) if start_date else None,
+            end_date=date.fromisoformat(end_date) if end_date else None,
+            timeout=task.get("timeout"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为调度配置中的任务条目，省略未设置的可选字段"""
+        task: Dict[str, Any] = {}
+        if self.start_time is not None:
+            task["start_time"] = self.start_time.strftime("%H:%M:%S.%f")
+        task["config_file"] = self.config_file
+        task["enabled"] = self.enabled
+        task["description"] = self.description
+        if self.lead_time is not None:
+            task["lead_time"] = self.lead_time
+        if self.cron is not None:
+            task["cron"] = self.cron
+            task["offset"] = self.offset
+        if self.start_date is not None:
+            task["start_date"] = self.start_date.isoformat()
+        if self.end_date is not None:
+            task["end_date"] = self.end_date.isoformat()
+        if self.timeout is not None:
+            task["timeout"] = self.timeout
+        return task
 
 
 class BaseConfig(ABC):
@@ -0,0 +1,176 @@
+"""
+编译配置缓存
+
+把解析并验证过的 SeckillConfig 以 pickle 形式缓存，按配置文件路径、修改时间和
+内容哈希判断是否失效。配置文件未变化时直接读取缓存，跳过JSON/YAML解析和验证
+
+缓存内容包含 cookie、token 等凭据，且读取时使用 pickle.load（可执行任意代码），
+因此缓存只放在当前用户的私有缓存目录（$XDG_CACHE_HOME 或 ~/.cache 下，目录 0700、
+文件 0600），不跟随配置目录共享；属主不是当前用户或可被其他用户写入的缓存文件一律忽略
+"""
+
+import hashlib
+import os
+import pickle
+import stat as stat_mode
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from loguru import logger
+
+from .base import SeckillConfig, UserConfig
+
+APP_NAME = "seckill-milk"
+
+# 缓存格式版本，修改配置类、schema 或验证逻辑而源码哈希无法覆盖时（如依赖库行为变化）手动加一
+CACHE_VERSION = 1
+
+_CONFIG_PACKAGE = Path(__file__).resolve().parent
+
+
+def default_cache_dir() -> Path:
+    """当前用户的私有缓存目录"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join("~", ".cache")
+    return Path(base).expanduser() / APP_NAME / "configcache"
+
+
+@lru_cache(maxsize=None)
+def _schema_tag() -> str:
+    """缓存版本、配置类字段或 config 包源码（schema、验证器等）变化后旧缓存自动失效"""
+    digest = hashlib.sha256(f"v{CACHE_VERSION}".encode("utf-8"))
+    names = [f.name for f in fields(SeckillConfig)] + [
+        f.name for f in fields(UserConfig)
+    ]
+    digest.update(",".join(names).encode("utf-8"))
+    for source in sorted(_CONFIG_PACKAGE.glob("*.py")):
+        digest.update(source.name.encode("utf-8"))
+        digest.update(source.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def _is_private(file_stat: os.stat_result) -> bool:
+    """文件属于当前用户且其他用户不可写"""
+    if not hasattr(os, "getuid"):
+        return True
+    return file_stat.st_uid == os.getuid() and not (
+        file_stat.st_mode & (stat_mode.S_IWGRP | stat_mode.S_IWOTH)
+    )
+
+
+@dataclass
+class _CacheEntry:
+    """缓存条目"""
+
+    path: str
+    mtime_ns: int
+    size: int
+    digest: str
+    schema: str
+    payload: bytes  # pickle 后的 SeckillConfig，每次读取都得到独立的副本
+
+
+class CompiledConfigCache:
+    """编译配置缓存，进程内存和磁盘两级"""
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self._memory: Dict[str, _CacheEntry] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def schema(self) -> str:
+        """缓存版本标签，首次使用时计算，避免导入 config 时读取源码"""
+        return _schema_tag()
+
+    def _cache_file(self, path: Path) -> Path:
+        """缓存文件位置: 按配置文件绝对路径哈希命名"""
+        key = hashlib.sha256(str(path).encode("utf-8")).hexdigest()[:16]
+        return self.cache_dir / f"{path.stem}.{key}.pickle"
+
+    def _read_entry(self, cache_file: Path) -> Optional[_CacheEntry]:
+        """读取磁盘缓存，损坏、版本不符或权限不安全时视为未命中"""
+        try:
+            with open(cache_file, "rb") as f:
+                if not _is_private(os.fstat(f.fileno())):
+                    logger.warning(f"忽略非私有的配置缓存: {cache_file}")
+                    return None
+                entry = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"读取配置缓存失败: {cache_file}: {e}")
+            return None
+        if not isinstance(entry, _CacheEntry) or entry.schema != self.schema:
+            return None
+        return entry
+
+    def _write_entry(self, cache_file: Path, entry: _CacheEntry) -> None:
+        """原子写入磁盘缓存（目录 0700、文件 0600），目录不可写时只保留内存缓存"""
+        try:
+            cache_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            temp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            fd = os.open(temp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            if hasattr(os, "fchmod"):
+                os.fchmod(fd, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp, cache_file)
+        except OSError as e:
+            logger.debug(f"写入配置缓存失败: {cache_file}: {e}")
+
+    def load(
+        self, config_path: str, compile_config: Callable[[bytes, Path], SeckillConfig]
+    ) -> SeckillConfig:
+        """
+        读取配置，缓存失效时调用 compile_config 重新解析和验证
+
+        Args:
+            config_path: 配置文件路径
+            compile_config: 接收文件内容和路径，返回验证后配置对象的函数
+
+        Returns:
+            秒杀配置对象
+        """
+        path = Path(config_path).resolve()
+        stat = path.stat()
+        cache_file = self._cache_file(path)
+
+        entry = self._memory.get(str(path)) or self._read_entry(cache_file)
+        if entry is not None and (entry.mtime_ns, entry.size) == (
+            stat.st_mtime_ns,
+            stat.st_size,
+        ):
+            self._memory[str(path)] = entry
+            self.hits += 1
+            return pickle.loads(entry.payload)
+
+        content = path.read_bytes()
+        digest = hashlib.sha256(content).hexdigest()
+        if entry is not None and entry.digest == digest:
+            # 文件被 touch 但内容未变，只更新修改时间
+            entry.mtime_ns, entry.size = stat.st_mtime_ns, stat.st_size
+            self._memory[str(path)] = entry
+            self._write_entry(cache_file, entry)
+            self.hits += 1
+            return pickle.loads(entry.payload)
+
+        self.misses += 1
+        config = compile_config(content, path)
+        entry = _CacheEntry(
+            path=str(path),
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            digest=digest,
+            schema=self.schema,
+            payload=pickle.dumps(config, protocol=pickle.HIGHEST_PROTOCOL),
+        )
+        self._memory[str(path)] = entry
+        self._write_entry(cache_file, entry)
+        return config
+
+    def stats(self) -> Tuple[int, int]:
+        """(命中次数, 未命中次数)"""
+        return self.hits, self.misses
@@ -5,20 +5,33 @@
 """
 
 import json
-import yaml
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from loguru import logger
 
 from .base import IConfigManager, SeckillConfig, TaskSchedule
+from .cache import CompiledConfigCache
 from .validators import ConfigValidator
 
+# 进程内共享的编译配置缓存
+_shared_cache = CompiledConfigCache()
+
 
 class ConfigManager(IConfigManager):
     """配置管理器实现"""
 
-    def __init__(self):
+    def __init__(self, use_cache: bool = True):
         self.validator = ConfigValidator()
+        self.cache: Optional[CompiledConfigCache] = _shared_cache if use_cache else None
+
+    @staticmethod
+    def _parse_config(text: str, suffix: str) -> Dict[str, Any]:
+        """按文件后缀解析JSON或YAML内容"""
+        if suffix.lower() in (".yaml", ".yml"):
+            import yaml
+
+            return yaml.safe_load(text)
+        return json.loads(text)
 
     def load_config(self, config_path: str) -> Dict[str, Any]:
         """
@@ -36,13 +49,7 @@ class ConfigManager(IConfigManager):
                 raise FileNotFoundError(f"配置文件不存在: {config_path}")
 
             with open(config_file, "r", encoding="utf-8") as f:
-                if (
-                    config_file.suffix.lower() == ".yaml"
-                    or config_file.suffix.lower() == ".yml"
-                ):
-                    return yaml.safe_load(f)
-                else:
-                    return json.load(f)
+                return self._parse_config(f.read(), config_file.suffix)
 
         except Exception as e:
             logger.error(f"加载配置文件失败: {e}")
@@ -84,6 +91,8 @@ class ConfigManager(IConfigManager):
                     config_file.suffix.lower() == ".yaml"
                     or config_file.suffix.lower() == ".yml"
                 ):
+                    import yaml
+
                     yaml.dump(config, f, default_flow_style=False, allow_unicode=True)
                 else:
                     json.dump(config, f, indent=4, ensure_ascii=False)
@@ -105,7 +114,22 @@ class ConfigManager(IConfigManager):
         Returns:
             秒杀配置对象
         """
-        config_dict = self.load_config(config_path)
+        if self.cache is None or not Path(config_path).exists():
+            return self._build_seckill_config(self.load_config(config_path))
+
+        return self.cache.load(config_path, self._compile_seckill_config)
+
+    def _compile_seckill_config(self, content: bytes, path: Path) -> SeckillConfig:
+        """解析并验证配置文件内容，供编译配置缓存在失效时调用"""
+        try:
+            config_dict = self._parse_config(content.decode("utf-8"), path.suffix)
+        except Exception as e:
+            logger.error(f"加载配置文件失败: {e}")
+            raise
+        return self._build_seckill_config(config_dict)
+
+    def _build_seckill_config(self, config_dict: Dict[str, Any]) -> SeckillConfig:
+        """验证配置字典并创建配置对象"""
         if not self.validate_config(config_dict):
             raise ValueError("配置验证失败")
 
@@ -119,27 +143,42 @@ class ConfigManager(IConfigManager):
             schedule_path: 调度配置文件路径
 
         Returns:
-            调度配置字典
+            {分组: 任务列表}，分组为两位数的小时（按小时分组的旧格式）或 "tasks"
         """
-        from datetime import datetime
-
         config_dict = self.load_config(schedule_path)
-        schedules = {}
-
-        for hour_str, tasks in config_dict.items():
-            schedules[hour_str] = [
-                TaskSchedule(
-                    start_time=datetime.strptime(
-                        task["start_time"], "%H:%M:%S.%f"
-                    ).time(),
-                    config_file=task["config_file"],
-                    enabled=task.get("enabled", True),
-                    description=task.get("description", ""),
-                )
-                for task in tasks
-            ]
-
-        return schedules
+        if not self.validator.validate_schedule_config(config_dict):
+            raise ValueError("调度配置验证失败")
+
+        return {
+            group: [TaskSchedule.from_dict(task) for task in tasks]
+            for group, tasks in config_dict.items()
+        }
+
+    def check_config_file(self, config_path: str) -> Tuple[str, List[str]]:
+        """
+        按内容识别配置类型并检查，报告全部错误
+
+        Args:
+            config_path: 配置文件路径
+
+        Returns:
+            (配置类型, 错误列表) 元组，无法识别的文件类型为 "unknown"
+        """
+        try:
+            config = self.load_config(config_path)
+        except Exception as e:
+            return "unknown", [f"无法解析: {e}"]
+
+        name = Path(config_path).stem.lower()
+        if isinstance(config, dict) and "users" in config and "start_time" in config:
+            return "seckill", self.validator.check_seckill_config(config)
+        if name.startswith("schedule"):
+            return "schedule", self.validator.check_schedule_config(config)
+        if name.startswith("notification") or (
+            isinstance(config, dict) and "services" in config
+        ):
+            return "notification", self.validator.check_notification_config(config)
+        return "unknown", []
 
     def create_default_config(self, config_path: str) -> bool:
         """
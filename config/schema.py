@@ -0,0 +1,323 @@
+"""
+配置结构定义
+
+用声明式规则描述秒杀、调度和通知配置。规则编译一次后得到校验函数，
+校验时收集所有错误而不是在第一个错误处停止
+"""
+
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# 编译后的校验函数: (值, 路径, 错误列表) -> None
+Check = Callable[[Any, str, List[str]], None]
+
+
+def _join(path: str, name: str) -> str:
+    return f"{path}.{name}" if path else name
+
+
+class Rule(ABC):
+    """配置规则"""
+
+    @abstractmethod
+    def compile(self) -> Check:
+        """编译为校验函数"""
+        pass
+
+
+class Value(Rule):
+    """标量规则：类型和可选的取值条件"""
+
+    def __init__(
+        self,
+        types: Tuple[type, ...],
+        description: str,
+        predicate: Optional[Callable[[Any], bool]] = None,
+    ):
+        self.types = types
+        self.description = description
+        self.predicate = predicate
+
+    def compile(self) -> Check:
+        types, description, predicate = self.types, self.description, self.predicate
+        # bool 是 int 的子类，数字字段不接受布尔值
+        reject_bool = bool not in types
+
+        def check(value: Any, path: str, errors: List[str]) -> None:
+            if (
+                not isinstance(value, types)
+                or (reject_bool and isinstance(value, bool))
+                or (predicate is not None and not predicate(value))
+            ):
+                errors.append(f"{path} 必须是{description}")
+
+        return check
+
+
+class Nullable(Rule):
+    """允许为 null 的规则"""
+
+    def __init__(self, rule: Rule):
+        self.rule = rule
+
+    def compile(self) -> Check:
+        inner = self.rule.compile()
+
+        def check(value: Any, path: str, errors: List[str]) -> None:
+            if value is not None:
+                inner(value, path, errors)
+
+        return check
+
+
+class ListOf(Rule):
+    """列表规则，逐项校验"""
+
+    def __init__(self, item: Rule):
+        self.item = item
+
+    def compile(self) -> Check:
+        item = self.item.compile()
+
+        def check(value: Any, path: str, errors: List[str]) -> None:
+            if not isinstance(value, list):
+                errors.append(f"{path} 必须是列表")
+                return
+            for i, element in enumerate(value):
+                item(element, f"{path}[{i}]", errors)
+
+        return check
+
+
+class MapOf(Rule):
+    """键任意、值同构的字典规则"""
+
+    def __init__(
+        self,
+        value: Rule,
+        key_predicate: Optional[Callable[[str], bool]] = None,
+        key_description: str = "",
+    ):
+        self.value = value
+        self.key_predicate = key_predicate
+        self.key_description = key_description
+
+    def compile(self) -> Check:
+        value_check = self.value.compile()
+        key_predicate, key_description = self.key_predicate, self.key_description
+
+        def check(value: Any, path: str, errors: List[str]) -> None:
+            if not isinstance(value, dict):
+                errors.append(f"{path or '配置'} 必须是字典")
+                return
+            for key, item in value.items():
+                if key_predicate is not None and not key_predicate(key):
+                    errors.append(f"{_join(path, str(key))} 键必须是{key_description}")
+                    continue
+                value_check(item, _join(path, str(key)), errors)
+
+        return check
+
+
+class Struct(Rule):
+    """固定字段的字典规则"""
+
+    def __init__(
+        self,
+        fields: Dict[str, Rule],
+        required: Iterable[str] = (),
+        allow_extra: bool = True,
+        one_of: Iterable[Tuple[str, ...]] = (),
+    ):
+        """
+        Args:
+            fields: {字段名: 规则}
+            required: 必需字段
+            allow_extra: 是否允许未声明的字段
+            one_of: 字段组，每组至少需要出现一个字段
+        """
+        self.fields = fields
+        self.required = tuple(required)
+        self.allow_extra = allow_extra
+        self.one_of = tuple(tuple(group) for group in one_of)
+
+    def compile(self) -> Check:
+        fields = {name: rule.compile() for name, rule in self.fields.items()}
+        required, allow_extra, one_of = self.required, self.allow_extra, self.one_of
+
+        def check(value: Any, path: str, errors: List[str]) -> None:
+            if not isinstance(value, dict):
+                errors.append(f"{path or '配置'} 必须是字典")
+                return
+            for name in required:
+                if name not in value:
+                    errors.append(f"{path or '配置'} 缺少必需字段: {name}")
+            for group in one_of:
+                if all(value.get(name) is None for name in group):
+                    errors.append(
+                        f"{path or '配置'} 至少需要以下字段之一: {', '.join(group)}"
+                    )
+            for name, item in value.items():
+                field_check = fields.get(name)
+                if field_check is not None:
+                    field_check(item, _join(path, name), errors)
+                elif not allow_extra:
+                    errors.append(f"{path or '配置'} 未知字段: {name}")
+
+        return check
+
+
+def compile_schema(rule: Rule) -> Callable[[Any], List[str]]:
+    """
+    编译配置规则
+
+    Args:
+        rule: 根规则
+
+    Returns:
+        接收配置、返回全部错误信息的函数
+    """
+    check = rule.compile()
+
+    def validate(config: Any) -> List[str]:
+        errors: List[str] = []
+        check(config, "", errors)
+        return errors
+
+    return validate
+
+
+def _is_time(value: str) -> bool:
+    try:
+        datetime.strptime(value, "%H:%M:%S.%f")
+        return True
+    except ValueError:
+        return False
+
+
+def _is_date(value: str) -> bool:
+    try:
+        date.fromisoformat(value)
+        return True
+    except ValueError:
+        return False
+
+
+def _is_cron(value: str) -> bool:
+    from utils.cron import is_valid_cron
+
+    return is_valid_cron(value)
+
+
+def _is_hour(value: str) -> bool:
+    return isinstance(value, str) and value.isdigit() and 0 <= int(value) <= 23
+
+
+# 新格式的调度配置把任务放在 "tasks" 分组下，不再按小时分组
+TASKS_GROUP = "tasks"
+
+
+def _is_schedule_group(value: str) -> bool:
+    return value == TASKS_GROUP or _is_hour(value)
+
+
+STRING = Value((str,), "字符串")
+BOOLEAN = Value((bool,), "布尔值")
+INTEGER = Value((int,), "整数")
+NON_NEGATIVE_INTEGER = Value((int,), "非负整数", lambda v: v >= 0)
+POSITIVE_INTEGER = Value((int,), "正整数", lambda v: v >= 1)
+NUMBER = Value((int, float), "数字")
+POSITIVE_NUMBER = Value((int, float), "大于0的数字", lambda v: v > 0)
+NON_NEGATIVE_NUMBER = Value((int, float), "非负数字", lambda v: v >= 0)
+MAPPING = Value((dict,), "字典")
+TIME = Value((str,), "HH:MM:SS.fff 格式的时间", _is_time)
+DATE = Value((str,), "YYYY-MM-DD 格式的日期", _is_date)
+CRON = Value((str,), "5段cron表达式(分 时 日 月 周)", _is_cron)
+STRING_LIST = ListOf(STRING)
+
+USER_SCHEMA = Struct(
+    {
+        "account_name": STRING,
+        "cookie_id": STRING,
+        "cookie_name": STRING,
+        "basurl": STRING,
+        "headers": MAPPING,
+        "data": MAPPING,
+        "max_attempts": POSITIVE_INTEGER,
+        "thread_count": POSITIVE_INTEGER,
+        "key_value": STRING,
+        "key_message": STRING,
+        "proxy_flag": BOOLEAN,
+        "strategy_flag": Nullable(STRING),
+        "strategy_params": Nullable(MAPPING),
+        "request_interval": POSITIVE_NUMBER,
+        "success_patterns": Nullable(STRING_LIST),
+        "retry_patterns": Nullable(STRING_LIST),
+        "terminal_patterns": Nullable(STRING_LIST),
+        "default_terminal_patterns": BOOLEAN,
+        "request_timeout": POSITIVE_NUMBER,
+        "hedge_requests": BOOLEAN,
+        "warmup_probes": NON_NEGATIVE_INTEGER,
+        "warmup_url": STRING,
+        "max_in_flight": NON_NEGATIVE_INTEGER,
+    },
+    required=("account_name", "cookie_id", "cookie_name", "basurl", "headers", "data"),
+    # 用户字段直接传给 UserConfig，未知字段会导致创建失败
+    allow_extra=False,
+)
+
+SECKILL_SCHEMA = Struct(
+    {
+        "start_time": TIME,
+        "users": ListOf(USER_SCHEMA),
+        "proxies": STRING,
+        "mixues": Nullable(ListOf(MAPPING)),
+        "bw_keywords": STRING,
+        "bw_encrypt_url": STRING,
+        "bw_encrypt_batch": BOOLEAN,
+        "bw_encrypt_timeout": POSITIVE_NUMBER,
+    },
+    required=("start_time", "users"),
+)
+
+TASK_SCHEMA = Struct(
+    {
+        "start_time": TIME,
+        "config_file": STRING,
+        "enabled": BOOLEAN,
+        "description": STRING,
+        "lead_time": Nullable(NON_NEGATIVE_NUMBER),
+        "cron": Nullable(CRON),
+        "offset": NUMBER,
+        "start_date": Nullable(DATE),
+        "end_date": Nullable(DATE),
+        "timeout": Nullable(POSITIVE_NUMBER),
+    },
+    required=("config_file",),
+    one_of=(("start_time", "cron"),),
+)
+
+SCHEDULE_SCHEMA = MapOf(
+    ListOf(TASK_SCHEMA), _is_schedule_group, f"00-23 的小时或 {TASKS_GROUP}"
+)
+
+NOTIFICATION_SERVICE_SCHEMA = Struct(
+    {
+        "type": Value((str,), "lark 或 wechat", lambda v: v in ("lark", "wechat")),
+        "enabled": BOOLEAN,
+        "webhook_url": STRING,
+        "secret": STRING,
+        "app_id": STRING,
+        "app_secret": STRING,
+        "template_id": STRING,
+    },
+    required=("type",),
+)
+
+NOTIFICATION_SCHEMA = Struct(
+    {
+        "default_service": STRING,
+        "services": MapOf(NOTIFICATION_SERVICE_SCHEMA),
+    }
+)
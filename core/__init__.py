@@ -2,24 +2,34 @@
 核心业务层模块
 
 包含秒杀、调度、通知等核心业务逻辑
+
+导出的名称在首次访问时才导入对应模块
 """
 
-from .seckill import SeckillExecutor, SeckillManager
-from .scheduler import SeckillScheduler, TaskManager
-from .notification import (
-    INotificationService,
-    NotificationManager,
-    LarkNotificationService,
-    NotificationConfigManager,
-)
-
-__all__ = [
-    "SeckillExecutor",
-    "SeckillManager",
-    "SeckillScheduler",
-    "TaskManager",
-    "INotificationService",
-    "NotificationManager",
-    "LarkNotificationService",
-    "NotificationConfigManager",
-]
+import importlib
+
+_LAZY_ATTRS = {
+    "SeckillExecutor": ".seckill",
+    "SeckillManager": ".seckill",
+    "SeckillScheduler": ".scheduler",
+    "TaskManager": ".scheduler",
+    "INotificationService": ".notification",
+    "NotificationManager": ".notification",
+    "LarkNotificationService": ".notification",
+    "NotificationConfigManager": ".notification",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
@@ -2,9 +2,30 @@
 调度器模块
 
 提供任务调度和调度管理功能
+
+导出的名称在首次访问时才导入对应模块
 """
 
-from .scheduler import SeckillScheduler
-from .task_manager import TaskManager
+import importlib
+
+_LAZY_ATTRS = {
+    "SeckillScheduler": ".scheduler",
+    "TaskManager": ".task_manager",
+    "TaskRunner": ".runner",
+    "WorkerPool": ".worker_pool",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["SeckillScheduler", "TaskManager"]
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
@@ -0,0 +1,168 @@
+"""
+调度器控制接口
+
+监视/守护模式下在 Unix 域套接字上提供控制命令，无需重启调度器即可管理任务。
+协议为单行 JSON：请求 {"command": 命令, "args": {...}}，
+响应 {"ok": true, "result": ...} 或 {"ok": false, "error": 错误信息}
+"""
+
+import json
+import os
+import socket
+import socketserver
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+from loguru import logger
+
+if TYPE_CHECKING:
+    from .scheduler import SeckillScheduler
+
+DEFAULT_SOCKET_PATH = "run/scheduler.sock"
+
+# 单个请求的最大字节数
+MAX_REQUEST_SIZE = 1024 * 1024
+
+
+class ControlError(Exception):
+    """控制命令执行失败"""
+
+    pass
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """处理一条控制请求"""
+
+    def handle(self):
+        line = self.rfile.readline(MAX_REQUEST_SIZE)
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ControlError("请求必须是 JSON 对象")
+            result = self.server.dispatch(
+                request.get("command", ""), request.get("args") or {}
+            )
+            response = {"ok": True, "result": result}
+        except (ControlError, ValueError, TypeError, KeyError) as e:
+            response = {"ok": False, "error": str(e)}
+        except Exception as e:
+            logger.exception(f"控制命令执行出错: {e}")
+            response = {"ok": False, "error": f"内部错误: {e}"}
+        self.wfile.write(
+            json.dumps(response, ensure_ascii=False, default=str).encode("utf-8")
+            + b"\n"
+        )
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, commands: Dict[str, Callable[..., Any]]):
+        self.commands = commands
+        super().__init__(path, _Handler)
+
+    def dispatch(self, command: str, args: Dict[str, Any]) -> Any:
+        handler = self.commands.get(command)
+        if handler is None:
+            raise ControlError(
+                f"未知命令: {command}，可用命令: {', '.join(sorted(self.commands))}"
+            )
+        return handler(**args)
+
+
+class ControlServer:
+    """调度器控制服务"""
+
+    def __init__(
+        self, scheduler: "SeckillScheduler", socket_path: str = DEFAULT_SOCKET_PATH
+    ):
+        """
+        Args:
+            scheduler: 调度器
+            socket_path: Unix 域套接字路径
+        """
+        self.scheduler = scheduler
+        self.socket_path = socket_path
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """在后台线程中开始监听"""
+        directory = os.path.dirname(self.socket_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.socket_path):
+            if _is_listening(self.socket_path):
+                raise ControlError(f"控制套接字已被其他调度器占用: {self.socket_path}")
+            os.unlink(self.socket_path)
+
+        self._server = _Server(self.socket_path, self.scheduler.control_commands())
+        os.chmod(self.socket_path, 0o600)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="scheduler-control", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"控制接口已启动: {self.socket_path}")
+
+    def close(self) -> None:
+        """停止监听并删除套接字文件"""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        self._server = self._thread = None
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+
+def _is_listening(socket_path: str) -> bool:
+    """套接字文件是否有进程在监听（区分残留文件）"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+            return True
+        except OSError:
+            return False
+
+
+def send_command(
+    command: str,
+    socket_path: str = DEFAULT_SOCKET_PATH,
+    timeout: float = 10.0,
+    **args: Any,
+) -> Any:
+    """
+    向运行中的调度器发送控制命令
+
+    Args:
+        command: 命令名称
+        socket_path: Unix 域套接字路径
+        timeout: 超时秒数
+        **args: 命令参数
+
+    Returns:
+        命令结果
+
+    Raises:
+        ControlError: 无法连接调度器或命令执行失败
+    """
+    request = json.dumps({"command": command, "args": args}, ensure_ascii=False)
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path)
+            sock.sendall(request.encode("utf-8") + b"\n")
+            with sock.makefile("rb") as f:
+                line = f.readline()
+    except OSError as e:
+        raise ControlError(f"无法连接调度器控制接口 {socket_path}: {e}") from e
+
+    if not line:
+        raise ControlError("调度器没有返回结果")
+    response = json.loads(line)
+    if not response.get("ok"):
+        raise ControlError(response.get("error", "未知错误"))
+    return response.get("result")
@@ -0,0 +1,250 @@
+"""
+任务触发队列
+
+按任务下一次启动的绝对时间排序的优先队列，替代按整点轮询。队列中每个任务只保存
+下一次运行，同时作为“接下来的触发”查询的索引：查询从堆顶开始按需展开，
+耗时只与返回的条数有关，与任务总数无关
+"""
+
+import heapq
+import itertools
+from dataclasses import astuple, dataclass, field, replace
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from config import TaskSchedule
+from .rules import TaskRule
+
+
+@dataclass(order=True)
+class ScheduledRun:
+    """一次计划中的任务运行"""
+
+    launch_at: datetime  # 启动时间: 开始时间减去提前量
+    seq: int  # 启动时间相同时按入队顺序
+    fire_at: datetime = field(compare=False)  # 任务开始时间
+    hour: str = field(compare=False)
+    index: int = field(compare=False)
+    task: TaskSchedule = field(compare=False)
+
+    @property
+    def key(self) -> str:
+        """任务标识"""
+        return f"{self.hour}:{self.index}"
+
+    def occurrence(self) -> TaskSchedule:
+        """本次运行的任务：cron 任务的开始时间取本次的开始时间"""
+        if self.task.cron is None:
+            return self.task
+        return replace(self.task, start_time=self.fire_at.time())
+
+
+def _identity(hour: str, task: TaskSchedule) -> Tuple:
+    """任务的内容标识，字段完全相同的任务视为同一任务"""
+    return (hour,) + astuple(task)
+
+
+class FireQueue:
+    """任务触发队列"""
+
+    def __init__(self, lead_time: float = 60.0):
+        """
+        Args:
+            lead_time: 任务未设置 lead_time 时，在开始时间之前多少秒启动任务
+        """
+        self.lead_time = timedelta(seconds=lead_time)
+        self._heap: List[ScheduledRun] = []
+        self._counter = itertools.count()
+        self._rules: Dict[Tuple, TaskRule] = {}
+        # 每个 (分组, 配置文件) 最近一次启动的开始时间，任务被修改后不会重新加入已启动的运行
+        self._launched: Dict[Tuple[str, str], datetime] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def lead_time_of(self, task: TaskSchedule) -> timedelta:
+        """任务的预热提前量"""
+        if task.lead_time is None:
+            return self.lead_time
+        return timedelta(seconds=task.lead_time)
+
+    def rule_of(self, task: TaskSchedule) -> TaskRule:
+        """任务的触发规则，按任务内容缓存"""
+        identity = astuple(task)
+        rule = self._rules.get(identity)
+        if rule is None:
+            rule = self._rules[identity] = TaskRule(task)
+        return rule
+
+    def _make_run(
+        self, fire_at: datetime, hour: str, index: int, task: TaskSchedule, seq: int
+    ) -> ScheduledRun:
+        return ScheduledRun(
+            launch_at=fire_at - self.lead_time_of(task),
+            seq=seq,
+            fire_at=fire_at,
+            hour=hour,
+            index=index,
+            task=task,
+        )
+
+    def _push_next(
+        self, after: datetime, hour: str, index: int, task: TaskSchedule
+    ) -> Optional[ScheduledRun]:
+        """把任务在 after 之后的下一次运行入队，规则不会再触发时返回 None"""
+        fire_at = self.next_fire_time(task, after)
+        if fire_at is None:
+            return None
+        run = self._make_run(fire_at, hour, index, task, next(self._counter))
+        heapq.heappush(self._heap, run)
+        return run
+
+    def next_fire_time(self, task: TaskSchedule, now: datetime) -> Optional[datetime]:
+        """
+        任务严格晚于 now 的下一次开始时间
+
+        Args:
+            task: 任务
+            now: 当前时间
+
+        Returns:
+            下一次开始时间，超出生效日期范围或规则不会再触发时返回 None
+        """
+        return self.rule_of(task).next_after(now)
+
+    def load(self, schedules: Dict[str, List[TaskSchedule]], now: datetime) -> None:
+        """
+        按调度配置重建队列，禁用和已过期的任务不入队
+
+        Args:
+            schedules: {分组: 任务列表}
+            now: 当前时间
+        """
+        self._heap = []
+        self._rules = {}
+        for hour, tasks in schedules.items():
+            for index, task in enumerate(tasks):
+                if task.enabled:
+                    self._push_next(now, hour, index, task)
+
+    def update(
+        self, schedules: Dict[str, List[TaskSchedule]], now: datetime
+    ) -> Tuple[List[ScheduledRun], List[ScheduledRun]]:
+        """
+        按新的调度配置增量更新队列：未变化的任务保留原有的计划运行，
+        只移除被删除或修改的任务、加入新增或修改后的任务；同一分组中使用同一配置文件的
+        任务已经启动的运行不会再次入队，保证每次运行只执行一次
+
+        Args:
+            schedules: {分组: 任务列表}
+            now: 当前时间
+
+        Returns:
+            (新加入的计划运行, 被移除的计划运行)
+        """
+        wanted: Dict[Tuple, Tuple[str, int, TaskSchedule]] = {}
+        for hour, tasks in schedules.items():
+            for index, task in enumerate(tasks):
+                if task.enabled:
+                    wanted[_identity(hour, task)] = (hour, index, task)
+
+        # 一天前启动的记录已不影响下一次运行
+        self._launched = {
+            key: fire_at
+            for key, fire_at in self._launched.items()
+            if fire_at > now - timedelta(days=1)
+        }
+
+        kept, removed = [], []
+        for run in self._heap:
+            identity = _identity(run.hour, run.task)
+            if identity in wanted:
+                hour, index, task = wanted.pop(identity)
+                # 同一任务在列表中的位置可能变化，只更新序号
+                run.index, run.task = index, task
+                kept.append(run)
+            else:
+                removed.append(run)
+
+        self._heap = kept
+        heapq.heapify(self._heap)
+        self._rules = {
+            astuple(run.task): self._rules[astuple(run.task)] for run in kept
+        }
+        added = []
+        for hour, index, task in wanted.values():
+            # 预热窗口内修改的任务本次运行已经启动，从已启动的开始时间之后继续
+            after = max(now, self._launched.get((hour, task.config_file), now))
+            run = self._push_next(after, hour, index, task)
+            if run is not None:
+                added.append(run)
+        return added, removed
+
+    def fires(
+        self, count: Optional[int] = None, until: Optional[datetime] = None
+    ) -> List[ScheduledRun]:
+        """
+        按启动时间排序的接下来的运行，包含同一任务的多次运行
+
+        从堆顶开始按需展开：取出一个运行后只把它在堆中的两个子节点和该任务的下一次运行
+        加入候选，返回 k 条结果的耗时为 O(k log k)，与任务总数无关
+
+        Args:
+            count: 最多返回的条数
+            until: 只返回开始时间不晚于该时间的运行
+
+        Returns:
+            计划运行列表
+        """
+        if count is None and until is None:
+            raise ValueError("count 和 until 至少需要指定一个")
+
+        result: List[ScheduledRun] = []
+        # 候选: (运行, 在堆中的下标)，任务的后续运行不在堆中，下标为 -1
+        frontier: List[Tuple[ScheduledRun, int]] = []
+        if self._heap:
+            frontier.append((self._heap[0], 0))
+        while frontier and (count is None or len(result) < count):
+            run, i = heapq.heappop(frontier)
+            # 启动时间不晚于开始时间，启动时间超过 until 后不会再有符合条件的运行
+            if until is not None and run.launch_at > until:
+                break
+            if until is None or run.fire_at <= until:
+                result.append(run)
+
+            if i >= 0:
+                for child in (2 * i + 1, 2 * i + 2):
+                    if child < len(self._heap):
+                        heapq.heappush(frontier, (self._heap[child], child))
+            fire_at = self.next_fire_time(run.task, run.fire_at)
+            if fire_at is not None:
+                following = self._make_run(
+                    fire_at, run.hour, run.index, run.task, run.seq
+                )
+                heapq.heappush(frontier, (following, -1))
+        return result
+
+    def peek(self) -> Optional[ScheduledRun]:
+        """最早启动的计划运行"""
+        return self._heap[0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> List[ScheduledRun]:
+        """
+        取出所有已到启动时间的计划运行，并把它们的下一次运行入队
+
+        下一次运行由本次的开始时间推算而不是由当前时间推算，
+        因此每次计划运行恰好执行一次，不会因为唤醒延迟而重复或跳过
+
+        Args:
+            now: 当前时间
+
+        Returns:
+            到期的计划运行，按启动时间排序
+        """
+        due = []
+        while self._heap and self._heap[0].launch_at <= now:
+            run = heapq.heappop(self._heap)
+            due.append(run)
+            self._launched[(run.hour, run.task.config_file)] = run.fire_at
+            self._push_next(run.fire_at, run.hour, run.index, run.task)
+        return due
@@ -0,0 +1,67 @@
+"""
+任务触发规则
+
+把任务的开始时间、cron 规则和生效日期范围编译为计算下一次开始时间的规则
+"""
+
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from config import TaskSchedule
+from utils.cron import parse_cron
+
+
+class TaskRule:
+    """编译后的任务触发规则"""
+
+    def __init__(self, task: TaskSchedule):
+        """
+        Args:
+            task: 任务
+
+        Raises:
+            ValueError: 任务既没有开始时间也没有 cron 规则，或 cron 规则无效
+        """
+        if task.cron is None and task.start_time is None:
+            raise ValueError("任务需要 start_time 或 cron")
+        self.cron = parse_cron(task.cron) if task.cron else None
+        self.offset = timedelta(seconds=task.offset)
+        self.start_time = task.start_time
+        self.start_date: Optional[date] = task.start_date
+        self.end_date: Optional[date] = task.end_date
+
+    def _next_raw(self, after: datetime) -> Optional[datetime]:
+        """不考虑日期范围的下一次开始时间"""
+        if self.cron is not None:
+            # 开始时间 = 命中的整分钟 + offset，要求严格晚于 after
+            minute = self.cron.next_after(after - self.offset)
+            return None if minute is None else minute + self.offset
+
+        fire_at = datetime.combine(after.date(), self.start_time)
+        if fire_at <= after:
+            fire_at += timedelta(days=1)
+        return fire_at
+
+    def next_after(self, after: datetime) -> Optional[datetime]:
+        """
+        严格晚于 after 的下一次开始时间
+
+        Args:
+            after: 起点
+
+        Returns:
+            下一次开始时间，超出生效日期范围后返回 None
+        """
+        if self.start_date is not None:
+            # 生效日期之前的时间直接跳到生效日期的零点
+            first = datetime.combine(self.start_date, time.min) - timedelta(
+                microseconds=1
+            )
+            after = max(after, first)
+
+        fire_at = self._next_raw(after)
+        if fire_at is None:
+            return None
+        if self.end_date is not None and fire_at.date() > self.end_date:
+            return None
+        return fire_at
@@ -0,0 +1,347 @@
+"""
+任务运行器
+
+每个任务在独立进程中运行，互不阻塞；同时运行的任务数受并发上限约束。
+监控线程为每个任务设置截止时间（开始时间加运行窗口），超时后结束整个进程组，
+预热阶段意外退出的任务进程会重新启动
+"""
+
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from config import TaskSchedule
+from utils import TimeSynchronizer
+
+if TYPE_CHECKING:
+    from .worker_pool import WorkerPool
+
+
+@dataclass
+class TaskResult:
+    """任务进程的运行结果"""
+
+    task: TaskSchedule
+    success: bool
+    failure_reason: str = ""
+    started_at: float = 0.0
+    elapsed: float = 0.0
+    timed_out: bool = False
+    restarts: int = 0
+
+
+def _run_task_process(
+    task: TaskSchedule, conn, fire_at: Optional[datetime] = None
+) -> None:
+    """任务进程入口，把异常信息通过管道发回调度器；fire_at 为本次运行确切的开始时间"""
+    # 成为新进程组的组长，超时时连同秒杀工作进程和 Node 子进程一起结束
+    if hasattr(os, "setsid"):
+        try:
+            os.setsid()
+        except OSError:
+            pass
+    try:
+        from core.seckill import SeckillManager
+
+        SeckillManager(config_file=task.config_file, fire_at=fire_at).run()
+        conn.send((True, ""))
+    except Exception as e:
+        conn.send((False, str(e)))
+    finally:
+        conn.close()
+
+
+# 非 POSIX 平台没有 SIGKILL，退化为 SIGTERM
+_KILL_SIGNALS = (signal.SIGTERM, getattr(signal, "SIGKILL", signal.SIGTERM))
+
+
+def _kill_tree(process, grace: float) -> None:
+    """
+    结束任务进程及其进程组：先发送 SIGTERM，grace 秒后对整个进程组发送 SIGKILL
+
+    Args:
+        process: 任务进程
+        grace: 等待进程自行退出的秒数
+    """
+    for sig in _KILL_SIGNALS:
+        try:
+            os.killpg(process.pid, sig)
+        except (AttributeError, ProcessLookupError, PermissionError):
+            # 进程还没来得及成为进程组组长，或平台不支持进程组
+            if not process.is_alive():
+                pass
+            elif sig == signal.SIGTERM:
+                process.terminate()
+            else:
+                process.kill()
+        process.join(grace)
+
+
+class TaskRunner:
+    """任务运行器"""
+
+    def __init__(
+        self,
+        max_concurrent: int = 4,
+        on_complete: Optional[Callable[[TaskResult], None]] = None,
+        pool: Optional["WorkerPool"] = None,
+        execute: Optional[
+            Callable[[TaskSchedule, float, Optional[datetime]], None]
+        ] = None,
+        task_timeout: float = 300.0,
+        max_restarts: int = 2,
+        kill_grace: float = 5.0,
+    ):
+        """
+        Args:
+            max_concurrent: 同时运行的任务进程上限
+            on_complete: 任务结束后的回调，在监控线程中调用
+            pool: 预启动工作进程池，为 None 时每个任务新建进程
+            execute: 在当前进程中运行任务的函数（守护模式），参数为任务、截止时间戳和
+                本次运行确切的开始时间，设置后不再启动任务进程
+            task_timeout: 任务未设置 timeout 时，开始时间之后允许运行的秒数
+            max_restarts: 任务进程在开始时间之前意外退出时最多重新启动的次数
+            kill_grace: 超时后等待任务进程响应 SIGTERM 的秒数，之后强制结束
+        """
+        self.max_concurrent = max(1, max_concurrent)
+        self.on_complete = on_complete
+        self.pool = pool
+        self.execute = execute
+        self.task_timeout = task_timeout
+        self.max_restarts = max(0, max_restarts)
+        self.kill_grace = kill_grace
+        self._time_synchronizer = TimeSynchronizer()
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+        self._lock = threading.Lock()
+        self._running: Dict[int, TaskSchedule] = {}
+        self._processes: Dict[int, multiprocessing.Process] = {}
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def running(self) -> List[TaskSchedule]:
+        """正在运行的任务"""
+        with self._lock:
+            return list(self._running.values())
+
+    def submit(self, task: TaskSchedule, fire_at: Optional[float] = None) -> None:
+        """
+        提交任务，立即返回；有空闲并发名额时启动任务进程
+
+        Args:
+            task: 任务
+            fire_at: 本次运行的开始时间戳，为 None 时取任务开始时间的下一次
+        """
+        thread = threading.Thread(
+            target=self._supervise,
+            args=(task, fire_at),
+            name=f"task-{task.description or task.config_file}",
+            daemon=True,
+        )
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            self._threads.append(thread)
+        thread.start()
+
+    def _fire_timestamp(
+        self, task: TaskSchedule, fire_at: Optional[float]
+    ) -> Optional[float]:
+        """
+        本次运行的开始时间戳，未指定时取任务开始时间的下一次
+
+        该时间同时传给任务进程作为发出请求的时间，截止时间和实际开始时间来自同一处
+        """
+        if fire_at is None and task.start_time is not None:
+            fire_at = self._time_synchronizer.fire_timestamp(task.start_time)
+        if fire_at is None:
+            logger.warning(
+                f"任务没有确定的开始时间，按配置文件的开始时间运行，"
+                f"截止时间从现在开始计算: {task.description or task.config_file}"
+            )
+        return fire_at
+
+    def _deadline(self, task: TaskSchedule, fire_at: Optional[float]) -> float:
+        """截止时间戳: 开始时间（已过或未知时取当前时间）加运行窗口"""
+        timeout = self.task_timeout if task.timeout is None else task.timeout
+        return max(fire_at or 0.0, time.time()) + timeout
+
+    def _supervise(self, task: TaskSchedule, fire_at: Optional[float]) -> None:
+        """监控线程：等待并发名额、启动任务进程并收集结果"""
+        if not self._slots.acquire(blocking=False):
+            logger.warning(
+                f"已有 {self.max_concurrent} 个任务在运行，等待空闲名额: "
+                f"{task.description}"
+            )
+            self._slots.acquire()
+
+        try:
+            result = self._run(task, fire_at)
+        finally:
+            self._slots.release()
+
+        if result.success:
+            logger.info(f"任务完成: {task.description}，耗时 {result.elapsed:.1f} 秒")
+        else:
+            logger.error(f"任务执行失败: {task.description}: {result.failure_reason}")
+        if self.on_complete is not None:
+            try:
+                self.on_complete(result)
+            except Exception as e:
+                logger.error(f"任务结束回调失败: {e}")
+
+    def _launch(self, task: TaskSchedule, fire_at: Optional[float]):
+        """启动任务进程：优先使用预启动的空闲进程，否则新建进程"""
+        fire_datetime = datetime.fromtimestamp(fire_at) if fire_at else None
+        worker = self.pool.acquire() if self.pool is not None else None
+        if worker is not None and worker.dispatch(task, fire_datetime):
+            return worker.process, worker.conn, "预启动进程"
+
+        recv_conn, send_conn = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(
+            target=_run_task_process, args=(task, send_conn, fire_datetime)
+        )
+        try:
+            process.start()
+        finally:
+            send_conn.close()
+        return process, recv_conn, "新建进程"
+
+    def _run_inline(
+        self, task: TaskSchedule, fire_at: Optional[float], deadline: float
+    ) -> TaskResult:
+        """在当前进程中运行任务，由 execute 在截止时间取消未完成的请求"""
+        started_at = time.time()
+        key = threading.get_ident()
+        with self._lock:
+            self._running[key] = task
+        try:
+            self.execute(
+                task, deadline, datetime.fromtimestamp(fire_at) if fire_at else None
+            )
+            success, reason = True, ""
+        except Exception as e:
+            success, reason = False, str(e)
+        finally:
+            with self._lock:
+                self._running.pop(key, None)
+        return TaskResult(
+            task,
+            success,
+            reason,
+            started_at,
+            time.time() - started_at,
+            timed_out=not success and time.time() >= deadline,
+        )
+
+    def _run(self, task: TaskSchedule, fire_at: Optional[float] = None) -> TaskResult:
+        """
+        运行任务并等待结束
+
+        任务进程在开始时间之前（预热阶段）意外退出时重新启动，最多 max_restarts 次；
+        超过截止时间仍未结束时结束整个进程组
+        """
+        fire_at = self._fire_timestamp(task, fire_at)
+        deadline = self._deadline(task, fire_at)
+        if self.execute is not None:
+            return self._run_inline(task, fire_at, deadline)
+
+        started_at = time.time()
+        restarts = 0
+        while True:
+            try:
+                success, reason, timed_out, crashed = self._run_once(
+                    task, fire_at, deadline
+                )
+            except Exception as e:
+                return TaskResult(task, False, f"启动任务进程失败: {e}", started_at)
+
+            # 只重启没有发回结果就退出的进程，配置错误等任务自身的失败重启也无济于事
+            warming = fire_at is not None and time.time() < fire_at
+            if not crashed or not warming or restarts >= self.max_restarts:
+                break
+            restarts += 1
+            logger.warning(
+                f"任务进程在预热阶段退出，重新启动 ({restarts}/{self.max_restarts}): "
+                f"{task.description}: {reason}"
+            )
+
+        return TaskResult(
+            task,
+            success,
+            reason,
+            started_at,
+            time.time() - started_at,
+            timed_out=timed_out,
+            restarts=restarts,
+        )
+
+    def _run_once(self, task: TaskSchedule, fire_at: Optional[float], deadline: float):
+        """
+        启动一次任务进程并等待结束或超时
+
+        Returns:
+            (是否成功, 失败原因, 是否超时, 是否没有发回结果就退出)
+        """
+        launched_at = time.time()
+        process, recv_conn, kind = self._launch(task, fire_at)
+        with self._lock:
+            self._running[process.pid] = task
+            self._processes[process.pid] = process
+        logger.info(
+            f"任务进程已启动: {task.description} (pid={process.pid}, {kind}, "
+            f"{(time.time() - launched_at) * 1000:.1f}ms)"
+        )
+
+        success, reason, timed_out, crashed = False, "", False, False
+        try:
+            if recv_conn.poll(max(0.0, deadline - time.time())):
+                try:
+                    success, reason = recv_conn.recv()
+                except EOFError:
+                    reason, crashed = "任务进程异常退出", True
+                # 发回结果后进程应当很快退出
+                process.join(max(self.kill_grace, deadline - time.time()))
+            else:
+                timed_out = True
+                reason = "任务超过截止时间仍未结束，已结束进程组"
+
+            if success and process.exitcode not in (0, None):
+                success, reason = False, f"任务进程退出码 {process.exitcode}"
+            # 超时、失败或发回结果后仍未退出时，连同残留的子进程一起结束
+            if process.is_alive() or not success:
+                if process.is_alive():
+                    logger.warning(
+                        f"结束任务进程组: {task.description} (pid={process.pid})"
+                    )
+                _kill_tree(process, self.kill_grace)
+        finally:
+            recv_conn.close()
+            with self._lock:
+                self._running.pop(process.pid, None)
+                self._processes.pop(process.pid, None)
+        return success, reason, timed_out, crashed
+
+    def terminate(self) -> None:
+        """结束所有正在运行的任务进程组；任务进程不在调度器的进程组中，调度器退出时需要调用"""
+        with self._lock:
+            processes = list(self._processes.values())
+        for process in processes:
+            logger.warning(f"结束任务进程组: pid={process.pid}")
+            _kill_tree(process, self.kill_grace)
+
+    def join(self) -> None:
+        """等待所有已提交的任务结束"""
+        while True:
+            with self._lock:
+                threads = [t for t in self._threads if t.is_alive()]
+                self._threads = threads
+            if not threads:
+                return
+            for thread in threads:
+                thread.join()
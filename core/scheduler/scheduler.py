@@ -5,50 +5,116 @@
 """
 
 import argparse
+import os
+import threading
 import time
 import sys
-from datetime import datetime
+from dataclasses import replace
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Set
 from loguru import logger
 
+from config import TaskSchedule
+from config.schema import TASKS_GROUP
+from .control import DEFAULT_SOCKET_PATH, ControlError, ControlServer
+from .fire_queue import FireQueue, ScheduledRun
+from .runner import TaskResult, TaskRunner
+from .worker_pool import WorkerPool
 from .task_manager import TaskManager
-from core.seckill import SeckillManager
 from core.notification import NotificationConfigManager
+from utils.file_watcher import FileWatcher
 
 
 class SeckillScheduler:
     """秒杀调度器"""
 
-    def __init__(self):
+    # 距离启动时间小于该值时改为短间隔等待，保证毫秒级精度
+    SPIN_THRESHOLD = 0.002
+    # 单次休眠上限，系统时间被调整后能及时重新计算
+    MAX_SLEEP = 30.0
+
+    def __init__(
+        self,
+        lead_time: float = 60.0,
+        max_concurrent: int = 4,
+        pool_size: int = 2,
+        control_socket: Optional[str] = DEFAULT_SOCKET_PATH,
+        task_timeout: float = 300.0,
+    ):
+        """
+        Args:
+            lead_time: 任务未设置 lead_time 时的默认预热提前量（秒）
+            max_concurrent: 同时运行的任务进程上限
+            pool_size: 监视模式下预启动的空闲工作进程数，0 表示不预启动
+            control_socket: 监视/守护模式下控制接口的 Unix 域套接字路径，None 表示不启用
+            task_timeout: 任务未设置 timeout 时的运行窗口（秒），开始时间之后超过这么久
+                仍未结束的任务会被结束
+        """
+        self.pool_size = pool_size
+        self.control_socket = control_socket
+        self.mode = ""
+        self.started_at = time.time()
+        # 保护触发队列和任务列表，控制接口在其他线程中修改它们
+        self._lock = threading.RLock()
         self.task_manager = TaskManager()
         self.notification_manager = NotificationConfigManager().initialize_services()
+        self.fire_queue = FireQueue(lead_time)
+        self.runner = TaskRunner(
+            max_concurrent,
+            on_complete=self._on_task_complete,
+            task_timeout=task_timeout,
+        )
+        self._check_concurrency()
+        self.task_manager.check_start_times()
 
-    def run_task(self, task):
-        """运行单个任务"""
-        try:
-            if not task.enabled:
-                logger.info(f"任务已禁用: {task.description}")
-                return
+    def _check_concurrency(self):
+        """重叠任务数超过并发上限时，部分任务会等待空闲名额而延迟启动"""
+        for group in self.task_manager.find_overlaps():
+            if len(group) > self.runner.max_concurrent:
+                logger.warning(
+                    f"{group[0].fire_at.strftime('%H:%M:%S')} 附近有 {len(group)} 个重叠任务，"
+                    f"超过并发上限 {self.runner.max_concurrent}，部分任务会延迟启动"
+                )
 
-            logger.info(f"开始执行任务: {task.description}")
-            logger.info(f"配置文件: {task.config_file}")
+    def run_task(self, task, fire_at: Optional[datetime] = None):
+        """
+        在独立进程中启动单个任务，不等待任务结束
 
-            manager = SeckillManager(config_file=task.config_file)
-            manager.run()
+        Args:
+            task: 任务
+            fire_at: 本次运行的开始时间，任务在该时间发出请求并据此计算截止时间；
+                为 None 时取任务开始时间的下一次
+        """
+        if not task.enabled:
+            logger.info(f"任务已禁用: {task.description}")
+            return
 
-        except Exception as e:
-            logger.error(f"任务执行失败: {str(e)}")
-            # 发送错误通知
-            task_info = {
-                "description": task.description,
-                "start_time": task.start_time.strftime("%H:%M:%S.%f")[:-3],
-            }
-            error_result = {
-                "success": False,
-                "message": "任务执行失败",
-                "details": "任务执行过程中发生错误",
-                "failure_reason": str(e),
-            }
-            self.notification_manager.notify_task_result(task_info, error_result)
+        logger.info(f"开始执行任务: {task.description}")
+        logger.info(f"配置文件: {task.config_file}")
+        self.runner.submit(task, fire_at.timestamp() if fire_at else None)
+
+    def _on_task_complete(self, result: TaskResult):
+        """任务失败时发送错误通知"""
+        if result.success:
+            return
+        start_time = result.task.start_time
+        task_info = {
+            "description": result.task.description,
+            "start_time": (
+                start_time.strftime("%H:%M:%S.%f")[:-3] if start_time else ""
+            ),
+        }
+        error_result = {
+            "success": False,
+            "message": "任务超时" if result.timed_out else "任务执行失败",
+            "details": (
+                "任务超过运行窗口仍未结束，已结束任务进程"
+                if result.timed_out
+                else "任务执行过程中发生错误"
+            ),
+            "failure_reason": result.failure_reason,
+        }
+        self.notification_manager.notify_task_result(task_info, error_result)
 
     def run_hour_tasks(self, hour: str):
         """运行指定小时的任务"""
@@ -58,35 +124,370 @@ class SeckillScheduler:
             return
 
         logger.info(f"发现 {len(tasks)} 个任务")
-        for task in tasks:
-            self.run_task(task)
+        try:
+            for task in tasks:
+                # 今天的开始时间已过的任务立即发出，不会顺延到次日
+                fire_at = self._manual_fire_at(task)
+                if fire_at is None:
+                    logger.warning(f"任务已超出生效日期范围: {task.description}")
+                    continue
+                if task.cron:
+                    task = replace(task, start_time=fire_at.time())
+                self.run_task(task, fire_at)
+            self.runner.join()
+        finally:
+            self.runner.terminate()
 
     def run_current_tasks(self):
         """运行当前小时的任务"""
         current_hour = datetime.now().strftime("%H")
         self.run_hour_tasks(current_hour)
 
+    def _sleep_until(self, target: datetime) -> None:
+        """休眠到目标时间，最后几毫秒短间隔等待"""
+        while True:
+            remaining = (target - datetime.now()).total_seconds()
+            if remaining <= 0:
+                return
+            if remaining > self.SPIN_THRESHOLD:
+                time.sleep(min(remaining - self.SPIN_THRESHOLD, self.MAX_SLEEP))
+            else:
+                time.sleep(0)
+
     def watch_mode(self):
-        """监视模式：持续运行并在每小时开始时检查任务"""
+        """监视模式：按每个任务的开始时间精确启动"""
         logger.info("启动监视模式")
+        self.mode = "watch"
 
+        pool = WorkerPool(self.pool_size)
+        pool.start()
+        self.runner.pool = pool
+        try:
+            self._watch_loop()
+        finally:
+            self.runner.terminate()
+            self.runner.pool = None
+            pool.close()
+
+    def daemon_mode(self, clock_ttl: float = 600.0, session_ttl: float = 600.0):
+        """
+        守护模式：任务在常驻进程中运行，按站点复用时间偏移、长连接和已加载的策略
+
+        Args:
+            clock_ttl: 时间偏移的有效期（秒）
+            session_ttl: 长连接空闲多久后关闭重建（秒）
+        """
+        from core.seckill.daemon import SeckillDaemon
+
+        logger.info("启动守护模式")
+        self.mode = "daemon"
+
+        daemon = SeckillDaemon(clock_ttl=clock_ttl, session_ttl=session_ttl)
+        self.runner.execute = daemon.run_task
+        try:
+            self._watch_loop()
+        finally:
+            self.runner.execute = None
+            daemon.close()
+
+    def _watched_files(self) -> List[str]:
+        """调度配置文件和任务引用的秒杀配置文件"""
+        files = {self.task_manager.schedule_file}
+        for tasks in self.task_manager.schedules.values():
+            files.update(task.config_file for task in tasks)
+        return sorted(files)
+
+    def _wait_for_launch(self, target: datetime, watcher: FileWatcher) -> bool:
+        """
+        等待到启动时间，期间监视配置文件变更
+
+        Returns:
+            是否等到了启动时间；文件变更并已重新加载时返回 False
+        """
+        # 最后一小段时间不再监视文件，保证启动精度
+        margin = self.SPIN_THRESHOLD + watcher.debounce
         while True:
-            now = datetime.now()
+            remaining = (target - datetime.now()).total_seconds()
+            if remaining <= margin:
+                break
+            changed = watcher.wait(min(remaining - margin, self.MAX_SLEEP))
+            if changed:
+                self._apply_changes(changed, watcher)
+                return False
+        self._sleep_until(target)
+        return True
 
-            # 如果是整点运行任务,避免重复运行
-            if now.minute == 0 and now.second == 0:
-                self.run_current_tasks()
-                # 等待1分钟，避免重复运行
-                time.sleep(60)
-            else:
-                # 计算到下一个整点的等待时间
-                next_hour = now.replace(
-                    hour=now.hour + 1, minute=0, second=0, microsecond=0
-                )
-                wait_seconds = (next_hour - now).total_seconds()
+    def _apply_changes(self, changed: Set[str], watcher: FileWatcher) -> None:
+        """把文件变更增量应用到触发队列"""
+        schedule_path = os.path.abspath(self.task_manager.schedule_file)
+        if schedule_path in changed:
+            logger.info(f"调度配置已变更: {self.task_manager.schedule_file}")
+            with self._lock:
+                if self.task_manager.load_schedules():
+                    self._sync_queue()
+                else:
+                    logger.warning("调度配置无效，继续使用当前的计划任务")
+
+        for path in sorted(changed - {schedule_path}):
+            self._rewarm_config(path)
+        watcher.set_paths(self._watched_files())
+
+    def _sync_queue(self) -> List[ScheduledRun]:
+        """把任务列表的变化增量应用到触发队列，返回新加入的计划运行"""
+        with self._lock:
+            added, removed = self.fire_queue.update(
+                self.task_manager.schedules, datetime.now()
+            )
+        for run in removed:
+            logger.info(f"移除计划任务: {run.task.description or run.key}")
+        for run in added:
+            logger.info(
+                f"加入计划任务: {run.task.description or run.key}，"
+                f"开始时间 {run.fire_at.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}"
+            )
+        if not added and not removed:
+            logger.info("计划任务没有变化")
+        else:
+            self._check_concurrency()
+            self.task_manager.check_start_times()
+        return added
+
+    def _rewarm_config(self, path: str) -> None:
+        """任务引用的配置文件变更后立即验证并重新编译，任务启动时直接命中缓存"""
+        tasks = [
+            task
+            for tasks in self.task_manager.schedules.values()
+            for task in tasks
+            if os.path.abspath(task.config_file) == path
+        ]
+        names = ", ".join(task.description or task.config_file for task in tasks)
+        logger.info(f"配置文件已变更: {path}，影响任务: {names}")
+
+        _, errors = self.task_manager.config_manager.check_config_file(path)
+        if errors:
+            for error in errors:
+                logger.error(f"{path}: {error}")
+            logger.error(f"配置文件验证失败，任务启动时会失败: {names}")
+            return
+        try:
+            self.task_manager.config_manager.load_seckill_config(path)
+        except Exception as e:
+            logger.error(f"重新编译配置失败: {path}: {e}")
+            return
+
+        # cron 任务运行时的开始时间与调度配置中的不同，按配置文件判断
+        running = [
+            task
+            for task in self.runner.running
+            if os.path.abspath(task.config_file) == path
+        ]
+        if running:
+            logger.warning("正在运行的任务不受影响，变更在下一次运行时生效")
+        self.task_manager.check_start_times(path)
+
+    def _watch_loop(self):
+        """按触发队列依次启动任务，调度配置变更时增量更新队列"""
+        with self._lock:
+            self.fire_queue.load(self.task_manager.schedules, datetime.now())
+        watcher = FileWatcher(self._watched_files())
+        logger.info(f"监视调度配置变更 ({watcher.mode})")
+        control = None
+        if self.control_socket:
+            control = ControlServer(self, self.control_socket)
+            control.start()
+        try:
+            while True:
+                with self._lock:
+                    run = self.fire_queue.peek()
+                if run is None:
+                    logger.info("没有启用的任务，等待调度配置变更")
+                    changed = set()
+                    while not changed:
+                        changed = watcher.wait(self.MAX_SLEEP)
+                    self._apply_changes(changed, watcher)
+                    continue
+
+                wait_seconds = (run.launch_at - datetime.now()).total_seconds()
+                if wait_seconds > 0:
+                    logger.info(
+                        f"下一个任务: {run.task.description or run.key}，"
+                        f"启动时间 {run.launch_at.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}，"
+                        f"剩余 {wait_seconds:.0f} 秒"
+                    )
+                    if not self._wait_for_launch(run.launch_at, watcher):
+                        continue
+
+                with self._lock:
+                    due_runs = self.fire_queue.pop_due(datetime.now())
+                for due in due_runs:
+                    if datetime.now() >= due.fire_at:
+                        logger.warning(
+                            f"任务已错过开始时间，等待下一次运行: "
+                            f"{due.task.description or due.key} ({due.fire_at})"
+                        )
+                        continue
+                    self.run_task(due.occurrence(), due.fire_at)
+        finally:
+            if control is not None:
+                control.close()
+            watcher.close()
+
+    def control_commands(self) -> Dict[str, Callable[..., Any]]:
+        """控制接口支持的命令"""
+        return {
+            "list": self._cmd_list,
+            "add": self._cmd_add,
+            "remove": self._cmd_remove,
+            "trigger": self._cmd_trigger,
+            "status": self._cmd_status,
+            "next": self._cmd_next,
+        }
+
+    def _find_task(self, hour: str, index: int) -> TaskSchedule:
+        tasks = self.task_manager.schedules.get(str(hour).zfill(2), [])
+        if not 0 <= index < len(tasks):
+            raise ControlError(f"任务不存在: {hour}:{index}")
+        return tasks[index]
 
-                logger.info(f"等待下一个整点，剩余 {wait_seconds:.0f} 秒")
-                time.sleep(min(wait_seconds, 60))  # 最多等待60秒，保持响应性
+    def _cmd_list(self) -> Dict[str, List[Dict]]:
+        """列出所有任务"""
+        with self._lock:
+            return self.task_manager.list_all_tasks()
+
+    def _cmd_add(
+        self,
+        config_file: str,
+        start_time: Optional[str] = None,
+        cron: Optional[str] = None,
+        offset: float = 0.0,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        hour: Optional[str] = None,
+        description: str = "",
+        enabled: bool = True,
+        lead_time: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """添加任务，保存调度配置并加入触发队列"""
+        entry = {
+            "start_time": start_time,
+            "cron": cron,
+            "offset": offset,
+            "start_date": start_date,
+            "end_date": end_date,
+            "config_file": config_file,
+            "enabled": enabled,
+            "description": description,
+            "lead_time": lead_time,
+            "timeout": timeout,
+        }
+        entry = {key: value for key, value in entry.items() if value is not None}
+        if hour is not None:
+            hour = str(hour).zfill(2)
+        elif start_time and not cron:
+            hour = start_time[:2]
+        else:
+            hour = TASKS_GROUP
+        errors = self.task_manager.config_manager.validator.check_schedule_config(
+            {hour: [entry]}
+        )
+        if errors:
+            raise ControlError("; ".join(errors))
+        if not os.path.exists(config_file):
+            raise ControlError(f"配置文件不存在: {config_file}")
+
+        task = TaskSchedule.from_dict(entry)
+        with self._lock:
+            self.task_manager.add_task(hour, task)
+            added = self._sync_queue()
+            index = len(self.task_manager.schedules[hour]) - 1
+        return {
+            "hour": hour,
+            "index": index,
+            "fire_at": added[0].fire_at.isoformat() if added else None,
+        }
+
+    def _cmd_remove(self, hour: str, index: int) -> Dict[str, Any]:
+        """删除任务并从触发队列移除"""
+        with self._lock:
+            task = self._find_task(hour, index)
+            self.task_manager.remove_task(str(hour).zfill(2), index)
+            self._sync_queue()
+        return {"description": task.description, "config_file": task.config_file}
+
+    def _manual_fire_at(self, task: TaskSchedule) -> Optional[datetime]:
+        """
+        手动运行的开始时间：今天的开始时间，已过时为当前时间（立即发出）；
+        cron 任务取规则的下一次开始时间，超出生效日期范围时返回 None
+        """
+        now = datetime.now()
+        if task.cron:
+            return self.fire_queue.next_fire_time(task, now)
+        return max(now, datetime.combine(now.date(), task.start_time))
+
+    def _cmd_trigger(self, hour: str, index: int) -> Dict[str, Any]:
+        """
+        立即启动任务，任务在其开始时间发出请求，开始时间已过时立即发出；
+        cron 任务以规则的下一次开始时间为开始时间
+        """
+        with self._lock:
+            task = self._find_task(hour, index)
+            fire_at = self._manual_fire_at(task)
+            if fire_at is None:
+                raise ControlError("任务已超出生效日期范围")
+            if task.cron:
+                task = replace(task, start_time=fire_at.time())
+        logger.info(f"控制接口触发任务: {task.description or task.config_file}")
+        self.run_task(task, fire_at)
+        return {"description": task.description, "config_file": task.config_file}
+
+    def _cmd_status(self) -> Dict[str, Any]:
+        """调度器状态"""
+        pool = self.runner.pool
+        with self._lock:
+            queued = len(self.fire_queue)
+        return {
+            "pid": os.getpid(),
+            "mode": self.mode,
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat(),
+            "uptime": round(time.time() - self.started_at, 1),
+            "schedule_file": self.task_manager.schedule_file,
+            "queued": queued,
+            "running": [
+                task.description or task.config_file for task in self.runner.running
+            ],
+            "max_concurrent": self.runner.max_concurrent,
+            "idle_workers": len(pool) if pool is not None else None,
+        }
+
+    def _cmd_next(
+        self, count: Optional[int] = 5, within: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        接下来的运行，同一任务的多次运行分别列出
+
+        Args:
+            count: 最多返回的条数，为 None 时只按 within 限制
+            within: 只返回接下来多少秒内开始的运行
+        """
+        until = None
+        if within is not None:
+            until = datetime.now() + timedelta(seconds=within)
+        if count is None and until is None:
+            raise ControlError("count 和 within 至少需要指定一个")
+        with self._lock:
+            runs = self.fire_queue.fires(count, until)
+        return [
+            {
+                "hour": run.hour,
+                "index": run.index,
+                "description": run.task.description,
+                "config_file": run.task.config_file,
+                "launch_at": run.launch_at.isoformat(),
+                "fire_at": run.fire_at.isoformat(),
+            }
+            for run in runs
+        ]
 
     def add_task_interactive(self):
         """交互式添加任务"""
@@ -96,8 +497,6 @@ class SeckillScheduler:
             config_file = input("请输入配置文件路径: ")
             description = input("请输入任务描述: ")
 
-            from config import TaskSchedule
-
             task = TaskSchedule(
                 start_time=datetime.strptime(start_time, "%H:%M:%S.%f").time(),
                 config_file=config_file,
@@ -115,15 +514,21 @@ def main():
     parser = argparse.ArgumentParser(description="秒杀任务调度器")
     parser.add_argument(
         "--mode",
-        choices=["watch", "now", "hour"],
+        choices=["watch", "daemon", "now", "hour"],
         default="watch",
-        help="运行模式: watch(持续监视) / now(运行当前小时任务) / hour(运行指定小时任务)",
+        help="运行模式: watch(持续监视) / daemon(常驻复用预热状态) / now(运行当前小时任务) / hour(运行指定小时任务)",
     )
     parser.add_argument("--hour", help="指定运行小时(格式: HH)")
     parser.add_argument("--add", action="store_true", help="添加新任务")
+    parser.add_argument(
+        "--task-timeout",
+        type=float,
+        default=300.0,
+        help="任务未设置 timeout 时的运行窗口(秒)，超时的任务连同子进程一起结束",
+    )
 
     args = parser.parse_args()
-    scheduler = SeckillScheduler()
+    scheduler = SeckillScheduler(task_timeout=args.task_timeout)
 
     try:
         if args.add:
@@ -133,6 +538,8 @@ def main():
 
         if args.mode == "watch":
             scheduler.watch_mode()
+        elif args.mode == "daemon":
+            scheduler.daemon_mode()
         elif args.mode == "hour" and args.hour:
             scheduler.run_hour_tasks(args.hour.zfill(2))
         else:
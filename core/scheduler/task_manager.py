@@ -6,33 +6,158 @@
 
 import json
 import glob
+import os
 from pathlib import Path
-from typing import Dict, List
-from datetime import datetime
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta
 from loguru import logger
 
 from config import TaskSchedule, ConfigManager
+from .fire_queue import FireQueue, ScheduledRun
+from .rules import TaskRule
 
 
 class TaskManager:
     """任务管理器"""
 
-    def __init__(self, schedule_file: str = "configs/schedule.json"):
+    # 检查重叠任务时向后展开的时间范围，覆盖按星期触发的 cron 规则
+    OVERLAP_HORIZON = timedelta(days=7)
+
+    def __init__(
+        self, schedule_file: str = "configs/schedule.json", overlap_window: float = 60.0
+    ):
+        """
+        Args:
+            schedule_file: 调度配置文件
+            overlap_window: 开始时间相差不超过该秒数的任务视为重叠
+        """
         self.schedule_file = schedule_file
+        self.overlap_window = overlap_window
         self.schedules: Dict[str, List[TaskSchedule]] = {}
         self.config_manager = ConfigManager()
         self.load_schedules()
 
-    def load_schedules(self):
-        """加载调度配置"""
+    def load_schedules(self) -> bool:
+        """
+        加载调度配置，失败时保留当前的任务
+
+        Returns:
+            是否加载成功
+        """
         try:
             schedules = self.config_manager.load_schedule_config(self.schedule_file)
             self.schedules = schedules
             logger.info(f"加载调度配置: {self.schedule_file}")
+            self.check_overlaps()
+            return True
         except FileNotFoundError:
             logger.warning(f"调度文件未找到: {self.schedule_file}")
         except Exception as e:
             logger.error(f"加载调度配置失败: {e}")
+        return False
+
+    def find_overlaps(self, window: Optional[float] = None) -> List[List[ScheduledRun]]:
+        """
+        查找开始时间相互重叠的已启用任务
+
+        按触发规则展开接下来 OVERLAP_HORIZON 内的所有运行，跨零点和只在某些日期
+        触发的任务也能正确判断是否相邻
+
+        Args:
+            window: 重叠窗口秒数，默认使用 overlap_window
+
+        Returns:
+            重叠运行组，每组按开始时间排序且至少包含两个不同的任务，
+            每个任务取组内第一次运行，开始时间见 ScheduledRun.fire_at
+        """
+        window = timedelta(seconds=self.overlap_window if window is None else window)
+        now = datetime.now()
+        queue = FireQueue()
+        queue.load(self.schedules, now)
+        runs = sorted(
+            queue.fires(until=now + self.OVERLAP_HORIZON), key=lambda r: r.fire_at
+        )
+
+        chains: List[List[ScheduledRun]] = []
+        for run in runs:
+            if chains and run.fire_at - chains[-1][-1].fire_at <= window:
+                chains[-1].append(run)
+            else:
+                chains.append([run])
+
+        groups, seen = [], set()
+        for chain in chains:
+            first: Dict[str, ScheduledRun] = {}
+            for run in chain:
+                first.setdefault(run.key, run)
+            # 每天重复的组只报告一次
+            keys = frozenset(first)
+            if len(keys) > 1 and keys not in seen:
+                seen.add(keys)
+                groups.append(list(first.values()))
+        return groups
+
+    def check_overlaps(self) -> List[List[ScheduledRun]]:
+        """
+        检查并记录重叠任务，使用同一配置文件的重叠任务会争用同一批账号
+
+        Returns:
+            重叠运行组
+        """
+        groups = self.find_overlaps()
+        for group in groups:
+            names = ", ".join(
+                f"{run.task.description or run.task.config_file}"
+                f"({run.fire_at.strftime('%H:%M:%S')})"
+                for run in group
+            )
+            logger.warning(f"任务开始时间在 {self.overlap_window:g} 秒内重叠: {names}")
+
+            config_files = [run.task.config_file for run in group]
+            shared = sorted({f for f in config_files if config_files.count(f) > 1})
+            if shared:
+                logger.warning(f"重叠任务使用了相同的配置文件: {', '.join(shared)}")
+        return groups
+
+    def check_start_times(
+        self, config_path: Optional[str] = None
+    ) -> List[TaskSchedule]:
+        """
+        检查任务的开始时间是否与配置文件中的开始时间一致
+
+        调度器按任务的开始时间（cron 任务按规则）发出请求并计算截止时间，
+        配置文件中的 start_time 对调度任务不再生效，不一致时记录警告
+
+        Args:
+            config_path: 只检查使用该配置文件的任务，为 None 时检查全部任务
+
+        Returns:
+            开始时间不一致的任务
+        """
+        mismatched = []
+        for tasks in self.schedules.values():
+            for task in tasks:
+                if not task.enabled or task.cron or task.start_time is None:
+                    continue
+                if config_path is not None and os.path.abspath(
+                    task.config_file
+                ) != os.path.abspath(config_path):
+                    continue
+                try:
+                    config = self.config_manager.load_seckill_config(task.config_file)
+                except Exception as e:
+                    logger.debug(f"检查开始时间时加载配置失败: {task.config_file}: {e}")
+                    continue
+                if config.start_time != task.start_time:
+                    mismatched.append(task)
+                    logger.warning(
+                        f"任务 {task.description or task.config_file} 的开始时间 "
+                        f"{task.start_time.strftime('%H:%M:%S.%f')[:-3]} 与配置文件 "
+                        f"{task.config_file} 中的 "
+                        f"{config.start_time.strftime('%H:%M:%S.%f')[:-3]} 不一致，"
+                        f"按调度配置的开始时间运行"
+                    )
+        return mismatched
 
     def get_current_tasks(self) -> List[TaskSchedule]:
         """获取当前小时的任务"""
@@ -72,15 +197,7 @@ class TaskManager:
     def save_schedules(self):
         """保存调度配置"""
         data = {
-            hour: [
-                {
-                    "start_time": task.start_time.strftime("%H:%M:%S.%f"),
-                    "config_file": task.config_file,
-                    "enabled": task.enabled,
-                    "description": task.description,
-                }
-                for task in tasks
-            ]
+            hour: [task.to_dict() for task in tasks]
             for hour, tasks in self.schedules.items()
         }
 
@@ -96,18 +213,26 @@ class TaskManager:
         """扫描配置文件目录"""
         return glob.glob(f"{config_dir}/**/*.json", recursive=True)
 
+    @staticmethod
+    def next_fire_time(task: TaskSchedule, now: datetime) -> Optional[datetime]:
+        """已启用任务在 now 之后的下一次开始时间，禁用或已过期时为 None"""
+        if not task.enabled:
+            return None
+        return TaskRule(task).next_after(now)
+
     def list_all_tasks(self) -> Dict[str, List[Dict]]:
-        """列出所有任务"""
+        """列出所有任务，附带下一次开始时间"""
+        now = datetime.now()
         result = {}
         for hour, tasks in self.schedules.items():
-            result[hour] = [
-                {
-                    "index": i,
-                    "start_time": task.start_time.strftime("%H:%M:%S.%f"),
-                    "config_file": task.config_file,
-                    "enabled": task.enabled,
-                    "description": task.description,
-                }
-                for i, task in enumerate(tasks)
-            ]
+            result[hour] = []
+            for i, task in enumerate(tasks):
+                next_fire = self.next_fire_time(task, now)
+                result[hour].append(
+                    {
+                        "index": i,
+                        **task.to_dict(),
+                        "next_fire": next_fire.isoformat() if next_fire else None,
+                    }
+                )
         return result
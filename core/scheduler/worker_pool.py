@@ -0,0 +1,230 @@
+"""
+预启动工作进程池
+
+监视模式下预先启动若干个已导入秒杀模块的空闲进程，任务到期时通过管道把任务发给
+空闲进程，省去进程启动和模块导入的耗时。每个进程只运行一个任务，用完后在后台补充
+"""
+
+import importlib
+import multiprocessing
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Deque, Dict, Optional
+
+from loguru import logger
+
+from config import TaskSchedule
+from utils.log import apply_logging_options, logging_options
+from .runner import _run_task_process
+
+# 空闲进程启动时预先导入的模块
+PRELOAD_MODULES = (
+    "config.manager",
+    "core.seckill.manager",
+    "core.seckill.executor",
+    "strategies.request.manager",
+)
+
+# spawn 启动的进程不继承调度器的文件描述符，调度器退出时空闲进程能收到 EOF 自行退出
+_CONTEXT = multiprocessing.get_context("spawn")
+
+
+def _preload() -> None:
+    """导入秒杀运行需要的模块和内置请求策略"""
+    for name in PRELOAD_MODULES:
+        importlib.import_module(name)
+
+    from strategies.request.manager import BUILTIN_STRATEGIES
+
+    for factory in BUILTIN_STRATEGIES.values():
+        if isinstance(factory, str):
+            try:
+                importlib.import_module(factory.partition(":")[0])
+            except Exception as e:
+                logger.debug(f"预导入策略失败: {factory}: {e}")
+
+
+def _idle_worker_main(conn, log_options: Dict[str, Any]) -> None:
+    """空闲进程入口：导入模块后等待任务，收到 None 或管道关闭时退出"""
+    # spawn 启动的进程没有父进程的日志输出，按父进程的配置重新设置
+    apply_logging_options(log_options)
+    try:
+        _preload()
+    except Exception as e:
+        conn.send(("error", str(e)))
+        conn.close()
+        return
+
+    conn.send(("ready", None))
+    try:
+        payload = conn.recv()
+    except (EOFError, OSError):
+        return
+    if payload is None:
+        conn.close()
+        return
+    task, fire_at = payload
+    _run_task_process(task, conn, fire_at)
+
+
+@dataclass
+class IdleWorker:
+    """已就绪的空闲进程"""
+
+    process: multiprocessing.Process
+    conn: object  # 与空闲进程通信的管道端
+    ready_at: float
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def dispatch(self, task: TaskSchedule, fire_at: Optional[datetime] = None) -> bool:
+        """
+        把任务发给空闲进程
+
+        Args:
+            task: 任务
+            fire_at: 本次运行确切的开始时间
+
+        Returns:
+            是否发送成功，失败时结束该进程
+        """
+        try:
+            self.conn.send((task, fire_at))
+            return True
+        except (OSError, ValueError) as e:
+            logger.warning(f"向空闲工作进程发送任务失败: pid={self.pid}: {e}")
+            self.stop()
+            return False
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """通知空闲进程退出，超时后强制终止"""
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.conn.close()
+
+
+class WorkerPool:
+    """预启动工作进程池"""
+
+    def __init__(self, size: int = 2, ready_timeout: float = 60.0):
+        """
+        Args:
+            size: 保持的空闲进程数
+            ready_timeout: 等待空闲进程完成导入的超时秒数
+        """
+        self.size = max(0, size)
+        self.ready_timeout = ready_timeout
+        self._idle: Deque[IdleWorker] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._idle)
+
+    def start(self) -> None:
+        """启动后台补充线程"""
+        if self.size == 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._refill_loop, name="worker-pool", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"预启动工作进程池: {self.size} 个空闲进程")
+
+    def _spawn(self) -> Optional[IdleWorker]:
+        """启动一个空闲进程并等待它完成导入"""
+        started = time.perf_counter()
+        parent_conn, child_conn = _CONTEXT.Pipe()
+        process = _CONTEXT.Process(
+            target=_idle_worker_main,
+            args=(child_conn, logging_options()),
+            name="seckill-idle-worker",
+        )
+        process.start()
+        child_conn.close()
+
+        try:
+            if not parent_conn.poll(self.ready_timeout):
+                raise TimeoutError(f"{self.ready_timeout:g} 秒内未就绪")
+            status, detail = parent_conn.recv()
+            if status != "ready":
+                raise RuntimeError(detail)
+        except Exception as e:
+            logger.error(f"空闲工作进程启动失败: {e}")
+            process.terminate()
+            process.join()
+            parent_conn.close()
+            return None
+
+        logger.debug(
+            f"空闲工作进程就绪: pid={process.pid}, "
+            f"耗时 {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+        return IdleWorker(process, parent_conn, time.time())
+
+    def _refill_loop(self) -> None:
+        """空闲进程不足时在后台补充"""
+        while True:
+            with self._cond:
+                while not self._closed and len(self._idle) >= self.size:
+                    self._cond.wait()
+                if self._closed:
+                    return
+
+            worker = self._spawn()
+            if worker is None:
+                # 启动失败时稍后重试，避免连续失败占满 CPU
+                time.sleep(5)
+                continue
+
+            with self._cond:
+                if self._closed:
+                    worker.stop()
+                    return
+                self._idle.append(worker)
+                self._cond.notify_all()
+
+    def acquire(self) -> Optional[IdleWorker]:
+        """
+        取出一个空闲进程，并触发后台补充
+
+        Returns:
+            空闲进程，池为空时返回 None
+        """
+        with self._cond:
+            while self._idle:
+                worker = self._idle.popleft()
+                self._cond.notify_all()
+                if worker.alive():
+                    return worker
+                logger.warning(f"空闲工作进程已退出: pid={worker.pid}")
+                worker.conn.close()
+        return None
+
+    def close(self) -> None:
+        """停止补充并结束所有空闲进程"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._cond.notify_all()
+        for worker in idle:
+            worker.stop()
+        if self._thread is not None:
+            self._thread.join(self.ready_timeout)
+            self._thread = None
@@ -2,9 +2,30 @@
 秒杀核心模块
 
 提供秒杀执行器和多用户管理功能
+
+导出的名称在首次访问时才导入对应模块
 """
 
-from .executor import SeckillExecutor
-from .manager import SeckillManager
+import importlib
+
+_LAZY_ATTRS = {
+    "SeckillExecutor": ".executor",
+    "SeckillManager": ".manager",
+    "SeckillDaemon": ".daemon",
+    "VendorContext": ".context",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["SeckillExecutor", "SeckillManager"]
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
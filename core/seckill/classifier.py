@@ -0,0 +1,137 @@
+"""
+响应分类器
+
+在原始响应字节上快速判定秒杀结果，无法判定时再回退到完整的JSON解析
+"""
+
+import json
+import re
+from typing import Iterable, Optional, Pattern, Tuple
+
+from strategies.base import ResponseOutcome
+
+# 通用的已无机会响应，命中后立即停止请求；用户配置需要通过
+# default_terminal_patterns 开启，厂商策略的 TERMINAL_KEYWORDS 也引用这份列表
+TERMINAL_PATTERNS: Tuple[str, ...] = (
+    "sold out",
+    "已抢光",
+    "已抢完",
+    "已领完",
+    "已领取",
+    "已参与",
+    "库存不足",
+    "活动已结束",
+)
+
+# 通用的暂时失败响应，继续按计划请求
+RETRY_PATTERNS: Tuple[str, ...] = (
+    "not started",
+    "未开始",
+    "繁忙",
+    "频繁",
+    "稍后",
+    "busy",
+)
+
+
+class ResponseClassifier:
+    """按用户编译的响应分类器"""
+
+    DEFAULT_TERMINAL_PATTERNS = TERMINAL_PATTERNS
+    DEFAULT_RETRY_PATTERNS = RETRY_PATTERNS
+
+    def __init__(
+        self,
+        key_value: str = "",
+        key_message: str = "",
+        success_patterns: Optional[Iterable[str]] = None,
+        retry_patterns: Optional[Iterable[str]] = None,
+        terminal_patterns: Optional[Iterable[str]] = None,
+        default_terminal_patterns: bool = False,
+    ):
+        """
+        Args:
+            key_value: 成功响应中 key_message 字段包含的值
+            key_message: 响应消息字段名
+            success_patterns: 额外的成功响应关键字
+            retry_patterns: 可重试响应关键字，None 使用默认值
+            terminal_patterns: 终止响应关键字
+            default_terminal_patterns: 是否同时使用内置的终止响应关键字
+        """
+        self.key_value = key_value
+        self.key_message = key_message
+
+        success = [key_value] if key_value else []
+        success.extend(success_patterns or [])
+        if retry_patterns is None:
+            retry_patterns = self.DEFAULT_RETRY_PATTERNS
+        terminal_patterns = list(terminal_patterns or [])
+        if default_terminal_patterns:
+            terminal_patterns.extend(self.DEFAULT_TERMINAL_PATTERNS)
+
+        self._success = self._compile(success)
+        self._retry = self._compile(retry_patterns)
+        self._terminal = self._compile(terminal_patterns)
+
+        # 只有同时配置了 key_message 和成功模式才能在字节层面判定成功
+        self._message_field: Optional[Pattern[bytes]] = None
+        if key_message and self._success:
+            self._message_field = re.compile(
+                rb'"%s"\s*:\s*"((?:[^"\\]|\\.)*)"'
+                % re.escape(key_message.encode("utf-8"))
+            )
+
+    @staticmethod
+    def _compile(
+        patterns: Iterable[str],
+    ) -> Optional[Tuple[Pattern[bytes], Pattern[str]]]:
+        """编译为字节正则和文本正则"""
+        patterns = [p for p in patterns if p]
+        if not patterns:
+            return None
+        text = "|".join(re.escape(p) for p in patterns)
+        return re.compile(text.encode("utf-8"), re.I), re.compile(text, re.I)
+
+    def classify_bytes(self, body: bytes) -> Tuple[Optional[ResponseOutcome], str]:
+        """
+        在原始响应字节上分类
+
+        Args:
+            body: 原始响应内容
+
+        Returns:
+            (outcome, message) 元组，无法判定时 outcome 为 None
+        """
+        if not body or self._message_field is None:
+            return None, ""
+
+        # 只在消息字段为字符串时判定；字段缺失、为数字或嵌套对象时交给策略完整解析，
+        # 避免响应其他位置恰好包含终止关键字而误停
+        match = self._message_field.search(body)
+        if match is None:
+            return None, ""
+        try:
+            message = json.loads(b'"' + match.group(1) + b'"')
+        except ValueError:
+            return None, ""
+        return self.classify_message(message), message
+
+    def classify_message(self, message: str) -> ResponseOutcome:
+        """
+        按解析出的响应消息分类
+
+        Args:
+            message: key_message 对应的响应消息
+
+        Returns:
+            响应结果分类
+        """
+        # 未配置成功模式时沿用原有语义：任何响应都视为成功
+        if self._success is None or self._success[1].search(message):
+            return ResponseOutcome.SUCCESS
+        # 明确可重试的响应优先于终止关键字，宁可多请求也不误停
+        if self._retry and self._retry[1].search(message):
+            return ResponseOutcome.RETRY
+        if self._terminal and self._terminal[1].search(message):
+            return ResponseOutcome.TERMINAL
+        return ResponseOutcome.RETRY
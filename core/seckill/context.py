@@ -0,0 +1,173 @@
+"""
+站点常驻上下文
+
+守护模式下每个站点保持一份预热状态，在相邻任务之间复用：时间偏移、长连接
+（连接存活期间 DNS 解析结果和 TLS 会话一并保留）和已加载的请求策略。
+状态超过有效期后才刷新
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from curl_cffi import requests
+from loguru import logger
+
+from strategies import IAsyncSeckillStrategy, RequestStrategyManager
+from strategies.registry import params_key
+from utils import TimeSynchronizer
+
+
+class VendorContext:
+    """单个站点的常驻上下文，请求在上下文自己的事件循环线程中执行"""
+
+    def __init__(
+        self, vendor: str, clock_ttl: float = 600.0, session_ttl: float = 600.0
+    ):
+        """
+        Args:
+            vendor: 站点标识（请求地址的主机名）
+            clock_ttl: 时间偏移的有效期（秒）
+            session_ttl: 长连接空闲多久后关闭重建（秒）
+        """
+        self.vendor = vendor
+        self.clock_ttl = clock_ttl
+        self.session_ttl = session_ttl
+        self.time_synchronizer = TimeSynchronizer()
+
+        self._lock = threading.Lock()
+        self._time_diff: Optional[float] = None
+        self._synced_at = 0.0
+        # 策略实例持有账号相关的状态（如预取的请求体），同样按账号区分
+        self._strategy_managers: Dict[Tuple[str, str, str], RequestStrategyManager] = {}
+        # 连接按账号区分，避免不同账号共用 Cookie
+        self._sessions: Dict[str, List[requests.AsyncSession]] = {}
+        self._last_used: Dict[str, float] = {}
+
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever, name=f"vendor-{vendor}", daemon=True
+        )
+        self._thread.start()
+
+    def time_diff(self) -> float:
+        """时间偏移，超过有效期时重新同步"""
+        with self._lock:
+            age = time.time() - self._synced_at
+            if self._time_diff is None or age > self.clock_ttl:
+                self._time_diff = self.time_synchronizer.sync_time()
+                self._synced_at = time.time()
+            else:
+                logger.debug(f"[{self.vendor}] 复用时间偏移 ({age:.0f} 秒前同步)")
+            return self._time_diff
+
+    def strategy_manager(
+        self,
+        account: str,
+        strategy_name: Optional[str],
+        params: Optional[Dict[str, Any]],
+    ) -> RequestStrategyManager:
+        """
+        已设置好参数的请求策略管理器，按 (账号, 策略, 参数) 复用
+
+        Args:
+            account: 账号标识
+            strategy_name: 策略名称
+            params: 策略参数
+
+        Returns:
+            请求策略管理器
+        """
+        key = (account, (strategy_name or "").lower(), params_key(params))
+        with self._lock:
+            manager = self._strategy_managers.get(key)
+            if manager is None:
+                manager = RequestStrategyManager()
+                if strategy_name and params:
+                    manager.update_strategy_params(strategy_name, params)
+                self._strategy_managers[key] = manager
+            return manager
+
+    def sessions(self, account: str, size: int) -> List[requests.AsyncSession]:
+        """
+        账号的长连接，不足时补充；需在上下文的事件循环中调用
+
+        Args:
+            account: 账号标识
+            size: 需要的连接数
+
+        Returns:
+            连接列表
+        """
+        with self._lock:
+            sessions = self._sessions.setdefault(account, [])
+            reused = len(sessions)
+            while len(sessions) < size:
+                sessions.append(requests.AsyncSession())
+            self._last_used[account] = time.time()
+        if reused:
+            logger.debug(f"[{self.vendor}] {account} 复用 {min(reused, size)} 条连接")
+        return sessions[:size]
+
+    def release(self, account: str) -> None:
+        """任务结束，记录连接最后使用时间"""
+        with self._lock:
+            self._last_used[account] = time.time()
+
+    async def _close_sessions(self, accounts: List[str]) -> None:
+        for account in accounts:
+            with self._lock:
+                sessions = self._sessions.pop(account, [])
+                self._last_used.pop(account, None)
+            for session in sessions:
+                try:
+                    await session.close()
+                except Exception as e:
+                    logger.debug(f"[{self.vendor}] 关闭连接失败: {e}")
+
+    def refresh(self) -> None:
+        """关闭空闲超过有效期的连接，下次使用时重新建立"""
+        now = time.time()
+        with self._lock:
+            stale = [
+                account
+                for account, used in self._last_used.items()
+                if now - used > self.session_ttl
+            ]
+        if stale:
+            logger.info(f"[{self.vendor}] 关闭 {len(stale)} 个账号的过期连接")
+            self.submit(self._close_sessions(stale)).result()
+
+    def submit(self, coro):
+        """
+        在上下文的事件循环中执行协程
+
+        Args:
+            coro: 协程
+
+        Returns:
+            concurrent.futures.Future
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    async def _close_strategies(self) -> None:
+        with self._lock:
+            managers, self._strategy_managers = self._strategy_managers, {}
+        for (_, name, _), manager in managers.items():
+            strategy = manager.get_strategy(name or None)
+            if isinstance(strategy, IAsyncSeckillStrategy):
+                try:
+                    await strategy.close()
+                except Exception as e:
+                    logger.debug(f"[{self.vendor}] 关闭策略失败: {e}")
+
+    def close(self) -> None:
+        """关闭所有连接和异步策略并停止事件循环"""
+        with self._lock:
+            accounts = list(self._sessions)
+        self.submit(self._close_sessions(accounts)).result()
+        self.submit(self._close_strategies()).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
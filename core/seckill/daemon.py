@@ -0,0 +1,133 @@
+"""
+秒杀守护进程
+
+常驻进程中按站点保持预热上下文，相邻任务复用时间偏移、长连接和已加载的策略，
+每个任务只需要读取配置（命中编译配置缓存）并创建执行器
+"""
+
+import concurrent.futures
+import threading
+import time
+from dataclasses import replace
+from datetime import datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+from config import ConfigManager, TaskSchedule, UserConfig
+from core.notification import NotificationConfigManager
+from .context import VendorContext
+from .executor import SeckillExecutor
+from .manager import resolve_strategy_params
+
+
+def vendor_of(user: UserConfig) -> str:
+    """用户请求的站点标识"""
+    return urlsplit(user.basurl).netloc or user.basurl
+
+
+class SeckillDaemon:
+    """秒杀守护进程"""
+
+    def __init__(self, clock_ttl: float = 600.0, session_ttl: float = 600.0):
+        """
+        Args:
+            clock_ttl: 时间偏移的有效期（秒）
+            session_ttl: 长连接空闲多久后关闭重建（秒）
+        """
+        self.clock_ttl = clock_ttl
+        self.session_ttl = session_ttl
+        self.config_manager = ConfigManager()
+        self.notification_manager = NotificationConfigManager().initialize_services()
+        self._contexts: Dict[str, VendorContext] = {}
+        self._lock = threading.Lock()
+
+    def context_for(self, vendor: str) -> VendorContext:
+        """
+        获取站点上下文，首次使用时创建
+
+        Args:
+            vendor: 站点标识
+
+        Returns:
+            站点上下文
+        """
+        with self._lock:
+            context = self._contexts.get(vendor)
+            if context is None:
+                context = VendorContext(vendor, self.clock_ttl, self.session_ttl)
+                self._contexts[vendor] = context
+                logger.info(f"创建站点上下文: {vendor}")
+            return context
+
+    def run_task(
+        self,
+        task: TaskSchedule,
+        deadline: Optional[float] = None,
+        fire_at: Optional[datetime] = None,
+    ) -> None:
+        """
+        在常驻上下文中运行任务，所有用户结束后返回
+
+        开始时间以调度为准：fire_at 为本次运行确切的开始时间，未指定时取任务的开始时间，
+        配置文件中的开始时间只在两者都没有时使用
+
+        Args:
+            task: 任务
+            deadline: 截止时间戳，超过后取消未完成的请求
+            fire_at: 本次运行确切的开始时间
+
+        Raises:
+            RuntimeError: 有用户失败或任务超时
+        """
+        started = time.perf_counter()
+        config = self.config_manager.load_seckill_config(task.config_file)
+        if fire_at is not None:
+            config = replace(config, start_time=fire_at.time())
+        elif task.start_time is not None:
+            config = replace(config, start_time=task.start_time)
+
+        futures = []
+        for user in config.users:
+            context = self.context_for(vendor_of(user))
+            context.refresh()
+            user.strategy_params = resolve_strategy_params(config, user)
+            executor = SeckillExecutor(
+                user_config=user,
+                global_config=config,
+                time_diff=context.time_diff(),
+                notification_manager=self.notification_manager,
+                context=context,
+                fire_at=fire_at,
+            )
+            executor.prepare()
+            futures.append((user, context.submit(executor.run_async())))
+
+        logger.info(
+            f"任务准备完成: {task.description}，{len(futures)} 个用户，"
+            f"耗时 {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+
+        errors = []
+        for user, future in futures:
+            timeout = None if deadline is None else max(0.0, deadline - time.time())
+            try:
+                future.result(timeout)
+            except concurrent.futures.TimeoutError:
+                # 取消协程，连接归上下文所有，保留复用
+                future.cancel()
+                logger.error(f"[{user.account_name}] 超过截止时间，已取消")
+                errors.append(f"{user.account_name}: 超过截止时间")
+            except Exception as e:
+                logger.error(f"[{user.account_name}] 秒杀失败: {e}")
+                errors.append(f"{user.account_name}: {e}")
+        if errors:
+            raise RuntimeError("; ".join(errors))
+
+    def close(self) -> None:
+        """关闭所有站点上下文"""
+        with self._lock:
+            contexts, self._contexts = list(self._contexts.values()), {}
+        for context in contexts:
+            context.close()
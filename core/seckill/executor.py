@@ -8,16 +8,27 @@ import threading
 import time
 import random
 import asyncio
-from datetime import datetime, date, timedelta
-from typing import Dict, Optional, List
+from collections import Counter
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, Optional, List, Mapping
 
 from curl_cffi import requests
 from loguru import logger
 
-from strategies import RequestStrategyManager
+from strategies import (
+    RequestStrategyManager,
+    ResponseOutcome,
+    IAsyncSeckillStrategy,
+)
 from utils import TimeSynchronizer, ProxyManager, print_time_cost
 from config import UserConfig, SeckillConfig
 from core.notification import NotificationConfigManager
+from .classifier import ResponseClassifier
+from .latency import AdaptiveTimeoutPolicy
+
+if TYPE_CHECKING:
+    from .context import VendorContext
 
 
 class SeckillExecutor:
@@ -29,8 +40,22 @@ class SeckillExecutor:
         global_config: SeckillConfig,
         time_diff: float = 0.0,
         notification_manager: Optional[NotificationConfigManager] = None,
+        context: Optional["VendorContext"] = None,
+        fire_at: Optional[datetime] = None,
     ):
+        """
+        Args:
+            user_config: 用户配置
+            global_config: 秒杀配置
+            time_diff: 网络时间与本地时间的时间差
+            notification_manager: 通知管理器
+            context: 守护模式下的站点常驻上下文
+            fire_at: 确切的开始时间（调度器传入的本次运行时间），
+                为 None 时按配置的开始时间取下一次
+        """
         self.user_config = user_config
+        # 守护模式下的站点常驻上下文，提供复用的连接和策略
+        self.context = context
         self.global_config = global_config
         self.time_diff = time_diff
         self.notification_manager = (
@@ -43,13 +68,18 @@ class SeckillExecutor:
         self.account_name = user_config.account_name
         self.max_attempts = user_config.max_attempts
         self.thread_count = user_config.thread_count
-        self.start_time = global_config.start_time
-
-        # 请求配置
-        self._headers = {
-            **user_config.headers,
-            user_config.cookie_name: user_config.cookie_id,
-        }
+        # 并行请求通道数：每个通道一条预热连接，按交错方式分摊发射计划
+        self.lane_count = max(1, min(self.thread_count, self.max_attempts))
+        self.start_time = fire_at.time() if fire_at else global_config.start_time
+        self.fire_at = fire_at
+
+        # 请求配置（请求头模板只读，策略通过叠加层改写单次请求的请求头）
+        self._headers = MappingProxyType(
+            {
+                **user_config.headers,
+                user_config.cookie_name: user_config.cookie_id,
+            }
+        )
 
         self._data = user_config.data
         self._base_url = user_config.basurl
@@ -57,15 +87,44 @@ class SeckillExecutor:
         # 控制标志
         self.attempts = 0
         self.stop_flag = threading.Event()
+        self.outcome_counts: Counter = Counter()
+        self._backoff_until = 0.0
+
+        # 在途请求窗口：限制同时未完成的请求数，完成后释放名额
+        self.max_in_flight = user_config.max_in_flight
+        self.in_flight = 0
+        self.peak_in_flight = 0
         self.key_value = user_config.key_value
         self.key_message = user_config.key_message
+        self.classifier = ResponseClassifier(
+            key_value=user_config.key_value,
+            key_message=user_config.key_message,
+            success_patterns=user_config.success_patterns,
+            retry_patterns=user_config.retry_patterns,
+            terminal_patterns=user_config.terminal_patterns,
+            default_terminal_patterns=user_config.default_terminal_patterns,
+        )
 
         # 策略管理
-        self.strategy_manager = RequestStrategyManager()
-        if user_config.strategy_flag and user_config.strategy_params:
-            self.strategy_manager.update_strategy_params(
-                user_config.strategy_flag, user_config.strategy_params
+        if context is not None:
+            self.strategy_manager = context.strategy_manager(
+                self.account_name,
+                user_config.strategy_flag,
+                user_config.strategy_params,
             )
+        else:
+            self.strategy_manager = RequestStrategyManager()
+            if user_config.strategy_flag and user_config.strategy_params:
+                self.strategy_manager.update_strategy_params(
+                    user_config.strategy_flag, user_config.strategy_params
+                )
+
+        # 连接与超时：预热阶段建立长连接并测量TTFB，对冲请求需要第二条连接
+        self.hedge_requests = user_config.hedge_requests
+        self.timeout_policy = AdaptiveTimeoutPolicy(
+            default_timeout=user_config.request_timeout
+        )
+        self._sessions: List[requests.AsyncSession] = []
 
         # 代理管理
         self.proxy_manager = ProxyManager(global_config.proxies)
@@ -84,52 +143,126 @@ class SeckillExecutor:
         """使用异步生成器实现精确时间控制的秒杀请求"""
         result = None
 
-        # 使用异步生成器按精确间隔产生请求
-        async for request_result in self._request_generator():
-            result = request_result
-            if result and result.get("success"):
-                return result
+        # 使用异步生成器按精确间隔产生请求，按完成顺序处理响应
+        results = self._request_generator()
+        try:
+            async for request_result in results:
+                if request_result:
+                    result = request_result
+                if result and result.get("outcome") in (
+                    ResponseOutcome.SUCCESS.value,
+                    ResponseOutcome.TERMINAL.value,
+                ):
+                    break
+        finally:
+            await results.aclose()
 
         # 如果所有请求都失败，返回最后一个结果
-        return result or {
+        result = result or {
             "success": False,
             "message": "秒杀失败",
             "details": f"尝试了 {self.max_attempts} 次",
             "failure_reason": f"达到最大尝试次数 ({self.max_attempts}) 仍未成功",
         }
+        return self._attach_stats(result)
+
+    def _attach_stats(self, result: dict) -> dict:
+        """在结果中附加各类响应的统计和峰值在途请求数"""
+        counts = dict(self.outcome_counts)
+        summary = ", ".join(f"{name}={count}" for name, count in counts.items())
+        summary = f"{summary or '无'}, 峰值在途 {self.peak_in_flight}"
+        logger.info(f"[{self.account_name}] 响应统计: {summary}")
+        return {
+            **result,
+            "outcome_counts": counts,
+            "peak_in_flight": self.peak_in_flight,
+            "details": f"{result.get('details', '')} (响应统计: {summary})",
+        }
 
     async def _request_generator(self):
-        """异步生成器，按精确间隔产生请求（不受请求执行时间影响）"""
+        """异步生成器，按精确间隔发出请求（不受请求执行时间影响），按完成顺序产出结果"""
         request_interval = self.user_config.request_interval
         start_time = time.time()
-
-        # 预先创建所有请求任务
+        completed: asyncio.Queue = asyncio.Queue()
         request_tasks = []
-        for attempt in range(self.max_attempts):
-            # 计算精确的目标时间点
-            target_time = start_time + (attempt * request_interval)
-
-            # 等待到精确的目标时间点
-            current_time = time.time()
-            if current_time < target_time:
-                await asyncio.sleep(target_time - current_time)
-
-            if not self._should_stop():
-                request_task = asyncio.create_task(self._make_request())
-                request_tasks.append(request_task)
-
-        for i, request_task in enumerate(request_tasks):
-            if self._should_stop():
-                break
+        # 所有通道共享的计划顺延量
+        schedule_shift = 0.0
+        window = asyncio.Semaphore(self.max_in_flight) if self.max_in_flight else None
+
+        def release_slot(request_task: asyncio.Task) -> None:
+            """请求完成后释放在途名额"""
+            self.in_flight -= 1
+            if window:
+                window.release()
+
+        async def fire_requests(lane: int):
+            """单个通道：负责第 lane, lane+N, lane+2N... 次请求"""
+            nonlocal schedule_shift
             try:
-                response = await request_task
-                result = self._handle_response(response)
-                self.attempts += 1
-                yield result
-            except Exception as e:
-                self._handle_error(e)
-                self.attempts += 1
-                yield None
+                for attempt in range(lane, self.max_attempts, self.lane_count):
+                    # 等待到精确的目标时间点，服务器要求退避时整体顺延后续计划
+                    while True:
+                        target_time = (
+                            start_time + schedule_shift + (attempt * request_interval)
+                        )
+                        if self._backoff_until > target_time:
+                            schedule_shift += self._backoff_until - target_time
+                            target_time = self._backoff_until
+                        current_time = time.time()
+                        if current_time >= target_time:
+                            break
+                        await asyncio.sleep(target_time - current_time)
+
+                    # 窗口已满时等待名额，名额释放后立即补发
+                    if window:
+                        await window.acquire()
+                    if self._should_stop():
+                        if window:
+                            window.release()
+                        break
+                    self.in_flight += 1
+                    self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                    request_task = asyncio.create_task(self._make_request(lane))
+                    request_task.add_done_callback(release_slot)
+                    request_task.add_done_callback(completed.put_nowait)
+                    request_tasks.append(request_task)
+            finally:
+                # 通道发射结束标记
+                completed.put_nowait(None)
+
+        firing_tasks = [
+            asyncio.create_task(fire_requests(lane)) for lane in range(self.lane_count)
+        ]
+        lanes_done = 0
+        handled = 0
+        try:
+            while lanes_done < self.lane_count or handled < len(request_tasks):
+                request_task = await completed.get()
+                if request_task is None:
+                    lanes_done += 1
+                    continue
+
+                handled += 1
+                if self.stop_flag.is_set():
+                    break
+                try:
+                    response = request_task.result()
+                    if response is None:
+                        continue
+                    result = await self._handle_response(response)
+                    self.attempts += 1
+                    yield result
+                except Exception as e:
+                    self._handle_error(e)
+                    self.outcome_counts["error"] += 1
+                    self.attempts += 1
+                    yield None
+        finally:
+            # 成功或终止后取消尚未完成的请求
+            for firing_task in firing_tasks:
+                firing_task.cancel()
+            for request_task in request_tasks:
+                request_task.cancel()
 
     def _should_stop(self) -> bool:
         """检查是否应该停止请求"""
@@ -143,59 +276,253 @@ class SeckillExecutor:
             return True
         return False
 
-    def _prepare_request(self) -> tuple[str, Dict, Dict]:
-        """准备请求参数"""
-        current_time = str(int(time.time() * 1000))
+    async def _prepare_request(self) -> tuple[str, Dict, Mapping]:
+        """准备请求参数，异步策略直接 await，同步策略放到线程池中执行"""
+        current_time = datetime.now()
         strategy = self.strategy_manager.get_strategy(self.user_config.strategy_flag)
-        return strategy.prepare_request(
-            datetime.now(), self._data, self._headers, self._base_url
+        if isinstance(strategy, IAsyncSeckillStrategy):
+            return await strategy.prepare_request_async(
+                current_time, self._data, self._headers, self._base_url
+            )
+        return await asyncio.to_thread(
+            strategy.prepare_request,
+            current_time,
+            self._data,
+            self._headers,
+            self._base_url,
         )
 
     @print_time_cost
-    async def _make_request(self) -> requests.Response:
+    async def _make_request(self, lane: int = 0) -> requests.Response:
         """异步发送请求"""
-        url, process_data, headers = self._prepare_request()
+        url, process_data, headers = await self._prepare_request()
         proxies = self.get_formatted_proxy()
         if self._should_stop():
             return None
-        logger.info(f"[{self.account_name}] 发送请求")
+        logger.info(f"[{self.account_name}] 通道{lane} 发送请求")
         try:
-            async with requests.AsyncSession() as session:
-                response = await session.get(
-                    url,
-                    headers=headers,
-                    proxies=proxies,
-                    timeout=1,
-                )
-                return response
+            return await self._send_hedged(lane, url, headers, proxies)
         except asyncio.TimeoutError:
             raise RequestError("请求超时")
         except Exception as e:
             raise RequestError(f"请求失败: {str(e)}")
 
-    def _handle_response(self, response: requests.Response) -> dict:
+    async def _send(
+        self,
+        session: requests.AsyncSession,
+        url: str,
+        headers: Mapping,
+        proxies: Optional[Dict[str, str]],
+    ) -> requests.Response:
+        """在指定连接上发送请求并记录TTFB，超时也记为样本"""
+        timeout = self.timeout_policy.timeout
+        started = time.perf_counter()
+        try:
+            response = await session.get(
+                url, headers=headers, proxies=proxies, timeout=timeout
+            )
+        except Exception:
+            if time.perf_counter() - started >= timeout:
+                self.timeout_policy.record_timeout(timeout)
+            raise
+        self.timeout_policy.record(time.perf_counter() - started)
+        return response
+
+    async def _send_hedged(
+        self,
+        lane: int,
+        url: str,
+        headers: Mapping,
+        proxies: Optional[Dict[str, str]],
+    ) -> requests.Response:
+        """在通道自己的连接上发送请求，超过 p50 仍未响应时在另一条连接上发出对冲请求"""
+        sessions = self._lane_sessions(lane)
+        primary = asyncio.create_task(self._send(sessions[0], url, headers, proxies))
+        hedge_delay = self.timeout_policy.hedge_delay
+        if not self.hedge_requests or hedge_delay is None or len(sessions) < 2:
+            return await primary
+
+        done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+        if done:
+            return primary.result()
+
+        logger.debug(
+            f"[{self.account_name}] {hedge_delay*1000:.1f}ms 未响应，发出对冲请求"
+        )
+        hedge = asyncio.create_task(self._send(sessions[1], url, headers, proxies))
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # 取消较慢的一个
+            for task in pending:
+                task.cancel()
+
+    def _lane_sessions(self, lane: int) -> List[requests.AsyncSession]:
+        """通道自己的连接在前，其余连接作为对冲备选"""
+        if not self._sessions:
+            if self.context is not None:
+                self._sessions = self.context.sessions(
+                    self.account_name, self._pool_size
+                )
+            else:
+                self._sessions = [
+                    requests.AsyncSession() for _ in range(self._pool_size)
+                ]
+        index = lane % len(self._sessions)
+        return self._sessions[index:] + self._sessions[:index]
+
+    @property
+    def _pool_size(self) -> int:
+        """预热连接数：每个通道一条，启用对冲时至少两条"""
+        return max(self.lane_count, 2 if self.hedge_requests else 1)
+
+    async def warmup(self) -> None:
+        """预热：建立长连接并测量TTFB，用于自适应超时和对冲延迟"""
+        # 默认探测实际的请求地址，站点根路径的响应时间往往远小于接口
+        warmup_url = self.user_config.warmup_url or self._base_url
+        self._lane_sessions(0)
+        for _ in range(self.user_config.warmup_probes):
+            for session in self._sessions:
+                timeout = self.timeout_policy.timeout
+                started = time.perf_counter()
+                try:
+                    await session.head(
+                        warmup_url,
+                        proxies=self.get_formatted_proxy(),
+                        timeout=timeout,
+                    )
+                    self.timeout_policy.record(
+                        time.perf_counter() - started, endpoint=False
+                    )
+                except Exception as e:
+                    if time.perf_counter() - started >= timeout:
+                        self.timeout_policy.record_timeout(timeout, endpoint=False)
+                    logger.debug(f"[{self.account_name}] 预热请求失败: {e}")
+
+        # 异步策略可以在开始前为计划发送时间预先准备请求
+        strategy = self.strategy_manager.get_strategy(self.user_config.strategy_flag)
+        if isinstance(strategy, IAsyncSeckillStrategy):
+            try:
+                await strategy.prefetch(self._planned_times(), self._data)
+            except Exception as e:
+                logger.warning(f"[{self.account_name}] 预取请求失败: {e}")
+
+        p50 = self.timeout_policy.percentile(0.5)
+        logger.info(
+            f"[{self.account_name}] 预热完成: {len(self._sessions)} 条连接, "
+            f"样本 {self.timeout_policy.sample_count}, "
+            f"p50={'-' if p50 is None else f'{p50*1000:.1f}ms'}, "
+            f"超时 {self.timeout_policy.timeout:.3f}s"
+        )
+
+    def _planned_times(self) -> List[datetime]:
+        """按本地时钟计算的计划发送时间"""
+        first = datetime.fromtimestamp(
+            self.time_synchronizer.fire_timestamp(
+                self.fire_at or self.start_time, self.time_diff
+            )
+        )
+        interval = self.user_config.request_interval
+        return [
+            first + timedelta(seconds=attempt * interval)
+            for attempt in range(self.max_attempts)
+        ]
+
+    async def close(self) -> None:
+        """关闭预热连接和策略资源，守护模式下保留给后续任务复用"""
+        if self.context is not None:
+            self.context.release(self.account_name)
+            self._sessions = []
+            return
+
+        for session in self._sessions:
+            await session.close()
+        self._sessions = []
+
+        strategy = self.strategy_manager.get_strategy(self.user_config.strategy_flag)
+        if isinstance(strategy, IAsyncSeckillStrategy):
+            await strategy.close()
+
+    async def _handle_response(self, response: requests.Response) -> dict:
         """处理响应并返回结果"""
         try:
             strategy = self.strategy_manager.get_strategy(
                 self.user_config.strategy_flag
             )
-            response_data = strategy.process_response(response)
-            message = response_data.get(self.key_message, "")
 
+            # 限流状态码的响应内容通常不是JSON，先于解析判定
+            outcome = strategy.classify_status(response.status_code)
+            message = f"HTTP {response.status_code}"
+            if outcome is None:
+                # 先在原始字节上快速分类，无法判定时再完整解析
+                outcome, message = self.classifier.classify_bytes(response.content)
+            if outcome is None:
+                if isinstance(strategy, IAsyncSeckillStrategy):
+                    response_data = await strategy.process_response_async(response)
+                else:
+                    response_data = await asyncio.to_thread(
+                        strategy.process_response, response
+                    )
+                message = str(response_data.get(self.key_message, ""))
+                outcome = self.classifier.classify_message(message)
+
+            # 未成功的响应交由策略按厂商规则细分
+            if outcome is ResponseOutcome.RETRY:
+                outcome = (
+                    strategy.classify_response(response.status_code, message) or outcome
+                )
+
+            self.outcome_counts[outcome.value] += 1
             logger.debug(f"[{self.account_name}] 响应: {message}")
 
-            if self.key_value in message.lower():
+            if outcome is ResponseOutcome.SUCCESS:
                 logger.info(f"[{self.account_name}] 成功完成请求")
                 return {
                     "success": True,
+                    "outcome": outcome.value,
                     "message": message,
                     "details": f"成功完成秒杀",
                     "failure_reason": None,
                 }
+            elif outcome is ResponseOutcome.TERMINAL:
+                logger.warning(f"[{self.account_name}] 终止响应，停止请求: {message}")
+                self.stop_flag.set()
+                return {
+                    "success": False,
+                    "outcome": outcome.value,
+                    "message": f"终止响应: {message}",
+                    "details": f"尝试了 {self.attempts + 1} 次",
+                    "failure_reason": "服务器返回终止响应，已停止请求",
+                }
+            elif outcome is ResponseOutcome.RETRY_AFTER_DELAY:
+                logger.warning(
+                    f"[{self.account_name}] 服务器要求退避 {strategy.retry_delay}s: {message}"
+                )
+                self._backoff_until = max(
+                    self._backoff_until, time.time() + strategy.retry_delay
+                )
+                return {
+                    "success": False,
+                    "outcome": outcome.value,
+                    "message": f"退避响应: {message}",
+                    "details": f"尝试了 {self.attempts} 次",
+                    "failure_reason": "服务器要求降低请求频率",
+                }
             else:
                 logger.warning(f"[{self.account_name}] 意外响应: {message}")
                 return {
                     "success": False,
+                    "outcome": outcome.value,
                     "message": f"意外响应: {message}",
                     "details": f"尝试了 {self.attempts} 次",
                     "failure_reason": "服务器返回意外响应",
@@ -217,8 +544,19 @@ class SeckillExecutor:
 
     async def start_seckill(self) -> None:
         """异步开始秒杀"""
-        # 等待到指定开始时间
-        self.time_synchronizer.wait_for_time(self.start_time, self.time_diff)
+        # 预热完成后交给精确触发：开始时间换算为本地时间戳后等待
+        deadline = self.time_synchronizer.fire_timestamp(
+            self.fire_at or self.start_time, self.time_diff
+        )
+        margin = deadline - time.time()
+        if margin < 0:
+            logger.warning(
+                f"[{self.account_name}] 预热完成时已超过开始时间 {-margin:.3f} 秒，"
+                f"请增大任务的 lead_time"
+            )
+        else:
+            logger.info(f"[{self.account_name}] 预热完成，距开始时间 {margin:.3f} 秒")
+        await self._wait_until(deadline)
 
         # 记录实际开始时间
         actual_start_time = time.time()
@@ -231,6 +569,18 @@ class SeckillExecutor:
         result = await self.post_seckill_url()
         self._send_notification(result)
 
+    async def _wait_until(self, deadline: float) -> None:
+        """让出事件循环等待到临近开始时间，最后几毫秒交给精确等待"""
+        remaining = deadline - time.time() - 0.005
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+        self.time_synchronizer.wait_until(deadline)
+
+    def prepare(self) -> None:
+        """开始前的同步准备：刷新代理列表"""
+        if self.proxy_flag:
+            self.proxy_manager.refresh_proxies()
+
     def run(self) -> None:
         """运行秒杀"""
         thread_id = threading.current_thread().ident
@@ -238,20 +588,22 @@ class SeckillExecutor:
             f"[{self.account_name}] 线程{thread_id} 等待开始时间: {self.start_time}"
         )
 
-        # 刷新代理列表
-        if self.proxy_flag:
-            self.proxy_manager.refresh_proxies()
+        self.prepare()
 
         # 使用异步执行
-        asyncio.run(self._run_async())
+        asyncio.run(self.run_async())
 
         thread_id = threading.current_thread().ident
         logger.info(f"[{self.account_name}] 线程{thread_id} 秒杀完成")
 
-    async def _run_async(self) -> None:
+    async def run_async(self) -> None:
         """单协程执行，保证精确时间控制"""
-        # 只创建一个任务，不使用并发，确保时间控制精确
-        await self.start_seckill()
+        try:
+            await self.warmup()
+            # 只创建一个任务，不使用并发，确保时间控制精确
+            await self.start_seckill()
+        finally:
+            await self.close()
 
     def _send_notification(self, result: dict) -> None:
         """统一发送通知"""
@@ -0,0 +1,88 @@
+"""
+自适应超时策略
+
+根据预热阶段和秒杀过程中观测到的首字节时间（TTFB）分布计算请求超时和对冲延迟。
+预热探测的响应可能比真实请求快得多，收到真实请求的响应之前超时不低于配置的默认超时；
+超时的请求按超时时间记为样本，后续请求的超时随之放宽
+"""
+
+from collections import deque
+from typing import Optional
+
+
+class AdaptiveTimeoutPolicy:
+    """基于TTFB分布的自适应超时策略"""
+
+    def __init__(
+        self,
+        default_timeout: float = 1.0,
+        min_timeout: float = 0.2,
+        max_timeout: float = 5.0,
+        multiplier: float = 3.0,
+        window: int = 50,
+    ):
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.multiplier = multiplier
+        self._samples = deque(maxlen=window)
+        self._endpoint_samples = 0
+
+    def record(self, ttfb: float, endpoint: bool = True) -> None:
+        """
+        记录一次TTFB观测值
+
+        Args:
+            ttfb: 首字节时间（秒）
+            endpoint: 是否为真实请求的观测值，预热探测为 False
+        """
+        self._samples.append(ttfb)
+        if endpoint:
+            self._endpoint_samples += 1
+
+    def record_timeout(self, timeout: float, endpoint: bool = True) -> None:
+        """
+        记录一次超时：实际TTFB不小于超时时间，按超时时间记为样本
+
+        Args:
+            timeout: 本次请求使用的超时（秒）
+            endpoint: 是否为真实请求，预热探测为 False
+        """
+        self.record(timeout, endpoint)
+
+    @property
+    def sample_count(self) -> int:
+        """观测样本数"""
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        计算TTFB分位数
+
+        Args:
+            q: 分位点，0~1
+
+        Returns:
+            分位数，没有样本时返回 None
+        """
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(q * len(ordered)))
+        return ordered[index]
+
+    @property
+    def timeout(self) -> float:
+        """当前请求超时：p95 的若干倍，限制在上下界之内；没有真实请求的样本时不低于默认超时"""
+        p95 = self.percentile(0.95)
+        if p95 is None:
+            return self.default_timeout
+        timeout = min(self.max_timeout, max(self.min_timeout, p95 * self.multiplier))
+        if not self._endpoint_samples:
+            timeout = max(timeout, self.default_timeout)
+        return timeout
+
+    @property
+    def hedge_delay(self) -> Optional[float]:
+        """对冲延迟：请求超过 p50 仍未响应时发出对冲请求"""
+        return self.percentile(0.5)
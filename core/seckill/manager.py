@@ -6,8 +6,9 @@
 
 import time
 import multiprocessing
-from datetime import datetime, date, timedelta
-from typing import Dict, Optional
+from dataclasses import replace
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 from loguru import logger
 
 from config import ConfigManager, SeckillConfig, UserConfig
@@ -16,21 +17,63 @@ from .executor import SeckillExecutor
 from core.notification import NotificationConfigManager
 
 
+def resolve_strategy_params(
+    config: SeckillConfig, user: UserConfig
+) -> Optional[Dict[str, Any]]:
+    """
+    确定用户请求策略的参数：全局配置中的策略参数优先于用户自己的参数
+
+    Args:
+        config: 秒杀配置
+        user: 用户配置
+
+    Returns:
+        策略参数
+    """
+    if user.strategy_flag == "mixue" and config.mixues:
+        return config.mixues[0]
+    if user.strategy_flag == "BW" and config.bw_keywords:
+        return {
+            "bw_keywords": config.bw_keywords,
+            "bw_encrypt_url": config.bw_encrypt_url,
+            "bw_encrypt_batch": config.bw_encrypt_batch,
+            "bw_encrypt_timeout": config.bw_encrypt_timeout,
+        }
+    if user.strategy_flag and user.strategy_params:
+        return user.strategy_params
+    return None
+
+
 class SeckillManager:
     """秒杀管理器"""
 
     def __init__(
-        self, config: Optional[Dict] = None, config_file: Optional[str] = None
+        self,
+        config: Optional[Dict] = None,
+        config_file: Optional[str] = None,
+        fire_at: Optional[datetime] = None,
     ):
+        """
+        Args:
+            config: 秒杀配置字典
+            config_file: 秒杀配置文件
+            fire_at: 确切的开始时间（调度器传入的本次运行时间），覆盖配置中的开始时间
+        """
         self.config_manager = ConfigManager()
         self.notification_manager = NotificationConfigManager().initialize_services()
 
+        started = time.perf_counter()
         if config:
             self.config = SeckillConfig.from_dict(config)
         elif config_file:
             self.config = self.config_manager.load_seckill_config(config_file)
         else:
             raise ValueError("必须提供 config 或 config_file 参数")
+        self.fire_at = fire_at
+        if fire_at is not None:
+            self.config = replace(self.config, start_time=fire_at.time())
+        self.load_seconds = time.perf_counter() - started
+        self._processes: List[multiprocessing.Process] = []
 
     def sync_time(self) -> float:
         """同步时间，返回时间差"""
@@ -42,15 +85,7 @@ class SeckillManager:
         logger.info(f"开始秒杀: {user.account_name}")
 
         # 设置策略参数
-        strategy_params = None
-        if user.strategy_flag == "mixue" and self.config.mixues:
-            strategy_params = self.config.mixues[0]
-        elif user.strategy_flag == "BW" and self.config.bw_keywords:
-            strategy_params = {"bw_keywords": self.config.bw_keywords}
-        elif user.strategy_flag and user.strategy_params:
-            strategy_params = user.strategy_params
-
-        user.strategy_params = strategy_params
+        user.strategy_params = resolve_strategy_params(self.config, user)
 
         # 创建秒杀执行器
         executor = SeckillExecutor(
@@ -58,29 +93,22 @@ class SeckillManager:
             global_config=self.config,
             time_diff=time_diff,
             notification_manager=self.notification_manager,
+            fire_at=self.fire_at,
         )
 
         executor.run()
 
     def print_remaining_time(self, time_diff: float) -> None:
         """打印剩余时间"""
-        logger.info(f"开始倒计时，目标时间: {self.config.start_time}")
+        logger.info(f"开始倒计时，目标时间: {self.fire_at or self.config.start_time}")
 
         time_synchronizer = TimeSynchronizer()
+        deadline = time_synchronizer.fire_timestamp(
+            self.fire_at or self.config.start_time, time_diff
+        )
 
         while True:
-            # 使用高精度时间计算
-            current_timestamp = time.time()
-            adjusted_timestamp = current_timestamp + time_diff
-            adjusted_datetime = datetime.fromtimestamp(adjusted_timestamp)
-
-            target_datetime = datetime.combine(date.today(), self.config.start_time)
-
-            # 如果跨天了，调整目标时间
-            if adjusted_datetime.date() > date.today():
-                target_datetime = target_datetime + timedelta(days=1)
-
-            remaining_seconds = (target_datetime - adjusted_datetime).total_seconds()
+            remaining_seconds = deadline - time.time()
 
             if remaining_seconds <= 0:
                 logger.info("时间到！所有进程应该开始秒杀...")
@@ -99,34 +127,59 @@ class SeckillManager:
 
     def run(self) -> None:
         """运行秒杀管理器"""
-        # 在主进程中同步时间
+        # 预热阶段：同步时间并启动工作进程，工作进程建立连接后等待精确触发
+        started = time.perf_counter()
         time_diff = self.sync_time()
+        sync_seconds = time.perf_counter() - started
 
         # 启动倒计时进程
         timer_process = multiprocessing.Process(
             target=self.print_remaining_time, args=(time_diff,)
         )
         timer_process.start()
-
-        # 启动用户工作进程
-        processes = []
-        for user in self.config.users:
-            p = multiprocessing.Process(target=self.worker, args=(user, time_diff))
-            p.start()
-            processes.append(p)
-
-        # 等待所有进程完成
-        for p in processes:
-            p.join()
-
-        # 终止倒计时进程
-        timer_process.terminate()
-        timer_process.join()
-
-    def stop_all(self):
-        """停止所有进程"""
-        # TODO: 实现停止逻辑
-        pass
+        self._processes = [timer_process]
+
+        try:
+            # 启动用户工作进程
+            processes = []
+            for user in self.config.users:
+                p = multiprocessing.Process(target=self.worker, args=(user, time_diff))
+                p.start()
+                processes.append(p)
+                self._processes.append(p)
+
+            logger.info(
+                f"预热阶段: 加载配置 {self.load_seconds * 1000:.1f}ms, "
+                f"时间同步 {sync_seconds * 1000:.1f}ms, "
+                f"启动 {len(processes)} 个工作进程 "
+                f"{(time.perf_counter() - started - sync_seconds) * 1000:.1f}ms"
+            )
+
+            # 等待所有进程完成
+            for p in processes:
+                p.join()
+        finally:
+            # 终止倒计时进程；中断或异常退出时一并停止仍在运行的工作进程
+            self.stop_all()
+
+    def stop_all(self, grace: float = 5.0) -> None:
+        """
+        停止倒计时进程和所有工作进程
+
+        Args:
+            grace: 发送 SIGTERM 后等待退出的秒数，超时后强制结束
+        """
+        processes, self._processes = self._processes, []
+        alive = [p for p in processes if p.is_alive()]
+        for p in alive:
+            p.terminate()
+        deadline = time.monotonic() + grace
+        for p in alive:
+            p.join(max(0.0, deadline - time.monotonic()))
+            if p.is_alive():
+                logger.warning(f"进程 {p.pid} 未在 {grace:g} 秒内退出，强制结束")
+                p.kill()
+                p.join()
 
     async def run_async(self):
         """异步运行方法"""
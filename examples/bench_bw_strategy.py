@@ -0,0 +1,100 @@
+"""
+BW请求体构建微基准
+
+对比逐次构建（每次重新拆分关键词、拼接签名串、编码密钥并序列化JSON）
+与预编译构造器的单次耗时，并校验两者输出一致
+
+用法: python examples/bench_bw_strategy.py --count 2000
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import sys
+import time
+
+from Crypto.Cipher import AES
+from Crypto.Util.Padding import pad
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from strategies.request.strategies.bw import BWRequestStrategy  # noqa: E402
+
+SAMPLE_DATA = {
+    "activityId": "1234567890123456789",
+    "userId": "987654321",
+    "key": "0123456789abcdef",
+    "iv": "fedcba9876543210",
+    "version": "1.0.0",
+}
+SAMPLE_KEYWORDS = "霸王茶姬,伯牙绝弦,春日桃桃"
+
+
+def build_reference(timestamp: int, kw: str, data: dict) -> dict:
+    """逐次构建的参考实现"""
+    activity_id = data["activityId"]
+    signature_str = (
+        f"activityId={activity_id}&sellerId=49006&timestamp={timestamp}"
+        f"&userId={data['userId']}&key={activity_id[::-1]}"
+    )
+    signature = hashlib.md5(signature_str.encode("utf-8")).hexdigest().upper()
+    request_data = {
+        "activityId": activity_id,
+        "keyWords": kw,
+        "qzGtd": "",
+        "gdtVid": "",
+        "appid": "wxafec6f8422cb357b",
+        "timestamp": timestamp,
+        "signature": signature,
+    }
+    json_data = json.dumps(request_data, ensure_ascii=False, separators=(",", ":"))
+    cipher = AES.new(data["key"].encode(), AES.MODE_CBC, data["iv"].encode())
+    encrypted = cipher.encrypt(pad(json_data.encode("utf-8"), AES.block_size))
+    return {
+        **request_data,
+        "data": base64.b64encode(encrypted).decode("utf-8"),
+        "version": data["version"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BW请求体构建微基准")
+    parser.add_argument("--count", type=int, default=2000, help="构建次数")
+    args = parser.parse_args()
+
+    keywords = [kw.strip() for kw in SAMPLE_KEYWORDS.split(",")]
+    timestamps = [1700000000000 + i * 50 for i in range(args.count)]
+
+    strategy = BWRequestStrategy({"bw_keywords": SAMPLE_KEYWORDS})
+    for i, timestamp in enumerate(timestamps[:50]):
+        expected = build_reference(timestamp, keywords[i % len(keywords)], SAMPLE_DATA)
+        actual = strategy._build_process_data(timestamp, SAMPLE_DATA)
+        assert actual == expected, f"输出不一致: {timestamp}"
+    print("输出一致性校验通过")
+
+    start = time.perf_counter()
+    for i, timestamp in enumerate(timestamps):
+        kw = [k.strip() for k in SAMPLE_KEYWORDS.split(",")][i % len(keywords)]
+        build_reference(timestamp, kw, SAMPLE_DATA)
+    reference = (time.perf_counter() - start) / args.count
+
+    strategy = BWRequestStrategy({"bw_keywords": SAMPLE_KEYWORDS})
+    start = time.perf_counter()
+    for timestamp in timestamps:
+        strategy._build_process_data(timestamp, SAMPLE_DATA)
+    compiled = (time.perf_counter() - start) / args.count
+
+    strategy = BWRequestStrategy({"bw_keywords": SAMPLE_KEYWORDS})
+    start = time.perf_counter()
+    strategy.build_payloads(timestamps, SAMPLE_DATA)
+    batched = (time.perf_counter() - start) / args.count
+
+    print(f"逐次构建: {reference * 1e6:.1f} µs/次")
+    print(f"预编译:   {compiled * 1e6:.1f} µs/次")
+    print(f"批量构建: {batched * 1e6:.1f} µs/次")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+BW加密客户端冒烟检查
+
+在本地启动加密服务替身（examples/bw_encrypt_server.py），检查：
+- 单个/批量/逐个预取得到的加密参数与替身的计算结果一致
+- 同步入口多次调用复用同一个长连接会话，不会每次新建
+- close 之后不再持有会话
+
+用法: python examples/bw_client_smoke.py --count 50
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import threading
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from examples.bw_encrypt_server import fake_encrypt, serve  # noqa: E402
+from strategies.request.strategies.bw import BWRequestStrategy  # noqa: E402
+from strategies.request.strategies.bw_client import BWEncryptClient  # noqa: E402
+
+SAMPLE_DATA = {
+    "activityId": "1234567890123456789",
+    "userId": "987654321",
+    "key": "0123456789abcdef",
+    "iv": "fedcba9876543210",
+    "version": "1.0.0",
+}
+
+
+async def check_client(base_url: str, count: int) -> None:
+    """单个请求、批量预取和逐个预取"""
+    payloads = [{"index": i, "keyWords": "伯牙绝弦"} for i in range(count)]
+
+    client = BWEncryptClient(base_url)
+    for payload in payloads[:5]:
+        assert await client.encrypt(payload) == fake_encrypt(payload)
+    assert await client.prefetch(payloads) == count
+    await client.close()
+
+    client = BWEncryptClient(base_url, batch=True)
+    assert await client.prefetch(payloads) == count
+    for payload in payloads:
+        # 全部命中缓存
+        assert client._cache[client.cache_key(payload)] == fake_encrypt(payload)
+    await client.close()
+    print(f"加密参数一致: {count} 个请求体（单个/批量/逐个预取）")
+
+
+def check_sync_entry(base_url: str, count: int) -> None:
+    """同步入口复用同一个会话"""
+    strategy = BWRequestStrategy(
+        {"bw_keywords": "霸王茶姬,伯牙绝弦", "bw_encrypt_url": base_url}
+    )
+    sessions = set()
+    for _ in range(count):
+        url, _, _ = strategy.prepare_request(
+            datetime.now(), SAMPLE_DATA, {}, "https://example.com/api"
+        )
+        assert "type__1475=" in url
+        sessions.add(id(strategy.encrypt_client._session))
+    assert len(sessions) == 1, f"同步入口新建了 {len(sessions)} 个会话"
+
+    strategy._sync_loop.run_until_complete(strategy.close())
+    assert strategy.encrypt_client._session is None
+    print(f"同步入口 {count} 次调用复用 1 个会话")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BW加密客户端冒烟检查")
+    parser.add_argument("--count", type=int, default=50, help="请求体数量")
+    args = parser.parse_args()
+
+    server = serve(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        asyncio.run(check_client(base_url, args.count))
+        check_sync_entry(base_url, args.count)
+    finally:
+        server.shutdown()
+    print("通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+BW加密服务本地替身
+
+实现与真实加密服务相同的 /api/encrypt 和 /api/encrypt/batch 接口，
+返回由请求体确定性生成的伪加密参数，用于在本地调试BW策略和加密客户端
+
+用法: python examples/bw_encrypt_server.py --port 3001
+"""
+
+import argparse
+import hashlib
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def fake_encrypt(payload) -> str:
+    """由请求体生成确定性的伪加密参数"""
+    canonical = json.dumps(
+        payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+class EncryptHandler(BaseHTTPRequestHandler):
+    """加密服务请求处理"""
+
+    protocol_version = "HTTP/1.1"  # 支持长连接
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._reply(400, {"code": 400, "msg": "invalid json"})
+            return
+
+        if self.path == "/api/encrypt":
+            self._reply(200, {"code": 0, "data": {"encrypted": fake_encrypt(payload)}})
+        elif self.path == "/api/encrypt/batch":
+            items = payload.get("items", [])
+            encrypted = [fake_encrypt(item) for item in items]
+            self._reply(200, {"code": 0, "data": {"encrypted": encrypted}})
+        else:
+            self._reply(404, {"code": 404, "msg": "not found"})
+
+    def _reply(self, status: int, body: dict):
+        content = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host: str = "127.0.0.1", port: int = 3001) -> ThreadingHTTPServer:
+    """创建加密服务替身，调用方负责 serve_forever/shutdown"""
+    return ThreadingHTTPServer((host, port), EncryptHandler)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="BW加密服务本地替身")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3001)
+    args = parser.parse_args()
+
+    server = serve(args.host, args.port)
+    print(f"BW加密服务替身已启动: http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,99 @@
+"""
+命令行启动耗时检查
+
+用 python -X importtime 运行 main.py 的子命令，统计项目自身引入的导入耗时，
+超过预算或导入了重量级依赖时返回非零退出码
+
+click 和 loguru 是每个子命令都必须导入的框架依赖（loguru 自身会导入 asyncio、
+multiprocessing 等标准库，合计约 100ms，随机器浮动较大），项目代码无法推迟，
+因此单独测量这部分"框架底座"并从预算中扣除，预算只约束项目模块和按需导入的依赖
+
+用法: python examples/check_startup.py --budget-ms 50 list-tasks
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 只读命令不应导入的重量级依赖
+HEAVY_MODULES = ("curl_cffi", "Crypto", "yaml", "requests")
+
+# 每个子命令都要导入的框架依赖，单独计时，不计入预算
+FRAMEWORK_IMPORTS = "import click, loguru"
+
+# 项目导入耗时预算：list-tasks 实测 config + core.scheduler 约 15ms，
+# 留出余量应对机器浮动和后续功能；超过 50ms 通常说明误导入了业务模块或文件日志
+DEFAULT_BUDGET_MS = 50
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(args):
+    """运行命令并解析 -X importtime 输出，返回 [(模块, 自身微秒, 累计微秒, 层级)]"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="命令行启动耗时检查")
+    parser.add_argument(
+        "--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="项目导入耗时预算"
+    )
+    parser.add_argument("command", nargs="*", default=["list-tasks"], help="子命令")
+    args = parser.parse_args()
+
+    baseline = {name for name, *_ in import_times(["-c", "pass"])}
+    framework = [
+        e for e in import_times(["-c", FRAMEWORK_IMPORTS]) if e[0] not in baseline
+    ]
+    framework_names = {e[0] for e in framework}
+    framework_ms = sum(e[2] for e in framework if e[3] == 0) / 1000
+
+    started = time.perf_counter()
+    entries = import_times(["main.py", *args.command])
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    # 顶层导入的累计耗时之和，即项目引入的导入耗时（框架底座已导入的模块不会重复出现）
+    own = [e for e in entries if e[0] not in baseline and e[0] not in framework_names]
+    total_ms = sum(e[2] for e in own if e[3] == 0) / 1000
+    heavy = sorted(
+        {e[0] for e in own if e[0].split(".")[0] in HEAVY_MODULES and "." not in e[0]}
+    )
+
+    print(f"命令: main.py {' '.join(args.command)}")
+    print(f"进程耗时: {wall_ms:.1f}ms，框架底座(click+loguru): {framework_ms:.1f}ms")
+    print(f"项目导入耗时: {total_ms:.1f}ms (预算 {args.budget_ms:.0f}ms)")
+    print("耗时最多的顶层导入:")
+    for name, _, cumulative, _ in sorted(
+        (e for e in own if e[3] == 0), key=lambda e: e[2], reverse=True
+    )[:8]:
+        print(f"  {cumulative / 1000:8.1f}ms  {name}")
+
+    failed = False
+    if heavy:
+        print(f"导入了重量级依赖: {', '.join(heavy)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print("超出导入耗时预算")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
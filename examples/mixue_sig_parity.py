@@ -0,0 +1,123 @@
+"""
+蜜雪冰城签名一致性校验与基准
+
+用随机输入对比 utils.mixue_sig 与 Node.js 执行 js/mixue.js 的 get_sig 结果，
+并报告纯Python实现的单次签名耗时（需要安装Node.js）
+
+用法: python examples/mixue_sig_parity.py --count 5000
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.mixue_sig import get_sig  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIRM_URL = "https://mxsa.mxbc.net/api/v1/h5/marketing/secretword/confirm"
+
+# 在 mixue.js 之后追加：固定 getTime 的返回值，逐条计算签名
+NODE_DRIVER = """
+const inputs = JSON.parse(require("fs").readFileSync(0, "utf-8"));
+const results = inputs.map(([url, stamp]) => {
+    Date.prototype.getTime = () => stamp;
+    return get_sig(url);
+});
+process.stdout.write("\\n" + JSON.stringify(results));
+"""
+
+WORDS = "茉莉奶绿销量突破万杯蜜雪冰城甜蜜蜜你爱我我爱你柠檬水珍珠奶茶"
+
+
+def random_input(rng: random.Random):
+    """生成与真实请求结构相同的随机输入"""
+    stamp = rng.randint(1_600_000_000_000, 1_900_000_000_000)
+    secret_word = "".join(rng.choice(WORDS) for _ in range(rng.randint(1, 16)))
+    if rng.random() < 0.3:
+        # 混入ASCII、保留字符和补充平面字符
+        secret_word += "".join(
+            rng.choice("abcXYZ019 !'()*-._~&=?/#%+,\"😀") for _ in range(6)
+        )
+    body = json.dumps(
+        {
+            "marketingId": str(rng.randint(10**18, 10**19 - 1)),
+            "round": f"{rng.randint(0, 23):02d}:{rng.choice(['00', '30'])}",
+            "secretword": secret_word,
+            "sign": "%032x" % rng.getrandbits(128),
+            "s": 2,
+            "stamp": stamp,
+        },
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return f"{CONFIRM_URL}{body}", stamp
+
+
+def run_node(inputs):
+    """在单个Node进程中计算所有输入的签名"""
+    with open(os.path.join(ROOT, "js", "mixue.js"), encoding="utf-8") as f:
+        script = f.read() + NODE_DRIVER
+    with tempfile.NamedTemporaryFile(
+        mode="w", suffix=".js", delete=False, encoding="utf-8"
+    ) as temp_file:
+        temp_file.write(script)
+        script_path = temp_file.name
+    try:
+        result = subprocess.run(
+            ["node", script_path],
+            input=json.dumps(inputs, ensure_ascii=False),
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            timeout=120,
+            check=True,
+        )
+    finally:
+        os.unlink(script_path)
+    # mixue.js 末尾会打印示例签名，结果在最后一行
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="蜜雪冰城签名一致性校验与基准")
+    parser.add_argument("--count", type=int, default=5000, help="随机输入数量")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    inputs = [random_input(rng) for _ in range(args.count)]
+
+    expected = run_node(inputs)
+    mismatches = [
+        (url, stamp, want)
+        for (url, stamp), want in zip(inputs, expected)
+        if get_sig(url, stamp) != want
+    ]
+    if mismatches:
+        url, stamp, want = mismatches[0]
+        print(f"不一致 {len(mismatches)}/{args.count}，示例: {url} @ {stamp}")
+        print(f"  node:   {want}")
+        print(f"  python: {get_sig(url, stamp)}")
+        sys.exit(1)
+    print(f"一致性校验通过: {args.count} 个输入")
+
+    start = time.perf_counter()
+    for url, stamp in inputs:
+        get_sig(url, stamp)
+    elapsed = (time.perf_counter() - start) / args.count
+    print(f"Python签名: {elapsed * 1e6:.1f} µs/次")
+
+    start = time.perf_counter()
+    run_node(inputs[:1])
+    print(f"Node子进程单次调用: {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
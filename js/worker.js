@@ -0,0 +1,89 @@
+/*
+ * 常驻JavaScript执行进程
+ *
+ * 用法: node js/worker.js <script.js> [cache_dir]
+ *
+ * 加载脚本时使用V8代码缓存（cache_dir/<name>.<hash>.bin，hash 由脚本内容和
+ * Node版本决定，脚本变化后自动重建），加载完成后输出一行 ready 消息报告冷启动耗时，
+ * 之后逐行读取 {"fn": ..., "args": [...]} 请求，输出 {"result": ...} 或 {"error": ...}
+ */
+
+const fs = require("fs");
+const path = require("path");
+const vm = require("vm");
+const crypto = require("crypto");
+const readline = require("readline");
+
+const loadStarted = process.hrtime.bigint();
+const scriptPath = path.resolve(process.argv[2]);
+const cacheDir = process.argv[3] || path.join(path.dirname(scriptPath), ".v8cache");
+
+const source = fs.readFileSync(scriptPath, "utf-8");
+const hash = crypto
+    .createHash("sha256")
+    .update(source)
+    .update(process.version)
+    .digest("hex")
+    .slice(0, 16);
+const name = path.basename(scriptPath, ".js");
+const cacheFile = path.join(cacheDir, `${name}.${hash}.bin`);
+
+let cachedData;
+try {
+    cachedData = fs.readFileSync(cacheFile);
+} catch (e) {
+    cachedData = undefined;
+}
+
+const script = new vm.Script(source, { filename: scriptPath, cachedData });
+let cache = "miss";
+if (cachedData) {
+    cache = script.cachedDataRejected ? "rejected" : "hit";
+}
+
+// stdout 只用于协议消息，脚本自身的输出转到 stderr
+console.log = (...args) => console.error(...args);
+script.runInThisContext();
+
+if (cache !== "hit") {
+    // 在脚本执行后生成缓存，包含已经编译过的函数
+    try {
+        fs.mkdirSync(cacheDir, { recursive: true });
+        for (const file of fs.readdirSync(cacheDir)) {
+            if (file.startsWith(`${name}.`) && file !== path.basename(cacheFile)) {
+                fs.unlinkSync(path.join(cacheDir, file));
+            }
+        }
+        const temp = `${cacheFile}.${process.pid}`;
+        fs.writeFileSync(temp, script.createCachedData());
+        fs.renameSync(temp, cacheFile);
+    } catch (e) {
+        console.error(`写入代码缓存失败: ${e}`);
+    }
+}
+
+function reply(message) {
+    process.stdout.write(JSON.stringify(message) + "\n");
+}
+
+reply({
+    ready: true,
+    cache,
+    load_ms: Number(process.hrtime.bigint() - loadStarted) / 1e6,
+    startup_ms: process.uptime() * 1000,
+});
+
+const lines = readline.createInterface({ input: process.stdin });
+lines.on("line", (line) => {
+    try {
+        const request = JSON.parse(line);
+        const fn = globalThis[request.fn];
+        if (typeof fn !== "function") {
+            throw new Error(`未定义的函数: ${request.fn}`);
+        }
+        reply({ result: fn(...(request.args || [])) });
+    } catch (e) {
+        reply({ error: String(e) });
+    }
+});
+lines.on("close", () => process.exit(0));
@@ -17,40 +17,10 @@ from loguru import logger
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from core.seckill import SeckillManager
-from core.scheduler import SeckillScheduler
-from config import ConfigManager
+from utils.log import setup_file_logging, setup_logging  # noqa: E402
 
-
-def setup_logging(verbose: bool = False):
-    """设置日志"""
-    logger.remove()
-
-    level = "DEBUG" if verbose else "INFO"
-    format_str = (
-        "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | "
-        "<level>{level: <8}</level> | "
-        "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
-        "<level>{message}</level>"
-    )
-
-    # 输出到控制台
-    logger.add(sys.stdout, format=format_str, level=level)
-
-    # 确保logs目录存在
-    logs_dir = Path("logs")
-    logs_dir.mkdir(exist_ok=True)
-    
-    # 输出到文件, 每天一个文件 - 使用绝对路径
-    log_file_path = logs_dir / "seckill_{time:YYYY-MM-DD}.log"
-    logger.add(
-        str(log_file_path),
-        format=format_str,
-        level=level,
-        rotation="1 day",
-        retention="10 days",
-        enqueue=True
-    )
+# 业务模块依赖 curl_cffi、pycryptodome、requests 等较重的库，
+# 只在需要它们的子命令中导入，保证 list-tasks 等命令快速启动
 
 
 def ensure_configs_dir():
@@ -103,9 +73,12 @@ def cli(ctx, verbose):
 @click.pass_context
 def seckill(ctx, config):
     """运行秒杀任务"""
+    setup_file_logging(ctx.obj["verbose"])
     config_path = get_config_path(config)
 
     try:
+        from core.seckill import SeckillManager
+
         logger.info(f"加载配置文件: {config_path}")
         manager = SeckillManager(config_file=config_path)
         manager.run()
@@ -117,20 +90,76 @@ def seckill(ctx, config):
 @cli.command()
 @click.option(
     "--mode",
-    type=click.Choice(["watch", "now", "hour"]),
+    type=click.Choice(["watch", "daemon", "now", "hour"]),
     default="watch",
     help="运行模式",
 )
 @click.option("--hour", help="指定运行小时 (HH格式)")
+@click.option(
+    "--lead-time",
+    type=float,
+    default=60.0,
+    show_default=True,
+    help="任务未设置 lead_time 时的默认预热提前量（秒）",
+)
+@click.option(
+    "--max-concurrent",
+    type=int,
+    default=4,
+    show_default=True,
+    help="同时运行的任务进程上限",
+)
+@click.option(
+    "--pool-size",
+    type=int,
+    default=2,
+    show_default=True,
+    help="监视模式下预启动的空闲工作进程数，0 表示不预启动",
+)
+@click.option(
+    "--control-socket",
+    default="run/scheduler.sock",
+    show_default=True,
+    help="监视/守护模式下控制接口的 Unix 域套接字路径",
+)
+@click.option("--no-control", is_flag=True, help="不启用控制接口")
+@click.option(
+    "--task-timeout",
+    type=float,
+    default=300.0,
+    show_default=True,
+    help="任务未设置 timeout 时的运行窗口（秒），开始时间之后超时的任务连同子进程一起结束",
+)
 @click.pass_context
-def scheduler(ctx, mode, hour):
+def scheduler(
+    ctx,
+    mode,
+    hour,
+    lead_time,
+    max_concurrent,
+    pool_size,
+    control_socket,
+    no_control,
+    task_timeout,
+):
     """运行调度器"""
+    setup_file_logging(ctx.obj["verbose"])
     try:
-        scheduler = SeckillScheduler()
+        from core.scheduler import SeckillScheduler
+
+        scheduler = SeckillScheduler(
+            lead_time=lead_time,
+            max_concurrent=max_concurrent,
+            pool_size=pool_size,
+            control_socket=None if no_control else control_socket,
+            task_timeout=task_timeout,
+        )
 
         if mode == "watch":
             logger.info("启动监视模式")
             scheduler.watch_mode()
+        elif mode == "daemon":
+            scheduler.daemon_mode()
         elif mode == "hour" and hour:
             logger.info(f"运行 {hour} 点的任务")
             scheduler.run_hour_tasks(hour)
@@ -145,14 +174,69 @@ def scheduler(ctx, mode, hour):
         sys.exit(1)
 
 
+def validate_all(workers: int) -> bool:
+    """并行验证configs目录下的所有配置文件，返回是否全部有效"""
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    from config import ConfigManager
+
+    config_manager = ConfigManager()
+    files = sorted(
+        p
+        for pattern in ("*.json", "*.yaml", "*.yml")
+        for p in ensure_configs_dir().rglob(pattern)
+        if "__configcache__" not in p.parts
+    )
+
+    def check(path: Path):
+        started = time.perf_counter()
+        kind, errors = config_manager.check_config_file(str(path))
+        return path, kind, errors, (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(check, files))
+    elapsed = (time.perf_counter() - started) * 1000
+
+    failed = 0
+    for path, kind, errors, cost in results:
+        if kind == "unknown" and not errors:
+            logger.info(f"跳过 {path} ({cost:.1f}ms): 无法识别的配置类型")
+        elif errors:
+            failed += 1
+            logger.error(f"失败 {path} [{kind}] ({cost:.1f}ms): {len(errors)} 个错误")
+            for error in errors:
+                logger.error(f"    {error}")
+        else:
+            logger.info(f"通过 {path} [{kind}] ({cost:.1f}ms)")
+
+    logger.info(f"共 {len(results)} 个文件，失败 {failed} 个，总耗时 {elapsed:.1f}ms")
+    return failed == 0
+
+
 @cli.command()
-@click.option("--config", "-c", required=True, help="配置文件名称（在configs目录下）")
+@click.option("--config", "-c", help="配置文件名称（在configs目录下）")
+@click.option(
+    "--all", "validate_all_files", is_flag=True, help="验证configs目录下的所有配置文件"
+)
+@click.option("--workers", default=8, show_default=True, help="--all 模式的并行数")
 @click.pass_context
-def validate(ctx, config):
+def validate(ctx, config, validate_all_files, workers):
     """验证配置文件"""
+    if validate_all_files:
+        if not validate_all(workers):
+            sys.exit(1)
+        return
+
+    if not config:
+        raise click.UsageError("请通过 --config 指定配置文件，或使用 --all")
+
     config_path = get_config_path(config)
 
     try:
+        from config import ConfigManager
+
         config_manager = ConfigManager()
         config_obj = config_manager.load_seckill_config(config_path)
 
@@ -186,6 +270,8 @@ def create_config(ctx, name, category):
         config_path = config_path.with_suffix(".json")
 
     try:
+        from config import ConfigManager
+
         config_manager = ConfigManager()
         success = config_manager.create_default_config(str(config_path))
 
@@ -200,6 +286,28 @@ def create_config(ctx, name, category):
         sys.exit(1)
 
 
+def log_tasks(all_tasks):
+    """输出 list_all_tasks 格式的任务列表"""
+    for group, tasks in sorted(all_tasks.items()):
+        logger.info(
+            f"=== {group} 点的任务 ===" if group.isdigit() else f"=== {group} ==="
+        )
+        for task in tasks:
+            status = "启用" if task["enabled"] else "禁用"
+            logger.info(f"  {task['index']}: {task['description']} ({status})")
+            if task.get("cron"):
+                logger.info(f"      规则: {task['cron']} (偏移 {task['offset']:g} 秒)")
+            else:
+                logger.info(f"      时间: {task['start_time']}")
+            if task.get("start_date") or task.get("end_date"):
+                logger.info(
+                    f"      日期: {task.get('start_date') or '-'} ~ "
+                    f"{task.get('end_date') or '-'}"
+                )
+            logger.info(f"      配置: {task['config_file']}")
+            logger.info(f"      下次: {task['next_fire'] or '-'}")
+
+
 @cli.command()
 @click.pass_context
 def list_tasks(ctx):
@@ -214,19 +322,158 @@ def list_tasks(ctx):
             logger.info("没有配置任何任务")
             return
 
-        for hour, tasks in all_tasks.items():
-            logger.info(f"=== {hour} 点的任务 ===")
-            for task in tasks:
-                status = "启用" if task["enabled"] else "禁用"
-                logger.info(f"  {task['index']}: {task['description']} ({status})")
-                logger.info(f"      时间: {task['start_time']}")
-                logger.info(f"      配置: {task['config_file']}")
+        log_tasks(all_tasks)
 
     except Exception as e:
         logger.error(f"列出任务失败: {e}")
         sys.exit(1)
 
 
+@cli.group()
+@click.option(
+    "--socket",
+    "socket_path",
+    default="run/scheduler.sock",
+    show_default=True,
+    help="调度器控制接口的 Unix 域套接字路径",
+)
+@click.pass_context
+def ctl(ctx, socket_path):
+    """管理运行中的调度器（监视/守护模式）"""
+    ctx.obj["socket_path"] = socket_path
+
+
+def send_control(ctx, command: str, **args):
+    """发送控制命令，失败时退出"""
+    from core.scheduler.control import ControlError, send_command
+
+    try:
+        return send_command(command, socket_path=ctx.obj["socket_path"], **args)
+    except ControlError as e:
+        logger.error(f"控制命令失败: {e}")
+        sys.exit(1)
+
+
+@ctl.command("status")
+@click.pass_context
+def ctl_status(ctx):
+    """查看调度器状态"""
+    status = send_control(ctx, "status")
+    logger.info(f"模式: {status['mode']} (pid={status['pid']})")
+    logger.info(f"启动时间: {status['started_at']}，已运行 {status['uptime']:.0f} 秒")
+    logger.info(
+        f"调度配置: {status['schedule_file']}，队列中 {status['queued']} 个任务"
+    )
+    logger.info(
+        f"运行中: {len(status['running'])}/{status['max_concurrent']} "
+        f"{', '.join(status['running'])}"
+    )
+    if status["idle_workers"] is not None:
+        logger.info(f"空闲工作进程: {status['idle_workers']}")
+
+
+@ctl.command("list")
+@click.pass_context
+def ctl_list(ctx):
+    """列出调度器中的任务"""
+    all_tasks = send_control(ctx, "list")
+    if not all_tasks:
+        logger.info("没有配置任何任务")
+        return
+    log_tasks(all_tasks)
+
+
+@ctl.command("next")
+@click.option(
+    "--count", "-n", default=5, show_default=True, help="显示的运行数，0 表示不限"
+)
+@click.option("--within", "-w", type=float, help="只显示接下来多少秒内开始的运行")
+@click.pass_context
+def ctl_next(ctx, count, within):
+    """查看接下来的运行（同一任务的多次运行分别列出）"""
+    runs = send_control(ctx, "next", count=count or None, within=within)
+    if not runs:
+        logger.info("没有计划中的任务")
+    for run in runs:
+        logger.info(
+            f"{run['fire_at']} (启动 {run['launch_at']}) "
+            f"{run['hour']}:{run['index']} {run['description'] or run['config_file']}"
+        )
+
+
+@ctl.command("add")
+@click.option("--start-time", "-t", help="每天的开始时间 (HH:MM:SS.fff)")
+@click.option("--cron", help='cron 规则 (分 时 日 月 周)，如 "0 10 * * 1-5"')
+@click.option(
+    "--offset", type=float, default=0.0, help="cron 任务相对整分钟的偏移（秒）"
+)
+@click.option("--start-date", help="生效开始日期 (YYYY-MM-DD)")
+@click.option("--end-date", help="生效结束日期 (YYYY-MM-DD)，含当天")
+@click.option("--config", "-c", "config_file", required=True, help="配置文件路径")
+@click.option(
+    "--hour", help="任务分组小时 (HH格式)，默认取开始时间的小时，cron 任务为 tasks"
+)
+@click.option("--description", "-d", default="", help="任务描述")
+@click.option("--lead-time", type=float, help="预热提前量（秒）")
+@click.option("--timeout", type=float, help="运行窗口（秒）")
+@click.option("--disabled", is_flag=True, help="添加为禁用状态")
+@click.pass_context
+def ctl_add(
+    ctx,
+    start_time,
+    cron,
+    offset,
+    start_date,
+    end_date,
+    config_file,
+    hour,
+    description,
+    lead_time,
+    timeout,
+    disabled,
+):
+    """向运行中的调度器添加任务，需要 --start-time 或 --cron"""
+    result = send_control(
+        ctx,
+        "add",
+        start_time=start_time,
+        cron=cron,
+        offset=offset,
+        start_date=start_date,
+        end_date=end_date,
+        config_file=config_file,
+        hour=hour,
+        description=description,
+        enabled=not disabled,
+        lead_time=lead_time,
+        timeout=timeout,
+    )
+    logger.info(
+        f"任务已添加: {result['hour']}:{result['index']}，"
+        f"下次开始时间 {result['fire_at'] or '-'}"
+    )
+
+
+@ctl.command("remove")
+@click.argument("hour")
+@click.argument("index", type=int)
+@click.pass_context
+def ctl_remove(ctx, hour, index):
+    """删除任务 (HOUR INDEX 见 ctl list)"""
+    result = send_control(ctx, "remove", hour=hour, index=index)
+    logger.info(f"任务已删除: {result['description'] or result['config_file']}")
+
+
+@ctl.command("trigger")
+@click.argument("hour")
+@click.argument("index", type=int)
+@click.pass_context
+def ctl_trigger(ctx, hour, index):
+    """立即启动任务 (HOUR INDEX 见 ctl list)"""
+    result = send_control(ctx, "trigger", hour=hour, index=index)
+    logger.info(f"任务已启动: {result['description'] or result['config_file']}")
+
+
 @cli.command()
 @click.pass_context
 def list_configs(ctx):
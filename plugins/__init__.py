@@ -0,0 +1,9 @@
+"""
+策略插件目录
+
+此目录下的模块或包通过模块级字典声明策略，发现阶段只解析源码读取声明，
+配置实际使用某个策略时才导入对应模块:
+
+    REQUEST_STRATEGIES = {"vendor": "VendorRequestStrategy"}
+    ENCRYPTION_STRATEGIES = {"vendor": "VendorEncryptionStrategy"}
+"""
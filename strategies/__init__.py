@@ -4,13 +4,22 @@
 包含加密策略和请求策略的实现
 """
 
-from .base import ISeckillStrategy, IEncryptionStrategy
+from .base import (
+    ISeckillStrategy,
+    IAsyncSeckillStrategy,
+    IEncryptionStrategy,
+    ResponseOutcome,
+    overlay_headers,
+)
 from .encryption import EncryptionStrategyManager
 from .request import RequestStrategyManager
 
 __all__ = [
     "ISeckillStrategy",
+    "IAsyncSeckillStrategy",
     "IEncryptionStrategy",
+    "ResponseOutcome",
+    "overlay_headers",
     "EncryptionStrategyManager",
     "RequestStrategyManager",
 ]
@@ -4,30 +4,66 @@
 定义所有策略的抽象接口
 """
 
+import asyncio
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Tuple, Optional
+from collections import ChainMap
+from enum import Enum
+from typing import Dict, Any, Tuple, Optional, Mapping, List
 from datetime import datetime
 import requests
 
 
+def overlay_headers(template: Mapping[str, str], **overrides: str) -> Mapping[str, str]:
+    """
+    在只读请求头模板之上叠加本次请求独有的字段
+
+    模板本身不会被修改，也不会整体复制，并发请求之间互不影响
+
+    Args:
+        template: 只读请求头模板
+        **overrides: 本次请求覆盖的请求头
+
+    Returns:
+        叠加后的请求头映射
+    """
+    return ChainMap(overrides, template)
+
+
+class ResponseOutcome(Enum):
+    """响应结果分类"""
+
+    SUCCESS = "success"  # 秒杀成功，停止请求
+    RETRY = "retry"  # 未成功，按计划继续请求
+    RETRY_AFTER_DELAY = "retry_after_delay"  # 服务器要求退避，顺延后续请求
+    TERMINAL = "terminal"  # 已无机会（已抢光、已领取等），立即停止请求
+
+
 class ISeckillStrategy(ABC):
     """秒杀策略接口"""
 
+    # 厂商响应消息中表示终止/需要退避的关键字，子类按需覆盖；
+    # 通用的终止关键字引用 core.seckill.classifier.TERMINAL_PATTERNS，只补充厂商特有的部分
+    TERMINAL_KEYWORDS: Tuple[str, ...] = ()
+    RETRY_AFTER_DELAY_KEYWORDS: Tuple[str, ...] = ()
+    # 需要退避时顺延后续请求的秒数
+    retry_delay: float = 0.5
+
     @abstractmethod
     def prepare_request(
         self,
         current_time: datetime,
         data: Dict[str, Any],
-        headers: Dict[str, str],
+        headers: Mapping[str, str],
         base_url: str,
-    ) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+    ) -> Tuple[str, Dict[str, Any], Mapping[str, str]]:
         """
         准备请求参数
 
         Args:
             current_time: 当前时间
             data: 请求数据
-            headers: 请求头
+            headers: 只读请求头模板，需要改写时使用 overlay_headers 叠加
             base_url: 基础URL
 
         Returns:
@@ -48,6 +84,128 @@ class ISeckillStrategy(ABC):
         """
         pass
 
+    def classify_status(self, status_code: int) -> Optional[ResponseOutcome]:
+        """
+        只按HTTP状态码分类，在解析响应内容之前调用，非JSON的限流页面也能识别
+
+        Args:
+            status_code: HTTP状态码
+
+        Returns:
+            响应结果分类，无法判定时返回 None
+        """
+        if status_code in (429, 503):
+            return ResponseOutcome.RETRY_AFTER_DELAY
+        return None
+
+    def classify_response(
+        self, status_code: int, message: str
+    ) -> Optional[ResponseOutcome]:
+        """
+        按厂商规则对未成功的响应分类
+
+        Args:
+            status_code: HTTP状态码
+            message: 响应消息
+
+        Returns:
+            响应结果分类，无法判定时返回 None
+        """
+        outcome = self.classify_status(status_code)
+        if outcome is not None:
+            return outcome
+        if any(keyword in message for keyword in self.TERMINAL_KEYWORDS):
+            return ResponseOutcome.TERMINAL
+        if any(keyword in message for keyword in self.RETRY_AFTER_DELAY_KEYWORDS):
+            return ResponseOutcome.RETRY_AFTER_DELAY
+        return None
+
+
+# 同步入口在调用方线程中驱动策略的事件循环，同一时刻只允许一个调用
+_SYNC_LOCK = threading.Lock()
+
+
+class IAsyncSeckillStrategy(ISeckillStrategy):
+    """
+    异步秒杀策略接口
+
+    签名或解析需要访问网络、子进程等耗时操作的策略实现此接口，
+    执行器会直接在事件循环中 await，同步策略则自动放到线程池中执行
+    """
+
+    @abstractmethod
+    async def prepare_request_async(
+        self,
+        current_time: datetime,
+        data: Dict[str, Any],
+        headers: Mapping[str, str],
+        base_url: str,
+    ) -> Tuple[str, Dict[str, Any], Mapping[str, str]]:
+        """
+        异步准备请求参数
+
+        Args:
+            current_time: 当前时间
+            data: 请求数据
+            headers: 只读请求头模板，需要改写时使用 overlay_headers 叠加
+            base_url: 基础URL
+
+        Returns:
+            (url, data, headers) 元组
+        """
+        pass
+
+    async def process_response_async(
+        self, response: requests.Response
+    ) -> Dict[str, Any]:
+        """
+        异步处理响应数据，默认直接调用同步实现
+
+        Args:
+            response: HTTP响应对象
+
+        Returns:
+            处理后的响应数据
+        """
+        return self.process_response(response)
+
+    async def prefetch(
+        self, planned_times: List[datetime], data: Dict[str, Any]
+    ) -> None:
+        """
+        在开始时间之前为计划发送时间预先准备请求（如远程签名），默认不做处理
+
+        Args:
+            planned_times: 计划发送时间
+            data: 请求数据
+        """
+        pass
+
+    async def close(self) -> None:
+        """释放策略持有的连接等资源，默认不做处理"""
+        pass
+
+    def prepare_request(
+        self,
+        current_time: datetime,
+        data: Dict[str, Any],
+        headers: Mapping[str, str],
+        base_url: str,
+    ) -> Tuple[str, Dict[str, Any], Mapping[str, str]]:
+        """
+        在事件循环之外调用时的同步入口
+
+        每个策略对象复用同一个事件循环，绑定在循环上的长连接在多次调用之间保留，
+        不会每次调用都新建一批连接
+        """
+        with _SYNC_LOCK:
+            loop = getattr(self, "_sync_loop", None)
+            if loop is None or loop.is_closed():
+                loop = self._sync_loop = asyncio.new_event_loop()
+            return loop.run_until_complete(
+                self.prepare_request_async(current_time, data, headers, base_url)
+            )
+
 
 class IEncryptionStrategy(ABC):
     """加密策略接口"""
@@ -0,0 +1,150 @@
+"""
+策略插件发现
+
+从 Python entry points 和 plugins/ 目录发现第三方策略。发现阶段只读取元数据，
+不导入插件模块，配置实际用到某个策略时才由注册表导入
+"""
+
+import ast
+import os
+from functools import lru_cache
+from importlib import metadata
+from typing import Dict
+
+from loguru import logger
+
+# entry point 分组，值为 "模块:类名"
+REQUEST_ENTRY_POINT_GROUP = "seckill_milk.request_strategies"
+ENCRYPTION_ENTRY_POINT_GROUP = "seckill_milk.encryption_strategies"
+
+# plugins/ 目录下模块中声明策略的模块级变量，值为 {策略名称: 类名}
+REQUEST_PLUGIN_VARIABLE = "REQUEST_STRATEGIES"
+ENCRYPTION_PLUGIN_VARIABLE = "ENCRYPTION_STRATEGIES"
+
+PLUGINS_PACKAGE = "plugins"
+PLUGINS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), PLUGINS_PACKAGE
+)
+
+
+def discover_entry_points(group: str) -> Dict[str, str]:
+    """
+    读取已安装发行包声明的策略 entry points
+
+    Args:
+        group: entry point 分组
+
+    Returns:
+        {策略名称: "模块:类名"}
+    """
+    try:
+        eps = metadata.entry_points()
+    except Exception as e:
+        logger.warning(f"读取策略插件元数据失败: {e}")
+        return {}
+
+    if hasattr(eps, "select"):
+        selected = eps.select(group=group)
+    else:  # Python < 3.10
+        selected = eps.get(group, [])
+    return {ep.name: ep.value for ep in selected}
+
+
+def _read_plugin_declaration(path: str, variable: str) -> Dict[str, str]:
+    """解析插件模块源码，读取模块级的策略声明而不执行模块"""
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            targets, value = node.targets, node.value
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            targets, value = [node.target], node.value
+        else:
+            continue
+        if any(isinstance(t, ast.Name) and t.id == variable for t in targets):
+            declared = ast.literal_eval(value)
+            if not isinstance(declared, dict):
+                raise ValueError(f"{variable} 必须是字典")
+            return {str(k): str(v) for k, v in declared.items()}
+    return {}
+
+
+def discover_plugin_dir(
+    variable: str, plugins_dir: str = PLUGINS_DIR, package: str = PLUGINS_PACKAGE
+) -> Dict[str, str]:
+    """
+    扫描 plugins/ 目录下的模块和包声明的策略
+
+    Args:
+        variable: 声明策略的模块级变量名
+        plugins_dir: 插件目录
+        package: 插件目录对应的包名
+
+    Returns:
+        {策略名称: "模块:类名"}
+    """
+    if not os.path.isdir(plugins_dir):
+        return {}
+
+    found: Dict[str, str] = {}
+    for entry in sorted(os.listdir(plugins_dir)):
+        full = os.path.join(plugins_dir, entry)
+        if entry.endswith(".py") and entry != "__init__.py":
+            module, path = f"{package}.{entry[:-3]}", full
+        elif os.path.isfile(os.path.join(full, "__init__.py")):
+            module, path = f"{package}.{entry}", os.path.join(full, "__init__.py")
+        else:
+            continue
+
+        try:
+            declared = _read_plugin_declaration(path, variable)
+        except (OSError, SyntaxError, ValueError) as e:
+            logger.warning(f"读取插件声明失败: {path}: {e}")
+            continue
+
+        for name, target in declared.items():
+            found[name] = target if ":" in target else f"{module}:{target}"
+    return found
+
+
+@lru_cache(maxsize=None)
+def _discover(group: str, variable: str) -> Dict[str, str]:
+    found = discover_plugin_dir(variable)
+    found.update(discover_entry_points(group))
+    return found
+
+
+def discover_strategies(group: str, variable: str) -> Dict[str, str]:
+    """
+    发现第三方策略，entry points 优先于 plugins/ 目录中的同名声明
+
+    Args:
+        group: entry point 分组
+        variable: plugins/ 模块中声明策略的变量名
+
+    Returns:
+        {策略名称: "模块:类名"}
+    """
+    return dict(_discover(group, variable))
+
+
+def merge_plugins(builtin: Dict[str, str], group: str, variable: str) -> Dict[str, str]:
+    """
+    合并内置策略和发现的插件策略，插件不能覆盖内置策略
+
+    Args:
+        builtin: 内置策略
+        group: entry point 分组
+        variable: plugins/ 模块中声明策略的变量名
+
+    Returns:
+        合并后的 {策略名称: 工厂}
+    """
+    merged = dict(builtin)
+    for name, target in discover_strategies(group, variable).items():
+        if name.lower() in merged:
+            logger.warning(f"插件策略与内置策略同名，已忽略: {name} ({target})")
+            continue
+        merged[name.lower()] = target
+    return merged
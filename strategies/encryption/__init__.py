@@ -2,18 +2,30 @@
 加密策略模块
 
 提供各种加密策略的实现
+
+导出的名称在首次访问时才导入对应模块
 """
 
-from .manager import EncryptionStrategyManager
-from .strategies import (
-    MixueEncryptionStrategy,
-    KuDiEncryptionStrategy,
-    DefaultEncryptionStrategy,
-)
-
-__all__ = [
-    "EncryptionStrategyManager",
-    "MixueEncryptionStrategy",
-    "KuDiEncryptionStrategy",
-    "DefaultEncryptionStrategy",
-]
+import importlib
+
+_LAZY_ATTRS = {
+    "EncryptionStrategyManager": ".manager",
+    "MixueEncryptionStrategy": ".strategies",
+    "KuDiEncryptionStrategy": ".strategies",
+    "DefaultEncryptionStrategy": ".strategies",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
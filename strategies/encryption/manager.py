@@ -8,22 +8,34 @@ from typing import Dict, Optional, Any
 from loguru import logger
 
 from ..base import IEncryptionStrategy
-from .strategies import (
-    DefaultEncryptionStrategy,
-    MixueEncryptionStrategy,
-    KuDiEncryptionStrategy,
+from ..discovery import (
+    ENCRYPTION_ENTRY_POINT_GROUP,
+    ENCRYPTION_PLUGIN_VARIABLE,
+    merge_plugins,
 )
+from ..registry import LazyStrategyRegistry, StrategyFactory
+
+_PACKAGE = "strategies.encryption.strategies"
+
+# 内置加密策略，首次使用时才导入和实例化
+BUILTIN_STRATEGIES: Dict[str, StrategyFactory] = {
+    "default": f"{_PACKAGE}.default:DefaultEncryptionStrategy",
+    "mixue": f"{_PACKAGE}.mixue:MixueEncryptionStrategy",
+    "kudi": f"{_PACKAGE}.kudi:KuDiEncryptionStrategy",
+}
 
 
 class EncryptionStrategyManager:
     """加密策略管理器"""
 
     def __init__(self):
-        self.strategies: Dict[str, IEncryptionStrategy] = {
-            "default": DefaultEncryptionStrategy(),
-            "mixue": MixueEncryptionStrategy({}),
-            "kudi": KuDiEncryptionStrategy({}),
-        }
+        # 内置策略和插件策略都只登记工厂，首次使用时才导入
+        factories = merge_plugins(
+            BUILTIN_STRATEGIES, ENCRYPTION_ENTRY_POINT_GROUP, ENCRYPTION_PLUGIN_VARIABLE
+        )
+        self.strategies: LazyStrategyRegistry[IEncryptionStrategy] = (
+            LazyStrategyRegistry(factories)
+        )
 
     def get_strategy(self, strategy_name: Optional[str]) -> IEncryptionStrategy:
         """
@@ -38,11 +50,12 @@ class EncryptionStrategyManager:
         if strategy_name is None:
             strategy_name = "default"
 
-        if strategy_name not in self.strategies:
+        strategy = self.strategies.get(strategy_name)
+        if strategy is None:
             logger.warning(f"未找到加密策略: {strategy_name}，使用默认策略")
-            return self.strategies["default"]
+            return self.strategies.get("default")
 
-        return self.strategies[strategy_name]
+        return strategy
 
     def register_strategy(self, name: str, strategy: IEncryptionStrategy):
         """
@@ -52,7 +65,7 @@ class EncryptionStrategyManager:
             name: 策略名称
             strategy: 策略实例
         """
-        self.strategies[name] = strategy
+        self.strategies.register_instance(name, strategy)
         logger.info(f"注册加密策略: {name}")
 
     def update_strategy_params(self, strategy_name: str, params: Dict[str, Any]):
@@ -63,9 +76,7 @@ class EncryptionStrategyManager:
             strategy_name: 策略名称
             params: 策略参数
         """
-        if strategy_name in self.strategies:
-            strategy_class = type(self.strategies[strategy_name])
-            self.strategies[strategy_name] = strategy_class(params)
+        if self.strategies.update_params(strategy_name, params):
             logger.info(f"更新策略参数: {strategy_name}")
         else:
             logger.warning(f"未找到策略: {strategy_name}")
@@ -77,4 +88,4 @@ class EncryptionStrategyManager:
         Returns:
             策略名称列表
         """
-        return list(self.strategies.keys())
+        return self.strategies.names()
@@ -2,14 +2,29 @@
 加密策略实现
 
 包含各种具体的加密策略实现
+
+导出的名称在首次访问时才导入对应模块
 """
 
-from .default import DefaultEncryptionStrategy
-from .mixue import MixueEncryptionStrategy
-from .kudi import KuDiEncryptionStrategy
+import importlib
+
+_LAZY_ATTRS = {
+    "DefaultEncryptionStrategy": ".default",
+    "MixueEncryptionStrategy": ".mixue",
+    "KuDiEncryptionStrategy": ".kudi",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = [
-    "DefaultEncryptionStrategy",
-    "MixueEncryptionStrategy",
-    "KuDiEncryptionStrategy",
-]
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
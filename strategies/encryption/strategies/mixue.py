@@ -11,6 +11,7 @@ from loguru import logger
 
 from strategies.base import IEncryptionStrategy
 from utils.js_executor import JavaScriptExecutor
+from utils.mixue_sig import get_sig
 
 
 class MixueEncryptionStrategy(IEncryptionStrategy):
@@ -18,8 +19,10 @@ class MixueEncryptionStrategy(IEncryptionStrategy):
 
     def __init__(self, params: Dict[str, Any] = None):
         self.params = params or {}
+        self.sig_backend = self.params.get("sig_backend") or "python"
         self.encryption_js = None
-        self._init_js_executor()
+        if self.sig_backend == "node":
+            self._init_js_executor()
 
     def _init_js_executor(self):
         """初始化JavaScript执行器"""
@@ -62,10 +65,12 @@ class MixueEncryptionStrategy(IEncryptionStrategy):
                 "stamp": timestamp,
             }
 
+            sig_url = f'https://mxsa.mxbc.net/api/v1/h5/marketing/secretword/confirm{{"marketingId":"{marketing_id}","round":"{round_num}","secretword":"{secret_word}","sign":"{sign}","s":2,"stamp":{timestamp}}}'
+            if self.sig_backend != "node":
+                encrypted_str = get_sig(sig_url)
             # 使用JavaScript执行器进行加密
-            if self.encryption_js and self.encryption_js.is_available():
-                encrypted_str = f'https://mxsa.mxbc.net/api/v1/h5/marketing/secretword/confirm{{"marketingId":"{marketing_id}","round":"{round_num}","secretword":"{secret_word}","sign":"{sign}","s":2,"stamp":{timestamp}}}'
-                encrypted_str = self.encryption_js.call("get_sig", encrypted_str)
+            elif self.encryption_js and self.encryption_js.is_available():
+                encrypted_str = self.encryption_js.call("get_sig", sig_url)
             else:
                 logger.warning("JavaScript执行器不可用，使用基础加密")
                 encrypted_str = f"mixue_encrypted_{timestamp}"
@@ -83,4 +88,6 @@ class MixueEncryptionStrategy(IEncryptionStrategy):
         Returns:
             是否可用
         """
+        if self.sig_backend != "node":
+            return True
         return self.encryption_js is not None and self.encryption_js.is_available()
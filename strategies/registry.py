@@ -0,0 +1,128 @@
+"""
+策略注册表
+
+按需导入和实例化策略，实例按 (名称, 参数) 缓存
+"""
+
+import importlib
+import json
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar, Union
+
+from loguru import logger
+
+T = TypeVar("T")
+
+# 策略工厂: 可调用对象，或 "模块:类名" 形式的导入路径
+StrategyFactory = Union[str, Callable[[Dict[str, Any]], Any]]
+
+
+def load_factory(factory: StrategyFactory) -> Callable[[Dict[str, Any]], Any]:
+    """
+    解析策略工厂，导入路径在此时才导入对应模块
+
+    Args:
+        factory: 策略工厂
+
+    Returns:
+        接收参数字典并返回策略实例的可调用对象
+    """
+    if callable(factory):
+        return factory
+    module_name, _, attr = factory.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def params_key(params: Optional[Dict[str, Any]]) -> str:
+    """策略参数的规范化表示，作为实例缓存键"""
+    return json.dumps(params or {}, sort_keys=True, ensure_ascii=False, default=str)
+
+
+class LazyStrategyRegistry(Generic[T]):
+    """按需实例化的策略注册表，策略名称不区分大小写"""
+
+    def __init__(self, factories: Dict[str, StrategyFactory]):
+        self._factories: Dict[str, StrategyFactory] = {}
+        self._params: Dict[str, Dict[str, Any]] = {}
+        self._instances: Dict[Tuple[str, str], T] = {}
+        for name, factory in factories.items():
+            self.register_factory(name, factory)
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        """规范化策略名称"""
+        return name.strip().lower()
+
+    def __contains__(self, name: str) -> bool:
+        return self.normalize(name) in self._factories
+
+    def register_factory(self, name: str, factory: StrategyFactory) -> None:
+        """
+        注册策略工厂，已缓存的同名实例失效
+
+        Args:
+            name: 策略名称
+            factory: 策略工厂
+        """
+        name = self.normalize(name)
+        self._factories[name] = factory
+        self._instances = {k: v for k, v in self._instances.items() if k[0] != name}
+
+    def register_instance(self, name: str, strategy: T) -> None:
+        """
+        注册已创建的策略实例，更新参数时按实例的类型重新创建
+
+        Args:
+            name: 策略名称
+            strategy: 策略实例
+        """
+        self.register_factory(name, type(strategy))
+        name = self.normalize(name)
+        params = dict(getattr(strategy, "params", None) or {})
+        self._params[name] = params
+        self._instances[(name, params_key(params))] = strategy
+
+    def get(self, name: str) -> Optional[T]:
+        """
+        获取策略实例，首次使用时才导入和实例化
+
+        Args:
+            name: 策略名称
+
+        Returns:
+            策略实例，未注册时返回 None
+        """
+        name = self.normalize(name)
+        factory = self._factories.get(name)
+        if factory is None:
+            return None
+
+        params = self._params.get(name, {})
+        key = (name, params_key(params))
+        strategy = self._instances.get(key)
+        if strategy is None:
+            strategy = load_factory(factory)(dict(params))
+            self._instances[key] = strategy
+            logger.debug(f"创建策略实例: {name}")
+        return strategy
+
+    def update_params(self, name: str, params: Dict[str, Any]) -> bool:
+        """
+        更新策略参数并实例化对应的策略
+
+        Args:
+            name: 策略名称
+            params: 策略参数
+
+        Returns:
+            策略是否存在
+        """
+        name = self.normalize(name)
+        if name not in self._factories:
+            return False
+        self._params[name] = dict(params or {})
+        self.get(name)
+        return True
+
+    def names(self) -> List[str]:
+        """已注册的策略名称"""
+        return list(self._factories)
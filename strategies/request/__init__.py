@@ -2,24 +2,33 @@
 请求策略模块
 
 提供各种请求策略的实现
+
+导出的名称在首次访问时才导入对应模块
 """
 
-from .manager import RequestStrategyManager
-from .strategies import (
-    DefaultRequestStrategy,
-    MixueRequestStrategy,
-    KuDiRequestStrategy,
-    JDRequestStrategy,
-    MTRequestStrategy,
-    BWRequestStrategy,
-)
-
-__all__ = [
-    "RequestStrategyManager",
-    "DefaultRequestStrategy",
-    "MixueRequestStrategy",
-    "KuDiRequestStrategy",
-    "JDRequestStrategy",
-    "MTRequestStrategy",
-    "BWRequestStrategy",
-]
+import importlib
+
+_LAZY_ATTRS = {
+    "RequestStrategyManager": ".manager",
+    "DefaultRequestStrategy": ".strategies",
+    "MixueRequestStrategy": ".strategies",
+    "KuDiRequestStrategy": ".strategies",
+    "JDRequestStrategy": ".strategies",
+    "MTRequestStrategy": ".strategies",
+    "BWRequestStrategy": ".strategies",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
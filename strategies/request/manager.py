@@ -8,28 +8,37 @@ from typing import Dict, Optional, Any
 from loguru import logger
 
 from ..base import ISeckillStrategy
-from .strategies import (
-    DefaultRequestStrategy,
-    MixueRequestStrategy,
-    KuDiRequestStrategy,
-    JDRequestStrategy,
-    MTRequestStrategy,
-    BWRequestStrategy,
+from ..discovery import (
+    REQUEST_ENTRY_POINT_GROUP,
+    REQUEST_PLUGIN_VARIABLE,
+    merge_plugins,
 )
+from ..registry import LazyStrategyRegistry, StrategyFactory
+
+_PACKAGE = "strategies.request.strategies"
+
+# 内置请求策略，首次使用时才导入和实例化
+BUILTIN_STRATEGIES: Dict[str, StrategyFactory] = {
+    "default": f"{_PACKAGE}.default:DefaultRequestStrategy",
+    "mixue": f"{_PACKAGE}.mixue:MixueRequestStrategy",
+    "kudi": f"{_PACKAGE}.kudi:KuDiRequestStrategy",
+    "jd": f"{_PACKAGE}.jd:JDRequestStrategy",
+    "mt": f"{_PACKAGE}.mt:MTRequestStrategy",
+    "bw": f"{_PACKAGE}.bw:BWRequestStrategy",
+}
 
 
 class RequestStrategyManager:
     """请求策略管理器"""
 
     def __init__(self):
-        self.strategies: Dict[str, ISeckillStrategy] = {
-            "default": DefaultRequestStrategy(),
-            "mixue": MixueRequestStrategy({}),
-            "kudi": KuDiRequestStrategy({}),
-            "jd": JDRequestStrategy(),
-            "mt": MTRequestStrategy({}),
-            "bw": BWRequestStrategy({}),
-        }
+        # 内置策略和插件策略都只登记工厂，首次使用时才导入
+        factories = merge_plugins(
+            BUILTIN_STRATEGIES, REQUEST_ENTRY_POINT_GROUP, REQUEST_PLUGIN_VARIABLE
+        )
+        self.strategies: LazyStrategyRegistry[ISeckillStrategy] = LazyStrategyRegistry(
+            factories
+        )
 
     def get_strategy(self, strategy_name: Optional[str]) -> ISeckillStrategy:
         """
@@ -44,10 +53,11 @@ class RequestStrategyManager:
         if strategy_name is None:
             strategy_name = "default"
 
-        if strategy_name not in self.strategies:
-            return self.strategies["default"]
+        strategy = self.strategies.get(strategy_name)
+        if strategy is None:
+            return self.strategies.get("default")
 
-        return self.strategies[strategy_name]
+        return strategy
 
     def register_strategy(self, name: str, strategy: ISeckillStrategy):
         """
@@ -57,7 +67,7 @@ class RequestStrategyManager:
             name: 策略名称
             strategy: 策略实例
         """
-        self.strategies[name] = strategy
+        self.strategies.register_instance(name, strategy)
         logger.info(f"注册请求策略: {name}")
 
     def update_strategy_params(self, strategy_name: str, params: Dict[str, Any]):
@@ -68,9 +78,7 @@ class RequestStrategyManager:
             strategy_name: 策略名称
             params: 策略参数
         """
-        if strategy_name in self.strategies:
-            strategy_class = type(self.strategies[strategy_name])
-            self.strategies[strategy_name] = strategy_class(params)
+        if self.strategies.update_params(strategy_name, params):
             logger.info(f"更新策略参数: {strategy_name}")
         else:
             logger.warning(f"未找到策略: {strategy_name}")
@@ -82,4 +90,4 @@ class RequestStrategyManager:
         Returns:
             策略名称列表
         """
-        return list(self.strategies.keys())
+        return self.strategies.names()
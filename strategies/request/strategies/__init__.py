@@ -2,20 +2,32 @@
 请求策略实现
 
 包含各种具体的请求策略实现
+
+导出的名称在首次访问时才导入对应模块
 """
 
-from .default import DefaultRequestStrategy
-from .mixue import MixueRequestStrategy
-from .kudi import KuDiRequestStrategy
-from .jd import JDRequestStrategy
-from .mt import MTRequestStrategy
-from .bw import BWRequestStrategy
-
-__all__ = [
-    "DefaultRequestStrategy",
-    "MixueRequestStrategy",
-    "KuDiRequestStrategy",
-    "JDRequestStrategy",
-    "MTRequestStrategy",
-    "BWRequestStrategy",
-]
+import importlib
+
+_LAZY_ATTRS = {
+    "DefaultRequestStrategy": ".default",
+    "MixueRequestStrategy": ".mixue",
+    "KuDiRequestStrategy": ".kudi",
+    "JDRequestStrategy": ".jd",
+    "MTRequestStrategy": ".mt",
+    "BWRequestStrategy": ".bw",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
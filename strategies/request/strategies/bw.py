@@ -4,67 +4,140 @@ BW请求策略
 实现BW的请求处理逻辑
 """
 
+import bisect
 import json
 import hashlib
 import base64
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, Mapping, List, Optional
 from datetime import datetime
 import requests
 from Crypto.Cipher import AES
 from Crypto.Util.Padding import pad
+from loguru import logger
 
-from strategies.base import ISeckillStrategy
+from core.seckill.classifier import TERMINAL_PATTERNS
+from strategies.base import IAsyncSeckillStrategy
+from .bw_client import BWEncryptClient
 
 
-class BWRequestStrategy(ISeckillStrategy):
+class BWRequestStrategy(IAsyncSeckillStrategy):
     """BW请求策略"""
 
+    TERMINAL_KEYWORDS = TERMINAL_PATTERNS
+    RETRY_AFTER_DELAY_KEYWORDS = ("频繁", "繁忙")
+
+    # 实际发送时间与预取时间戳的最大偏差（毫秒）
+    PREFETCH_TOLERANCE_MS = 100
+
     def __init__(self, params: Dict[str, Any] = None):
         self.params = params or {}
         self._current_kw_index = 0
-        self._key_words = self.params.get("bw_keywords", "")
-
-    def _get_current_keyword(self, keywords_str: str) -> str:
-        """获取当前关键词"""
-        keywords_list = [kw.strip() for kw in keywords_str.split(",")]
-        if self._current_kw_index >= len(keywords_list):
+        self._keywords = self._compile_keywords(self.params.get("bw_keywords", ""))
+        self._builder: Optional[_BWPayloadBuilder] = None
+        self._builder_key: Optional[Tuple] = None
+        self.encrypt_client = BWEncryptClient(
+            base_url=self.params.get("bw_encrypt_url") or BWEncryptClient.DEFAULT_URL,
+            timeout=self.params.get("bw_encrypt_timeout") or 2.0,
+            batch=self.params.get("bw_encrypt_batch", False),
+        )
+        # 预取的请求体，按计划时间戳排序
+        self._prefetched_stamps: List[int] = []
+        self._prefetched: Dict[int, Dict[str, Any]] = {}
+
+    def _compile_keywords(self, keywords_str: str) -> List[Tuple[str, str]]:
+        """预先拆分关键词，同时保存其JSON编码"""
+        return [
+            (kw, json.dumps(kw, ensure_ascii=False))
+            for kw in (kw.strip() for kw in keywords_str.split(","))
+        ]
+
+    def _next_keyword(self) -> Tuple[str, str]:
+        """按顺序轮换关键词"""
+        if self._current_kw_index >= len(self._keywords):
             self._current_kw_index = 0
-        kw = keywords_list[self._current_kw_index]
+        kw = self._keywords[self._current_kw_index]
         self._current_kw_index += 1
         return kw
 
-    def _build_signature(self, activity_id: str, user_id: str, timestamp: str) -> str:
-        """构建签名"""
-        key = activity_id[::-1]
-        signature_str = f"activityId={activity_id}&sellerId=49006&timestamp={timestamp}&userId={user_id}&key={key}"
-        return hashlib.md5(signature_str.encode("utf-8")).hexdigest().upper()
-
-    def _encrypt_request_data(self, request_data: Dict, key: str, iv: str) -> str:
-        """加密请求数据"""
-        json_data = json.dumps(request_data, ensure_ascii=False, separators=(",", ":"))
-        cipher = AES.new(key.encode(), AES.MODE_CBC, iv.encode())
-        padded_data = pad(json_data.encode("utf-8"), AES.block_size)
-        encrypted_data = cipher.encrypt(padded_data)
-        return base64.b64encode(encrypted_data).decode("utf-8")
-
-    def _get_encryption_params(self, process_data: Dict) -> str:
-        """获取加密参数"""
-        url = "http://192.168.31.186:3001/api/encrypt"
-        payload = json.dumps(process_data)
-        headers = {"Content-Type": "application/json"}
-        response = requests.post(url, headers=headers, data=payload)
-        params = response.json().get("data", {}).get("encrypted")
-        if not params:
-            raise ValueError("Encryption failed - no result returned")
-        return params
-
-    def prepare_request(
+    def _get_builder(self, data: Dict[str, Any]) -> "_BWPayloadBuilder":
+        """获取按用户数据预编译的请求体构造器"""
+        cache_key = tuple(
+            data.get(k) for k in ("activityId", "userId", "key", "iv", "version")
+        )
+        if self._builder is None or self._builder_key != cache_key:
+            self._builder = _BWPayloadBuilder(data)
+            self._builder_key = cache_key
+        return self._builder
+
+    def build_payloads(
+        self, timestamps: List[int], data: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        为一批时间戳构建加密后的请求体
+
+        Args:
+            timestamps: 毫秒时间戳
+            data: 请求数据
+
+        Returns:
+            请求体列表
+        """
+        builder = self._get_builder(data)
+        return [
+            builder.build(timestamp, *self._next_keyword()) for timestamp in timestamps
+        ]
+
+    def _build_process_data(self, timestamp: int, data: Dict[str, Any]) -> Dict:
+        """构建发送给加密服务和BW接口的请求体"""
+        return self._get_builder(data).build(timestamp, *self._next_keyword())
+
+    def _take_prefetched(self, timestamp: int) -> Optional[Dict[str, Any]]:
+        """取出与当前时间最接近的预取请求体，早于容差范围的预取结果不会再用到，一并丢弃"""
+        stale = bisect.bisect_left(
+            self._prefetched_stamps, timestamp - self.PREFETCH_TOLERANCE_MS
+        )
+        for stamp in self._prefetched_stamps[:stale]:
+            del self._prefetched[stamp]
+        del self._prefetched_stamps[:stale]
+        if not self._prefetched_stamps:
+            return None
+        index = bisect.bisect_left(self._prefetched_stamps, timestamp)
+        candidates = [
+            i for i in (index - 1, index) if 0 <= i < len(self._prefetched_stamps)
+        ]
+        best = min(
+            candidates, key=lambda i: abs(self._prefetched_stamps[i] - timestamp)
+        )
+        if abs(self._prefetched_stamps[best] - timestamp) > self.PREFETCH_TOLERANCE_MS:
+            return None
+        return self._prefetched.pop(self._prefetched_stamps.pop(best))
+
+    async def prefetch(
+        self, planned_times: List[datetime], data: Dict[str, Any]
+    ) -> None:
+        """
+        在开始时间之前为计划时间点预取加密参数
+
+        Args:
+            planned_times: 计划发送时间
+            data: 请求数据
+        """
+        timestamps = [int(t.timestamp() * 1000) for t in planned_times]
+        payloads = self.build_payloads(timestamps, data)
+        # 每次运行重新预取，守护模式下常驻的策略不保留之前运行的请求体
+        self._prefetched = dict(zip(timestamps, payloads))
+        self._prefetched_stamps = sorted(self._prefetched)
+
+        fetched = await self.encrypt_client.prefetch(payloads)
+        logger.info(f"BW预取加密参数: {fetched}/{len(payloads)}")
+
+    async def prepare_request_async(
         self,
         current_time: datetime,
         data: Dict[str, Any],
-        headers: Dict[str, str],
+        headers: Mapping[str, str],
         base_url: str,
-    ) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+    ) -> Tuple[str, Dict[str, Any], Mapping[str, str]]:
         """
         准备BW请求参数
 
@@ -77,33 +150,12 @@ class BWRequestStrategy(ISeckillStrategy):
         Returns:
             (url, data, headers) 元组
         """
-        kw = self._get_current_keyword(self._key_words)
-        activity_id = data.get("activityId")
-        signature = self._build_signature(
-            activity_id, data.get("userId"), str(current_time)
-        )
+        timestamp = int(current_time.timestamp() * 1000)
+        process_data = self._take_prefetched(timestamp)
+        if process_data is None:
+            process_data = self._build_process_data(timestamp, data)
 
-        request_data = {
-            "activityId": activity_id,
-            "keyWords": kw,
-            "qzGtd": "",
-            "gdtVid": "",
-            "appid": "wxafec6f8422cb357b",
-            "timestamp": current_time,
-            "signature": signature,
-        }
-
-        encrypted_data = self._encrypt_request_data(
-            request_data, data.get("key"), data.get("iv")
-        )
-
-        process_data = {
-            **request_data,
-            "data": encrypted_data,
-            "version": data.get("version"),
-        }
-
-        params = self._get_encryption_params(process_data)
+        params = await self.encrypt_client.encrypt(process_data)
         process_url = f"{base_url}?type__1475={params}"
         process_data = json.dumps(
             process_data, separators=(",", ":"), ensure_ascii=False
@@ -125,3 +177,71 @@ class BWRequestStrategy(ISeckillStrategy):
             return response.json()
         except Exception:
             return {"error": "响应解析失败", "text": response.text}
+
+    async def close(self) -> None:
+        """关闭加密服务连接"""
+        await self.encrypt_client.close()
+
+
+class _BWPayloadBuilder:
+    """
+    按用户数据预编译的BW请求体构造器
+
+    签名前缀的MD5状态、AES密钥/IV字节和请求体JSON骨架只计算一次，
+    每次请求只需补上时间戳和关键词
+    """
+
+    APPID = "wxafec6f8422cb357b"
+
+    def __init__(self, data: Dict[str, Any]):
+        activity_id = data.get("activityId")
+        self.activity_id = activity_id
+        self.version = data.get("version")
+
+        # 签名: md5(activityId=..&sellerId=49006&timestamp={ts}&userId=..&key=..)
+        self._sign_prefix = hashlib.md5(
+            f"activityId={activity_id}&sellerId=49006&timestamp=".encode("utf-8")
+        )
+        self._sign_suffix = (
+            f"&userId={data.get('userId')}&key={activity_id[::-1]}".encode("utf-8")
+        )
+
+        self._key = data.get("key").encode()
+        self._iv = data.get("iv").encode()
+
+        # 与 json.dumps(..., ensure_ascii=False, separators=(",", ":")) 输出一致
+        self._json_head = (
+            '{"activityId":'
+            + json.dumps(activity_id, ensure_ascii=False)
+            + ',"keyWords":'
+        )
+        self._json_middle = (
+            ',"qzGtd":"","gdtVid":"","appid":"' + self.APPID + '","timestamp":'
+        )
+
+    def build(self, timestamp: int, kw: str, kw_json: str) -> Dict[str, Any]:
+        """构建单个请求体"""
+        stamp = str(timestamp)
+        sign_hash = self._sign_prefix.copy()
+        sign_hash.update(stamp.encode("utf-8") + self._sign_suffix)
+        signature = sign_hash.hexdigest().upper()
+
+        plain = (
+            f"{self._json_head}{kw_json}{self._json_middle}{stamp}"
+            f',"signature":"{signature}"}}'
+        )
+        # CBC 加密对象有状态，每个请求体需要新的对象
+        cipher = AES.new(self._key, AES.MODE_CBC, self._iv)
+        encrypted = cipher.encrypt(pad(plain.encode("utf-8"), AES.block_size))
+
+        return {
+            "activityId": self.activity_id,
+            "keyWords": kw,
+            "qzGtd": "",
+            "gdtVid": "",
+            "appid": self.APPID,
+            "timestamp": timestamp,
+            "signature": signature,
+            "data": base64.b64encode(encrypted).decode("utf-8"),
+            "version": self.version,
+        }
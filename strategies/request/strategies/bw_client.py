@@ -0,0 +1,145 @@
+"""
+BW加密服务客户端
+
+复用长连接访问本地加密服务，带超时控制和结果缓存，支持批量预取
+"""
+
+import asyncio
+import json
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from curl_cffi import requests
+from loguru import logger
+
+
+class BWEncryptClient:
+    """BW加密服务客户端"""
+
+    DEFAULT_URL = "http://192.168.31.186:3001"
+    ENCRYPT_PATH = "/api/encrypt"
+    BATCH_PATH = "/api/encrypt/batch"
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_URL,
+        timeout: float = 2.0,
+        batch: bool = False,
+        cache_size: int = 256,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.batch = batch
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._session: Optional[requests.AsyncSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @staticmethod
+    def cache_key(payload: Dict[str, Any]) -> str:
+        """请求体的规范化表示，作为缓存键"""
+        return json.dumps(
+            payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+        )
+
+    def _get_session(self) -> requests.AsyncSession:
+        """获取绑定当前事件循环的长连接会话，事件循环变化时关闭旧会话"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._loop is not loop:
+            self._close_stale()
+            self._session = requests.AsyncSession()
+            self._loop = loop
+        return self._session
+
+    def _close_stale(self) -> None:
+        """
+        在旧会话所属的事件循环中关闭它
+
+        调用方运行在新的事件循环中，不能在这里驱动旧循环：旧循环在其他线程运行时立即关闭，
+        空闲时在它下次运行时关闭；旧循环已关闭时会话无法再关闭，只能放弃
+        """
+        session, loop = self._session, self._loop
+        self._session = self._loop = None
+        if session is None:
+            return
+        if loop.is_closed():
+            logger.debug("旧的加密服务会话所属的事件循环已关闭，放弃该会话")
+            return
+        asyncio.run_coroutine_threadsafe(session.close(), loop)
+
+    async def _post(self, path: str, payload: Any) -> Dict[str, Any]:
+        """向加密服务发送JSON请求"""
+        response = await self._get_session().post(
+            f"{self.base_url}{path}",
+            headers={"Content-Type": "application/json"},
+            data=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+            timeout=self.timeout,
+        )
+        return response.json()
+
+    def _remember(self, key: str, params: str) -> None:
+        """写入缓存，超出容量时淘汰最早的结果"""
+        self._cache[key] = params
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def encrypt(self, payload: Dict[str, Any]) -> str:
+        """
+        获取加密参数，命中缓存时不访问服务
+
+        Args:
+            payload: 待加密的请求体
+
+        Returns:
+            加密参数
+        """
+        key = self.cache_key(payload)
+        cached = self._cache.get(key)
+        if cached:
+            return cached
+
+        response = await self._post(self.ENCRYPT_PATH, payload)
+        params = response.get("data", {}).get("encrypted")
+        if not params:
+            raise ValueError("Encryption failed - no result returned")
+        self._remember(key, params)
+        return params
+
+    async def prefetch(self, payloads: List[Dict[str, Any]]) -> int:
+        """
+        预先获取一批请求体的加密参数并缓存
+
+        Args:
+            payloads: 待加密的请求体列表
+
+        Returns:
+            成功缓存的数量
+        """
+        if not payloads:
+            return 0
+
+        if self.batch:
+            response = await self._post(self.BATCH_PATH, {"items": payloads})
+            results = response.get("data", {}).get("encrypted") or []
+            fetched = 0
+            for payload, params in zip(payloads, results):
+                if params:
+                    self._remember(self.cache_key(payload), params)
+                    fetched += 1
+            return fetched
+
+        results = await asyncio.gather(
+            *(self.encrypt(payload) for payload in payloads), return_exceptions=True
+        )
+        failures = [r for r in results if isinstance(r, Exception)]
+        if failures:
+            logger.warning(f"预取加密参数失败 {len(failures)} 个: {failures[0]}")
+        return len(results) - len(failures)
+
+    async def close(self) -> None:
+        """关闭长连接"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            self._loop = None
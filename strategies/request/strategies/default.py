@@ -5,7 +5,7 @@
 """
 
 import json
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, Mapping
 from datetime import datetime
 import requests
 
@@ -22,9 +22,9 @@ class DefaultRequestStrategy(ISeckillStrategy):
         self,
         current_time: datetime,
         data: Dict[str, Any],
-        headers: Dict[str, str],
+        headers: Mapping[str, str],
         base_url: str,
-    ) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+    ) -> Tuple[str, Dict[str, Any], Mapping[str, str]]:
         """
         准备请求参数
 
@@ -4,16 +4,20 @@
 实现京东的请求处理逻辑
 """
 
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, Mapping
 from datetime import datetime
 import requests
 
+from core.seckill.classifier import TERMINAL_PATTERNS
 from strategies.base import ISeckillStrategy
 
 
 class JDRequestStrategy(ISeckillStrategy):
     """京东请求策略"""
 
+    TERMINAL_KEYWORDS = TERMINAL_PATTERNS + ("已经参加过", "别太贪心")
+    RETRY_AFTER_DELAY_KEYWORDS = ("火爆", "频繁")
+
     def __init__(self, params: Dict[str, Any] = None):
         self.params = params or {}
 
@@ -21,9 +25,9 @@ class JDRequestStrategy(ISeckillStrategy):
         self,
         current_time: datetime,
         data: Dict[str, Any],
-        headers: Dict[str, str],
+        headers: Mapping[str, str],
         base_url: str,
-    ) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+    ) -> Tuple[str, Dict[str, Any], Mapping[str, str]]:
         """
         准备京东请求参数
 
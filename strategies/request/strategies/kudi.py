@@ -6,16 +6,20 @@
 
 import json
 import hashlib
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, Mapping
 from datetime import datetime
 import requests
 
-from strategies.base import ISeckillStrategy
+from core.seckill.classifier import TERMINAL_PATTERNS
+from strategies.base import ISeckillStrategy, overlay_headers
 
 
 class KuDiRequestStrategy(ISeckillStrategy):
     """库迪咖啡请求策略"""
 
+    TERMINAL_KEYWORDS = TERMINAL_PATTERNS
+    RETRY_AFTER_DELAY_KEYWORDS = ("频繁", "繁忙")
+
     def __init__(self, params: Dict[str, Any] = None):
         self.params = params or {}
 
@@ -23,9 +27,9 @@ class KuDiRequestStrategy(ISeckillStrategy):
         self,
         current_time: datetime,
         data: Dict[str, Any],
-        headers: Dict[str, str],
+        headers: Mapping[str, str],
         base_url: str,
-    ) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+    ) -> Tuple[str, Dict[str, Any], Mapping[str, str]]:
         """
         准备库迪咖啡请求参数
 
@@ -44,9 +48,10 @@ class KuDiRequestStrategy(ISeckillStrategy):
         kudi_params = f"path/cotti-capi/universal/coupon/receiveLaunchRewardH5timestamp{timestamp}versionv1Bu0Zsh4B0SnKBRfds0XWCSn51WJfn5yN"
         encrypted_sign = hashlib.md5(kudi_params.encode("utf-8")).hexdigest().upper()
 
-        # 更新请求头
-        headers["sign"] = encrypted_sign
-        headers["timestamp"] = str(timestamp)
+        # 在请求头模板上叠加本次请求的签名，不修改共享模板
+        headers = overlay_headers(
+            headers, sign=encrypted_sign, timestamp=str(timestamp)
+        )
 
         # 处理请求数据
         process_data = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
@@ -6,21 +6,37 @@
 
 import hashlib
 import json
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, Mapping
 from datetime import datetime
 import requests
 
+from core.seckill.classifier import TERMINAL_PATTERNS
 from strategies.base import ISeckillStrategy
 from utils.js_executor import JavaScriptExecutor
+from utils.mixue_sig import get_sig
 
 
 class MixueRequestStrategy(ISeckillStrategy):
     """蜜雪冰城请求策略"""
 
+    TERMINAL_KEYWORDS = TERMINAL_PATTERNS + ("口令不正确", "口令错误", "已兑完")
+    RETRY_AFTER_DELAY_KEYWORDS = ("频繁",)
+
+    # 签名实现: python 为纯Python实现，node 通过Node.js执行 js/mixue.js
+    SIG_BACKENDS = ("python", "node")
+
     def __init__(self, params: Dict[str, Any] = None):
         self.params = params or {}
+        self.sig_backend = self.params.get("sig_backend") or "python"
+        if self.sig_backend not in self.SIG_BACKENDS:
+            from loguru import logger
+
+            logger.warning(f"未知的签名实现: {self.sig_backend}，使用python")
+            self.sig_backend = "python"
+
         self.encryption_js = None
-        self._init_js_executor()
+        if self.sig_backend == "node":
+            self._init_js_executor()
 
     def _init_js_executor(self):
         """初始化JavaScript执行器"""
@@ -36,9 +52,9 @@ class MixueRequestStrategy(ISeckillStrategy):
         self,
         current_time: datetime,
         data: Dict[str, Any],
-        headers: Dict[str, str],
+        headers: Mapping[str, str],
         base_url: str,
-    ) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+    ) -> Tuple[str, Dict[str, Any], Mapping[str, str]]:
         """
         准备蜜雪冰城请求参数
 
@@ -70,10 +86,12 @@ class MixueRequestStrategy(ISeckillStrategy):
             "stamp": timestamp,
         }
 
+        sig_url = f'https://mxsa.mxbc.net/api/v1/h5/marketing/secretword/confirm{{"marketingId":"{marketing_id}","round":"{round_num}","secretword":"{secret_word}","sign":"{sign}","s":2,"stamp":{timestamp}}}'
+        if self.sig_backend == "python":
+            encrypted_str = get_sig(sig_url)
         # 使用JavaScript执行器进行加密
-        if self.encryption_js and self.encryption_js.is_available():
-            encrypted_str = f'https://mxsa.mxbc.net/api/v1/h5/marketing/secretword/confirm{{"marketingId":"{marketing_id}","round":"{round_num}","secretword":"{secret_word}","sign":"{sign}","s":2,"stamp":{timestamp}}}'
-            encrypted_str = self.encryption_js.call("get_sig", encrypted_str)
+        elif self.encryption_js and self.encryption_js.is_available():
+            encrypted_str = self.encryption_js.call("get_sig", sig_url)
         else:
             from loguru import logger
 
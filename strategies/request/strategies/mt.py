@@ -5,7 +5,7 @@
 """
 
 import json
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, Mapping
 from datetime import datetime
 from urllib.parse import urlparse, parse_qs
 import requests
@@ -23,9 +23,9 @@ class MTRequestStrategy(ISeckillStrategy):
         self,
         current_time: datetime,
         data: Dict[str, Any],
-        headers: Dict[str, str],
+        headers: Mapping[str, str],
         base_url: str,
-    ) -> Tuple[str, Dict[str, Any], Dict[str, str]]:
+    ) -> Tuple[str, Dict[str, Any], Mapping[str, str]]:
         """
         准备美团请求参数
 
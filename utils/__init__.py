@@ -2,10 +2,33 @@
 工具模块
 
 提供各种工具类和辅助函数
+
+导出的名称在首次访问时才导入对应模块
 """
 
-from .time_sync import TimeSynchronizer, print_time_cost
-from .proxy import ProxyManager
-from .js_executor import JavaScriptExecutor
+import importlib
+
+_LAZY_ATTRS = {
+    "TimeSynchronizer": ".time_sync",
+    "ProxyManager": ".proxy",
+    "JavaScriptExecutor": ".js_executor",
+    "FileWatcher": ".file_watcher",
+    "CronExpression": ".cron",
+    "parse_cron": ".cron",
+    "print_time_cost": ".time_sync",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ["TimeSynchronizer", "ProxyManager", "JavaScriptExecutor", "print_time_cost"]
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
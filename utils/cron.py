@@ -0,0 +1,162 @@
+"""
+cron 表达式
+
+解析标准 5 段 cron 表达式（分 时 日 月 周），计算下一次触发的分钟。
+每段支持 *、数字、范围 a-b、步长 */n 和 a-b/n、逗号分隔的列表；
+周的取值 0-7，0 和 7 都表示周日。日和周都有限制时按 cron 惯例任一满足即可
+"""
+
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+# (名称, 最小值, 最大值)
+_FIELDS: Tuple[Tuple[str, int, int], ...] = (
+    ("分", 0, 59),
+    ("时", 0, 23),
+    ("日", 1, 31),
+    ("月", 1, 12),
+    ("周", 0, 7),
+)
+
+# 搜索下一次触发时间的上限，超过则认为表达式不会再触发（如 2 月 30 日）
+_SEARCH_YEARS = 8
+
+
+def _parse_field(text: str, name: str, low: int, high: int) -> Tuple[List[int], bool]:
+    """解析单段，返回 (取值列表, 是否为 *)"""
+    values = set()
+    for part in text.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            if not step_text.isdigit() or int(step_text) == 0:
+                raise ValueError(f"{name}段步长无效: {text}")
+            step = int(step_text)
+
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_text, end_text = part.split("-", 1)
+            if not (start_text.isdigit() and end_text.isdigit()):
+                raise ValueError(f"{name}段范围无效: {text}")
+            start, end = int(start_text), int(end_text)
+        elif part.isdigit():
+            start = end = int(part)
+            if step != 1:
+                end = high
+        else:
+            raise ValueError(f"{name}段无效: {text}")
+
+        if not low <= start <= end <= high:
+            raise ValueError(f"{name}段超出范围 {low}-{high}: {text}")
+        values.update(range(start, end + 1, step))
+    return sorted(values), text == "*"
+
+
+class CronExpression:
+    """编译后的 cron 表达式"""
+
+    def __init__(self, expression: str):
+        """
+        Args:
+            expression: 5 段 cron 表达式
+
+        Raises:
+            ValueError: 表达式无效
+        """
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron 表达式必须是 5 段(分 时 日 月 周): {expression}")
+
+        parsed = [
+            _parse_field(text, name, low, high)
+            for text, (name, low, high) in zip(fields, _FIELDS)
+        ]
+        self.expression = expression
+        self.minutes, _ = parsed[0]
+        self.hours, _ = parsed[1]
+        days, any_day = parsed[2]
+        self.months = set(parsed[3][0])
+        weekdays, any_weekday = parsed[4]
+
+        self.days = set(days)
+        # cron 的周日为 0 或 7，换算为 datetime.weekday() 的 0=周一 ... 6=周日
+        self.weekdays = {(w - 1) % 7 for w in weekdays}
+        self._any_day = any_day
+        self._any_weekday = any_weekday
+
+    def __repr__(self) -> str:
+        return f"CronExpression({self.expression!r})"
+
+    def _day_matches(self, day: datetime) -> bool:
+        if day.month not in self.months:
+            return False
+        in_days = day.day in self.days
+        in_weekdays = day.weekday() in self.weekdays
+        if self._any_day and self._any_weekday:
+            return True
+        if self._any_day:
+            return in_weekdays
+        if self._any_weekday:
+            return in_days
+        return in_days or in_weekdays
+
+    def next_after(self, after: datetime) -> Optional[datetime]:
+        """
+        严格晚于 after 的下一次触发时间（整分钟）
+
+        Args:
+            after: 起点
+
+        Returns:
+            下一次触发时间，表达式不会再触发时返回 None
+        """
+        current = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = after + timedelta(days=366 * _SEARCH_YEARS)
+
+        while current <= limit:
+            if not self._day_matches(current):
+                current = current.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+
+            i = bisect_left(self.hours, current.hour)
+            if i == len(self.hours):
+                current = current.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if self.hours[i] != current.hour:
+                current = current.replace(hour=self.hours[i], minute=0)
+
+            j = bisect_left(self.minutes, current.minute)
+            if j == len(self.minutes):
+                current = current.replace(minute=0) + timedelta(hours=1)
+                continue
+            return current.replace(minute=self.minutes[j])
+        return None
+
+
+@lru_cache(maxsize=256)
+def parse_cron(expression: str) -> CronExpression:
+    """
+    解析 cron 表达式，相同表达式只解析一次
+
+    Args:
+        expression: 5 段 cron 表达式
+
+    Returns:
+        编译后的 cron 表达式
+
+    Raises:
+        ValueError: 表达式无效
+    """
+    return CronExpression(expression)
+
+
+def is_valid_cron(expression: str) -> bool:
+    """cron 表达式是否有效"""
+    try:
+        parse_cron(expression)
+        return True
+    except ValueError:
+        return False
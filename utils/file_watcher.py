@@ -0,0 +1,212 @@
+"""
+文件变更监视
+
+Linux 下通过 inotify 监视文件所在目录，其他平台或 inotify 不可用时按修改时间轮询。
+监视目录而不是文件本身，编辑器用“写临时文件再改名”的方式保存时也能收到通知
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from loguru import logger
+
+# inotify 事件掩码，见 <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _Inotify:
+    """通过 ctypes 调用的 inotify"""
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm_watch = libc.inotify_rm_watch
+        self._rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+    def add_watch(self, directory: str) -> int:
+        wd = self._add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), directory)
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        self._rm_watch(self.fd, wd)
+
+    def read_events(self) -> List[Tuple[int, int, str]]:
+        """读取所有待处理事件: [(wd, mask, 文件名)]"""
+        events = []
+        while True:
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                name = buffer[offset : offset + length].rstrip(b"\0")
+                offset += length
+                events.append((wd, mask, os.fsdecode(name)))
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class FileWatcher:
+    """文件变更监视器"""
+
+    def __init__(
+        self,
+        paths: Iterable[str] = (),
+        poll_interval: float = 1.0,
+        debounce: float = 0.05,
+        use_inotify: bool = True,
+    ):
+        """
+        Args:
+            paths: 监视的文件
+            poll_interval: 轮询模式下检查修改时间的间隔（秒）
+            debounce: 收到变更后继续收集同一批变更的时间（秒）
+            use_inotify: 是否尝试使用 inotify
+        """
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self._paths: Set[str] = set()
+        self._stats: Dict[str, Optional[Tuple[int, int]]] = {}
+        self._dirs: Dict[str, int] = {}  # 目录 -> inotify wd
+        self._inotify: Optional[_Inotify] = None
+
+        if use_inotify and sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError) as e:
+                logger.warning(f"inotify 不可用，改为轮询修改时间: {e}")
+
+        self.set_paths(paths)
+        logger.debug(f"文件监视模式: {self.mode}")
+
+    @property
+    def mode(self) -> str:
+        """监视方式: inotify 或 poll"""
+        return "inotify" if self._inotify is not None else "poll"
+
+    @staticmethod
+    def _stat(path: str) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def set_paths(self, paths: Iterable[str]) -> None:
+        """
+        更新监视的文件集合
+
+        Args:
+            paths: 监视的文件
+        """
+        self._paths = {os.path.abspath(p) for p in paths}
+        self._stats = {p: self._stats.get(p, self._stat(p)) for p in self._paths}
+        if self._inotify is None:
+            return
+
+        wanted = {os.path.dirname(p) for p in self._paths}
+        for directory in set(self._dirs) - wanted:
+            self._inotify.rm_watch(self._dirs.pop(directory))
+        for directory in wanted - set(self._dirs):
+            try:
+                self._dirs[directory] = self._inotify.add_watch(directory)
+            except OSError as e:
+                logger.warning(f"无法监视目录 {directory}: {e}")
+
+    def _changed_by_stat(self) -> Set[str]:
+        """按修改时间和大小比较找出变更的文件"""
+        changed = set()
+        for path in self._paths:
+            stat = self._stat(path)
+            if stat != self._stats.get(path):
+                self._stats[path] = stat
+                changed.add(path)
+        return changed
+
+    def _collect_inotify(self, timeout: float) -> bool:
+        """等待 inotify 事件，返回是否有与监视文件相关的事件"""
+        readable, _, _ = select.select([self._inotify.fd], [], [], max(0.0, timeout))
+        if not readable:
+            return False
+        directories = {wd: d for d, wd in self._dirs.items()}
+        for wd, mask, name in self._inotify.read_events():
+            if mask & IN_Q_OVERFLOW:
+                return True
+            directory = directories.get(wd)
+            if directory and os.path.join(directory, name) in self._paths:
+                return True
+        return False
+
+    def wait(self, timeout: float) -> Set[str]:
+        """
+        等待监视的文件发生变更
+
+        Args:
+            timeout: 最长等待秒数
+
+        Returns:
+            变更的文件（绝对路径），超时时为空集合
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if self._inotify is not None:
+                notified = self._collect_inotify(remaining)
+            else:
+                time.sleep(max(0.0, min(self.poll_interval, remaining)))
+                notified = True
+
+            if notified:
+                if self._inotify is not None:
+                    # 编辑器保存时通常产生一串事件，稍等片刻一并处理
+                    time.sleep(self.debounce)
+                    self._inotify.read_events()
+                changed = self._changed_by_stat()
+                if changed:
+                    return changed
+            if deadline - time.monotonic() <= 0:
+                return set()
+
+    def close(self) -> None:
+        """停止监视"""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+            self._dirs = {}
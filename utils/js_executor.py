@@ -6,20 +6,41 @@ JavaScript执行器
 
 import subprocess
 import tempfile
+import threading
+import select
+import time
 import os
 import json
-from typing import Any
+from typing import Any, Dict, Optional
 from loguru import logger
 
+# 常驻执行进程脚本
+WORKER_SCRIPT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "js", "worker.js"
+)
+
 
 class JavaScriptExecutor:
     """
-    JavaScript执行器，使用Node.js子进程执行JavaScript代码
+    JavaScript执行器，使用常驻的Node.js子进程执行JavaScript代码
+
+    常驻进程加载脚本时使用V8代码缓存（默认保存在脚本所在目录的 .v8cache 下），
+    无法启动常驻进程时回退为每次调用启动一个Node.js进程
     """
 
-    def __init__(self, js_file_path: str):
+    def __init__(
+        self, js_file_path: str, cache_dir: Optional[str] = None, timeout: float = 10
+    ):
         self.js_file_path = js_file_path
+        self.cache_dir = cache_dir or os.path.join(
+            os.path.dirname(os.path.abspath(js_file_path)), ".v8cache"
+        )
+        self.timeout = timeout
+        self.startup: Dict[str, Any] = {}
         self._js_content = None
+        self._process: Optional[subprocess.Popen] = None
+        self._buffer = b""
+        self._lock = threading.Lock()
         self._load_js_content()
 
     def _load_js_content(self):
@@ -31,6 +52,73 @@ class JavaScriptExecutor:
             logger.error(f"JavaScript文件未找到: {self.js_file_path}")
             self._js_content = ""
 
+    def _read_line(self, deadline: float) -> bytes:
+        """从常驻进程读取一行输出，超过截止时间抛出 TimeoutError"""
+        stdout = self._process.stdout.fileno()
+        while b"\n" not in self._buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([stdout], [], [], remaining)[0]:
+                raise TimeoutError
+            chunk = os.read(stdout, 65536)
+            if not chunk:
+                raise RuntimeError("JavaScript执行进程已退出")
+            self._buffer += chunk
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        return line
+
+    def _start_worker(self) -> None:
+        """启动常驻执行进程并等待脚本加载完成"""
+        started = time.monotonic()
+        self._buffer = b""
+        self._process = subprocess.Popen(
+            ["node", WORKER_SCRIPT, self.js_file_path, self.cache_dir],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            ready = json.loads(self._read_line(started + self.timeout))
+        except TimeoutError:
+            self.close()
+            raise
+        except ValueError as e:
+            self.close()
+            raise RuntimeError(f"JavaScript执行进程启动失败: {e}")
+        except RuntimeError:
+            self.close()
+            raise
+        self.startup = {
+            "cache": ready.get("cache"),
+            "load_ms": ready.get("load_ms"),
+            "cold_start_ms": (time.monotonic() - started) * 1000,
+        }
+        logger.info(
+            f"JavaScript执行进程已启动: 冷启动 {self.startup['cold_start_ms']:.1f}ms，"
+            f"脚本加载 {self.startup['load_ms']:.1f}ms，代码缓存 {self.startup['cache']}"
+        )
+
+    def _call_worker(self, function_name: str, args: tuple) -> Any:
+        """通过常驻进程调用函数"""
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                self._start_worker()
+
+            request = json.dumps({"fn": function_name, "args": list(args)})
+            try:
+                self._process.stdin.write(request.encode("utf-8") + b"\n")
+                self._process.stdin.flush()
+                response = json.loads(self._read_line(time.monotonic() + self.timeout))
+            except TimeoutError:
+                self.close()
+                raise RuntimeError("JavaScript执行超时")
+            except (OSError, ValueError) as e:
+                self.close()
+                raise RuntimeError(f"JavaScript执行错误: {e}")
+
+        if "error" in response:
+            raise RuntimeError(f"JavaScript执行失败: {response['error']}")
+        return response.get("result")
+
     def call(self, function_name: str, *args) -> Any:
         """
         调用JavaScript函数
@@ -45,6 +133,20 @@ class JavaScriptExecutor:
         if not self._js_content:
             raise RuntimeError("JavaScript内容未加载")
 
+        try:
+            return self._call_worker(function_name, args)
+        except FileNotFoundError:
+            raise RuntimeError("未找到Node.js，请安装Node.js以使用JavaScript执行功能")
+        except TimeoutError:
+            logger.warning("JavaScript执行进程启动超时，改为单次执行")
+        except RuntimeError as e:
+            if self.startup:
+                raise
+            logger.warning(f"JavaScript执行进程启动失败，改为单次执行: {e}")
+        return self._call_once(function_name, args)
+
+    def _call_once(self, function_name: str, args: tuple) -> Any:
+        """启动一个Node.js进程执行单次调用"""
         # 创建临时JavaScript文件
         js_code = f"""
 {self._js_content}
@@ -64,7 +166,10 @@ console.log(JSON.stringify(result));
 
             # 使用Node.js执行
             result = subprocess.run(
-                ["node", temp_file_path], capture_output=True, text=True, timeout=10
+                ["node", temp_file_path],
+                capture_output=True,
+                text=True,
+                timeout=self.timeout,
             )
 
             # 清理临时文件
@@ -94,9 +199,26 @@ console.log(JSON.stringify(result));
         Returns:
             是否可用
         """
+        if self._process is not None and self._process.poll() is None:
+            return True
         try:
             # 尝试执行简单的JavaScript代码
             subprocess.run(["node", "--version"], capture_output=True, timeout=5)
             return True
         except (subprocess.TimeoutExpired, FileNotFoundError):
             return False
+
+    def close(self) -> None:
+        """结束常驻执行进程"""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        try:
+            process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
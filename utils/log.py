@@ -0,0 +1,84 @@
+"""
+日志配置
+
+命令行入口和预启动工作进程共用同一套日志配置。预启动工作进程以 spawn 方式启动，
+不会继承父进程的日志输出，需要按父进程的配置重新设置
+"""
+
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+from loguru import logger
+
+LOG_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | "
+    "<level>{level: <8}</level> | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
+    "<level>{message}</level>"
+)
+
+LOG_FILE = Path("logs") / "seckill_{time:YYYY-MM-DD}.log"
+
+# 当前进程的日志配置，传给 spawn 启动的子进程
+_options: Dict[str, Any] = {"verbose": False, "file": False}
+
+
+def setup_logging(verbose: bool = False) -> None:
+    """
+    设置控制台日志
+
+    Args:
+        verbose: 是否输出调试日志
+    """
+    logger.remove()
+    level = "DEBUG" if verbose else "INFO"
+    logger.add(sys.stdout, format=LOG_FORMAT, level=level)
+    _options.update(verbose=verbose, file=False)
+
+
+def setup_file_logging(verbose: bool = False, rotate: bool = True) -> None:
+    """
+    添加按天滚动的日志文件，只在秒杀、调度等需要留存日志的子命令中调用
+
+    文件日志通过多进程队列异步写入（enqueue），会导入 multiprocessing 并启动写入线程，
+    只读命令不需要这些开销
+
+    Args:
+        verbose: 是否输出调试日志
+        rotate: 是否负责滚动和清理日志文件，子进程追加写入同一文件时由父进程负责
+    """
+    level = "DEBUG" if verbose else "INFO"
+
+    # 确保logs目录存在
+    LOG_FILE.parent.mkdir(exist_ok=True)
+
+    if rotate:
+        logger.add(
+            str(LOG_FILE),
+            format=LOG_FORMAT,
+            level=level,
+            rotation="1 day",
+            retention="10 days",
+            enqueue=True,
+        )
+    else:
+        logger.add(str(LOG_FILE), format=LOG_FORMAT, level=level)
+    _options.update(verbose=verbose, file=True)
+
+
+def logging_options() -> Dict[str, Any]:
+    """当前进程的日志配置"""
+    return dict(_options)
+
+
+def apply_logging_options(options: Dict[str, Any]) -> None:
+    """
+    在子进程中按父进程的日志配置设置日志
+
+    Args:
+        options: logging_options() 的返回值
+    """
+    setup_logging(options.get("verbose", False))
+    if options.get("file"):
+        setup_file_logging(options.get("verbose", False), rotate=False)
@@ -0,0 +1,150 @@
+"""
+蜜雪冰城签名
+
+js/mixue.js 中 get_sig 的纯Python实现，无需Node.js运行时
+"""
+
+import time
+from typing import Optional
+from urllib.parse import quote
+
+# encodeURIComponent 不转义的字符（字母数字之外）
+_URI_COMPONENT_SAFE = "-_.!~*'()"
+
+# ua() 使用的 6 位字符表
+_ALPHABET = "DGi0YA7BemWnQjCl4+bR3f8SKIF9tUz/xhr2oEOgPpac=61ZqwTudLkM5vHyNXsVJ"
+
+
+def _to_int32(value: int) -> int:
+    """按 JavaScript ToInt32 截断为 32 位有符号整数"""
+    value &= 0xFFFFFFFF
+    return value - 0x100000000 if value & 0x80000000 else value
+
+
+def sig_hash(url: str) -> int:
+    """
+    sig() 中对 encodeURIComponent(url) 的滚动哈希
+
+    Args:
+        url: 待签名的URL
+
+    Returns:
+        32 位有符号哈希值
+    """
+    # (N << 7) - N + 398 + c 再 |0，等价于模 2^32 的 N * 127 + 398 + c
+    value = 0
+    for code in quote(url, safe=_URI_COMPONENT_SAFE).encode("ascii"):
+        value = (value * 127 + 398 + code) & 0xFFFFFFFF
+    return _to_int32(value)
+
+
+def _utf16_units(text: str) -> str:
+    """转换为UTF-16码元序列，与JavaScript字符串按码元处理保持一致"""
+    if text.isascii():
+        return text
+    encoded = text.encode("utf-16-le", "surrogatepass")
+    return "".join(
+        chr(int.from_bytes(encoded[i : i + 2], "little"))
+        for i in range(0, len(encoded), 2)
+    )
+
+
+def compress(text: str) -> str:
+    """
+    ua() 的实现：每字符 6 位的 LZ 压缩编码，不补齐 '='
+
+    Args:
+        text: 待压缩字符串
+
+    Returns:
+        压缩编码结果
+    """
+    bits_per_char = 6
+    dictionary = {}
+    to_create = set()
+    w = ""
+    enlarge_in = 2
+    dict_size = 3
+    num_bits = 2
+    output = []
+    value = 0
+    position = 0
+
+    def write_bits(bits: int, data: int) -> None:
+        nonlocal value, position
+        for _ in range(bits):
+            value = (value << 1) | (data & 1)
+            if position == bits_per_char - 1:
+                position = 0
+                output.append(_ALPHABET[value])
+                value = 0
+            else:
+                position += 1
+            data >>= 1
+
+    def write_w() -> None:
+        nonlocal enlarge_in, num_bits
+        if w in to_create:
+            code = ord(w[0])
+            if code < 256:
+                write_bits(num_bits, 0)
+                write_bits(8, code)
+            else:
+                write_bits(num_bits, 1)
+                write_bits(16, code)
+            enlarge_in -= 1
+            if enlarge_in == 0:
+                enlarge_in = 1 << num_bits
+                num_bits += 1
+            to_create.discard(w)
+        else:
+            write_bits(num_bits, dictionary[w])
+        enlarge_in -= 1
+        if enlarge_in == 0:
+            enlarge_in = 1 << num_bits
+            num_bits += 1
+
+    for c in _utf16_units(text):
+        if c not in dictionary:
+            dictionary[c] = dict_size
+            dict_size += 1
+            to_create.add(c)
+
+        wc = w + c
+        if wc in dictionary:
+            w = wc
+        else:
+            write_w()
+            dictionary[wc] = dict_size
+            dict_size += 1
+            w = c
+
+    if w:
+        write_w()
+
+    # 结束标记
+    write_bits(num_bits, 2)
+    while True:
+        value <<= 1
+        if position == bits_per_char - 1:
+            output.append(_ALPHABET[value])
+            break
+        position += 1
+
+    return "".join(output)
+
+
+def get_sig(url: str, timestamp: Optional[int] = None) -> str:
+    """
+    计算 type__1286 签名参数
+
+    Args:
+        url: 接口地址与请求体拼接后的字符串
+        timestamp: 毫秒时间戳，默认使用当前时间
+
+    Returns:
+        签名参数
+    """
+    if timestamp is None:
+        timestamp = int(time.time() * 1000)
+    return compress(f"{sig_hash(url)}|0|{timestamp}|1")
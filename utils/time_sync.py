@@ -5,8 +5,9 @@
 """
 
 import time
-from datetime import datetime, date
-from typing import List
+from datetime import datetime, timedelta
+from datetime import time as dtime
+from typing import List, Optional, Union
 from loguru import logger
 import requests
 
@@ -85,38 +86,72 @@ class TimeSynchronizer:
 
         return final_time_diff
 
-    def wait_for_time(self, target_time: datetime.time, time_diff: float = 0.0) -> None:
+    # 距离目标小于该秒数时改为忙等，保证毫秒级精度
+    SPIN_THRESHOLD = 0.002
+    # 不带日期的开始时间已过多少秒内仍取当天，超过后顺延到次日
+    FIRE_GRACE = 5.0
+
+    def fire_timestamp(
+        self,
+        target: Union[datetime, dtime],
+        time_diff: float = 0.0,
+        grace: Optional[float] = None,
+    ) -> float:
+        """
+        计算目标时间对应的本地时间戳
+
+        target 为 datetime 时就是确切的开始时间（调度器传入的本次运行时间）；
+        为不带日期的 time 时取当前网络时间减去 grace 秒之后的第一次，
+        刚过开始时间几秒内启动的任务仍取当天（立即开始），更早的已过时间顺延到次日
+
+        Args:
+            target: 目标时间（网络时间）
+            time_diff: 网络时间与本地时间的时间差
+            grace: 开始时间已过多少秒内仍视为当天，默认 FIRE_GRACE
+
+        Returns:
+            本地时间戳
+        """
+        if isinstance(target, datetime):
+            return target.timestamp() - time_diff
+        grace = self.FIRE_GRACE if grace is None else grace
+        now = datetime.fromtimestamp(time.time() + time_diff)
+        fire_at = datetime.combine(now.date(), target)
+        if fire_at < now - timedelta(seconds=grace):
+            fire_at += timedelta(days=1)
+        return fire_at.timestamp() - time_diff
+
+    def wait_until(self, deadline: float) -> None:
+        """
+        等待到本地时间戳 deadline：先分段休眠，最后几毫秒忙等
+
+        Args:
+            deadline: 本地时间戳
+        """
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= self.SPIN_THRESHOLD:
+                break
+            # 分段休眠，系统时间被调整后能及时重新计算
+            time.sleep(min(remaining - self.SPIN_THRESHOLD, 0.5))
+        while time.time() < deadline:
+            pass
+
+    def wait_for_time(
+        self, target_time: Union[datetime, dtime], time_diff: float = 0.0
+    ) -> None:
         """
         等待到指定时间
 
         Args:
-            target_time: 目标时间
+            target_time: 目标时间，不带日期时的取法见 fire_timestamp
             time_diff: 时间差
         """
         logger.debug(f"目标启动时间: {target_time}")
         logger.debug(f"时间差: {time_diff:.3f} 秒")
 
-        while True:
-            current_timestamp = time.time()
-            adjusted_timestamp = current_timestamp + time_diff
-            # 计算到启动时间的精确秒数差
-            target_datetime = datetime.combine(date.today(), target_time)
-            adjusted_datetime = datetime.fromtimestamp(adjusted_timestamp)
-            time_diff_seconds = (target_datetime - adjusted_datetime).total_seconds()
-            # 如果时间已到或已过，立即启动
-            if time_diff_seconds <= 0:
-                logger.info("Starting seckill...")
-                break
-            # 根据剩余时间调整睡眠间隔
-            if time_diff_seconds > 5:
-                sleep_time = 0.1  # 剩余时间长时，每100毫秒检查一次
-            elif time_diff_seconds > 1:
-                sleep_time = 0.01  # 剩余时间中等时，每10毫秒检查一次
-            elif time_diff_seconds > 0.1:
-                sleep_time = 0.001  # 剩余时间短时，每1毫秒检查一次
-            else:
-                sleep_time = 0.0001  # 剩余时间很短时，每0.1毫秒检查一次
-            time.sleep(sleep_time)
+        self.wait_until(self.fire_timestamp(target_time, time_diff))
+        logger.info("Starting seckill...")
 
 
 def print_time_cost(func):